@@ -0,0 +1,78 @@
+"""
+Microbenchmark for LinkedIn page extraction.
+
+Parses the saved listing and job detail pages in benchmarks/pages (or `--pages DIR`, any
+`*listing*.html` / `*job*.html` files) with the lxml fast path and with the html.parser
+fallback, checks that both extract the same cards and fields, and reports per-page
+latency and the speedup:
+
+    python benchmarks/bench_html.py [--runs 200] [--pages benchmarks/pages]
+
+Exits non-zero if the two parsers disagree on any page, so it doubles as a check that the
+fast path still matches the markup the fixtures were saved from.
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT_DIR))
+
+from src.scrapers.linkedin_pages import LinkedInPageParser
+
+PAGES_DIR = Path(__file__).resolve().parent / "pages"
+
+
+def time_parse(parse, content: bytes, runs: int) -> float:
+    """Median seconds per call over `runs` calls."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        parse(content)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=200,
+                        help="parses per page and parser (default: %(default)s)")
+    parser.add_argument("--pages", type=Path, default=PAGES_DIR,
+                        help="directory of saved pages (default: %(default)s)")
+    args = parser.parse_args()
+
+    fast = LinkedInPageParser(fast_path=True)
+    if not fast.fast_path:
+        sys.exit("lxml is not installed, there is no fast path to benchmark.")
+    fallback = LinkedInPageParser(fast_path=False)
+    pages = [("listing", path) for path in sorted(args.pages.glob("*listing*.html"))]
+    pages += [("job", path) for path in sorted(args.pages.glob("*job*.html"))]
+    if not pages:
+        sys.exit(f"No *listing*.html or *job*.html pages in {args.pages}.")
+
+    failures = []
+    print(f"{'page':<28} {'KiB':>6} {'html.parser ms':>15} {'lxml ms':>9} {'speedup':>8}")
+    for kind, path in pages:
+        content = path.read_bytes()
+        fast_parse = fast.parse_listing if kind == "listing" else fast.parse_job
+        fallback_parse = fallback.parse_listing if kind == "listing" else fallback.parse_job
+        fast_only = fast._fast_listing if kind == "listing" else fast._fast_job
+        if fast_only(content) is None:
+            failures.append(f"{path.name}: fast path fell back to html.parser")
+        if fast_parse(content) != fallback_parse(content):
+            failures.append(f"{path.name}: lxml and html.parser extracted different results")
+        fallback_seconds = time_parse(fallback_parse, content, args.runs)
+        fast_seconds = time_parse(fast_parse, content, args.runs)
+        print(f"{path.name:<28} {len(content) / 1024:>6.1f} {fallback_seconds * 1000:>15.3f} "
+              f"{fast_seconds * 1000:>9.3f} {fallback_seconds / fast_seconds:>7.1f}x")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
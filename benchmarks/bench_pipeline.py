@@ -0,0 +1,197 @@
+"""
+Offline end-to-end pipeline benchmark.
+
+Runs scrape -> extract -> persist -> context build -> match against a local job board
+fixture and a fake Ollama endpoint (see fixtures.py), over synthetic corpora of several
+sizes (see corpus.py), and reports per-stage throughput and p50/p95 latency:
+
+    python benchmarks/bench_pipeline.py [--sizes 25 100 400] [--llm-latency 0.05] [--json out.json]
+
+Every run works in a temporary data directory; only data/knowledge is read. Embeddings
+use ChromaDB's default model, which must already be in its local cache.
+
+Latency is per item (per detail page, LLM call, persisted batch, context or match).
+Throughput is items per second of stage wall time. Persist and context build overlap
+with extract and match, so their throughput is per second of busy time instead.
+"""
+
+import argparse
+import functools
+import io
+import json
+import math
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+
+PROJECT_ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT_DIR))
+
+from corpus import CorpusGenerator
+from fixtures import FakeOllamaServer, JobBoardServer
+
+from src.config.settings import Config
+
+STAGES = ["scrape", "extract", "persist", "context_build", "match"]
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]."""
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+class StageRecorder:
+    """Collects per-item latencies and item counts per stage from wrapped callables."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.items = defaultdict(int)
+        self.wall = {}
+        self._lock = threading.Lock()
+
+    def wrap(self, stage: str, func, count=lambda args, kwargs: 1):
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                items = count(args, kwargs)
+                if items:
+                    with self._lock:
+                        self.latencies[stage].append(elapsed)
+                        self.items[stage] += items
+        return timed
+
+    @contextmanager
+    def timed_stage(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.wall[stage] = time.perf_counter() - start
+
+    def summary(self) -> dict:
+        rows = {}
+        for stage in STAGES:
+            latencies = self.latencies.get(stage, [])
+            wall = self.wall.get(stage, sum(latencies))
+            rows[stage] = {
+                "items": self.items.get(stage, 0),
+                "seconds": wall,
+                "throughput_per_s": self.items.get(stage, 0) / wall if wall > 0 else 0.0,
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+            }
+        return rows
+
+
+def configure_paths(data_dir: Path):
+    """Points every data path in Config (except the knowledge base) into `data_dir`."""
+    original_data_dir = Config.DATA_DIR
+    for name, value in list(vars(Config).items()):
+        if not isinstance(value, Path) or name == "KNOWLEDGE_PATH":
+            continue
+        if value == original_data_dir or original_data_dir in value.parents:
+            setattr(Config, name, data_dir.joinpath(value.relative_to(original_data_dir)))
+    Config.VECTOR_DB_DIR.mkdir(parents=True, exist_ok=True)
+
+
+def run_corpus(size: int, args) -> dict:
+    from src.core.context import AppContext
+    from src.core.knowledge.store import KnowledgeStore
+    from src.core.matching.agent import MatchingAgent
+    from src.models.database import DatabaseManager
+    from src.services.job_service import JobsManager
+
+    corpus = CorpusGenerator(seed=args.seed)
+    jobs = corpus.jobs(size)
+    recorder = StageRecorder()
+    output = sys.stdout if args.verbose else io.StringIO()
+    with tempfile.TemporaryDirectory(prefix="career-copilot-bench-") as data_dir, \
+            JobBoardServer(jobs, latency=args.http_latency) as job_board, \
+            FakeOllamaServer(latency=args.llm_latency, jobs=jobs) as ollama, \
+            redirect_stdout(output):
+        configure_paths(Path(data_dir))
+        Config.SCRAPER_URLs = {"LinkedIn": job_board.listing_url}
+        Config.SCRAPER_REQUESTS_PER_SECOND = args.requests_per_second
+        Config.OLLAMA_BASE_URL = ollama.base_url
+        Config.MATCHING_SHORTLIST_ENABLED = not args.no_shortlist
+
+        KnowledgeStore(Config.KNOWLEDGE_PATH).process_knowledge()
+        context = AppContext()
+        DatabaseManager(context).add_resume(corpus.resume(0))
+
+        job_manager = JobsManager(context)
+        job_manager.llm  # create the client up front so the first extraction isn't charged for it
+        for scraper in job_manager.scrapers:
+            scraper._scrape_job = recorder.wrap("scrape", scraper._scrape_job)
+        job_manager._llm_parse_job = recorder.wrap("extract", job_manager._llm_parse_job)
+        job_manager._save_jobs = recorder.wrap(
+            "persist", job_manager._save_jobs, count=lambda args, kwargs: len(args[0])
+        )
+        with recorder.timed_stage("scrape"):
+            job_manager.scrape_jobs()
+        with recorder.timed_stage("extract"):
+            job_manager.extract_staged_jobs()
+        # Persisting happens inside extract; report extract's own share of the wall time
+        recorder.wall["extract"] -= sum(recorder.latencies["persist"])
+
+        agent = MatchingAgent(context)
+        agent.context_builder.build_context_with_stats = recorder.wrap(
+            "context_build", agent.context_builder.build_context_with_stats
+        )
+        agent._llm_match_job = recorder.wrap("match", agent._llm_match_job)
+        with recorder.timed_stage("match"):
+            agent.match_all_jobs()
+        context.close()
+    return recorder.summary()
+
+
+def print_summary(size: int, summary: dict):
+    print(f"\ncorpus size {size}")
+    print(f"  {'stage':<14} {'items':>6} {'seconds':>9} {'items/s':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    for stage, row in summary.items():
+        print(f"  {stage:<14} {row['items']:>6} {row['seconds']:>9.3f} "
+              f"{row['throughput_per_s']:>9.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[25, 100, 400],
+                        help="job corpus sizes (default: %(default)s)")
+    parser.add_argument("--llm-latency", type=float, default=0.05,
+                        help="fake Ollama seconds per call (default: %(default)s)")
+    parser.add_argument("--http-latency", type=float, default=0.0,
+                        help="job board seconds per request (default: %(default)s)")
+    parser.add_argument("--requests-per-second", type=float, default=1000.0,
+                        help="scraper rate limit, high so the code rather than the limiter is "
+                             "measured (default: %(default)s)")
+    parser.add_argument("--no-shortlist", action="store_true",
+                        help="match every job instead of the embedding shortlist")
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed (default: %(default)s)")
+    parser.add_argument("--json", type=Path, default=None,
+                        help="also write the results to this JSON file")
+    parser.add_argument("--verbose", action="store_true", help="show the pipeline's own output")
+    args = parser.parse_args()
+
+    results = {}
+    for size in args.sizes:
+        results[size] = run_corpus(size, args)
+        print_summary(size, results[size])
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump({"args": {k: str(v) for k, v in vars(args).items()}, "results": results},
+                      file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Startup-time benchmark for the Career Copilot CLI.
+
+Times, in fresh interpreters, `python -m src.main --help` and the imports each subcommand
+performs before it starts working, and lists which heavy third-party packages each one
+loads. Exits non-zero if the bare CLI loads a heavy package or exceeds `--max-seconds`,
+so it can guard against import regressions:
+
+    python benchmarks/bench_startup.py [--runs 5] [--max-seconds 0.5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Mirrors the lazy imports inside each src/main.py command handler
+COMMAND_MODULES = {
+    "ingest-resume": ["src.services.resume_service"],
+    "scrape": ["src.services.job_service"],
+    "extract": ["src.services.job_service"],
+    "ingest-knowledge": ["src.core.knowledge.store"],
+    "match": ["src.core.matching.agent"],
+    "match-batch": ["src.core.matching.agent"],
+    "report": ["src.models.database", "src.core.matching.report"],
+}
+
+HEAVY_PACKAGES = [
+    "langchain", "langchain_core", "langchain_community", "chromadb",
+    "bs4", "sqlalchemy", "PyPDF2", "numpy",
+]
+
+
+def time_command(argv: list[str], runs: int) -> float:
+    """Median wall time of `argv` over `runs` fresh processes."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=PROJECT_ROOT_DIR, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def loaded_heavy_packages(modules: list[str]) -> list[str]:
+    code = "; ".join([
+        "import sys",
+        *[f"import {module}" for module in modules],
+        f"print(' '.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))",
+    ])
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT_DIR, check=True, capture_output=True,
+        text=True,
+    ).stdout
+    return output.split()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5,
+                        help="processes per measurement (default: %(default)s)")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="fail if `--help` takes longer than this")
+    args = parser.parse_args()
+
+    baseline = time_command([sys.executable, "-c", "pass"], args.runs)
+    cli_help = time_command([sys.executable, "-m", "src.main", "--help"], args.runs)
+    cli_packages = loaded_heavy_packages(["src.main"])
+
+    print(f"{'command':<18} {'median (s)':>10} {'over bare python (s)':>21}  heavy packages")
+    print(f"{'(bare python)':<18} {baseline:>10.3f} {'':>21}")
+    print(f"{'--help':<18} {cli_help:>10.3f} {cli_help - baseline:>21.3f}  "
+          f"{' '.join(cli_packages) or '-'}")
+    for command, modules in COMMAND_MODULES.items():
+        imports = "; ".join(f"import {module}" for module in ["src.main", *modules])
+        elapsed = time_command([sys.executable, "-c", imports], args.runs)
+        packages = loaded_heavy_packages(["src.main", *modules])
+        print(f"{command:<18} {elapsed:>10.3f} {elapsed - baseline:>21.3f}  "
+              f"{' '.join(packages) or '-'}")
+
+    failures = []
+    if cli_packages:
+        failures.append(f"`import src.main` loads heavy packages: {', '.join(cli_packages)}")
+    if args.max_seconds is not None and cli_help > args.max_seconds:
+        failures.append(f"`--help` took {cli_help:.3f}s, limit is {args.max_seconds:.3f}s")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
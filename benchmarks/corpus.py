@@ -0,0 +1,112 @@
+"""
+Deterministic synthetic corpus of job postings and resumes for the benchmarks.
+
+Skills, tools and example responsibilities come from the knowledge base in
+data/knowledge, so generated postings exercise the same retrieval paths as real ones.
+"""
+
+import random
+from pathlib import Path
+
+import yaml
+
+PROJECT_ROOT_DIR = Path(__file__).resolve().parent.parent
+KNOWLEDGE_SKILLS_DIR = PROJECT_ROOT_DIR.joinpath("data", "knowledge", "skills")
+
+TITLES = ["Machine Learning Engineer", "AI Engineer", "Backend Engineer", "Data Scientist",
+          "Platform Engineer", "Software Engineer", "MLOps Engineer", "Applied Scientist"]
+SENIORITY = ["Junior", "", "Senior", "Staff", "Lead"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries",
+             "Wayne Enterprises", "Soylent"]
+LOCATIONS = ["Toronto, ON", "Mississauga, ON", "Waterloo, ON", "Remote"]
+
+
+def load_skills() -> list[dict]:
+    """Skill name, tools and resume manifestations of every knowledge base skill file."""
+    skills = []
+    for skill_path in sorted(KNOWLEDGE_SKILLS_DIR.glob("*.yaml")):
+        with open(skill_path, "r") as file:
+            skill = yaml.safe_load(file)
+        skills.append({
+            "name": skill.get("skill_name", skill_path.stem),
+            "tools": skill.get("specific_tools", []),
+            "manifestations": skill.get("resume_manifestations", []),
+        })
+    return skills
+
+
+class CorpusGenerator:
+    """Generates reproducible job postings and resumes; the same seed gives the same corpus."""
+
+    def __init__(self, seed: int = 0):
+        self.random = random.Random(seed)
+        self.skills = load_skills()
+
+    def job(self, index: int) -> dict:
+        """A raw posting as the fixture server serves it (before LLM extraction)."""
+        skills = self.random.sample(self.skills, k=min(len(self.skills), self.random.randint(3, 7)))
+        title = " ".join(
+            part for part in [self.random.choice(SENIORITY), self.random.choice(TITLES)] if part
+        )
+        requirements = [
+            f"{self.random.randint(1, 8)}+ years of experience with {skill['name']}"
+            for skill in skills
+        ]
+        nice_to_have = [
+            self.random.choice(skill["tools"]) for skill in skills if skill["tools"]
+        ][:3]
+        responsibilities = [
+            self.random.choice(skill["manifestations"])
+            for skill in skills if skill["manifestations"]
+        ]
+        return {
+            "job_id": str(4000000000 + index),
+            "title": title,
+            "company": self.random.choice(COMPANIES),
+            "location": self.random.choice(LOCATIONS),
+            "requirements": requirements,
+            "key_technologies": [skill["name"] for skill in skills],
+            "paragraphs": [
+                f"We are hiring a {title} to join our team.",
+                "Responsibilities:", *responsibilities,
+                "Requirements:", *requirements,
+                f"Nice to have: {', '.join(nice_to_have)}",
+                f"Job reference: {4000000000 + index}",
+            ],
+        }
+
+    def jobs(self, count: int) -> list[dict]:
+        return [self.job(index) for index in range(count)]
+
+    def resume(self, index: int) -> dict:
+        """Resume details in the shape DatabaseManager.add_resume expects."""
+        skills = self.random.sample(
+            self.skills, k=min(len(self.skills), self.random.randint(6, 12))
+        )
+        experience = []
+        for position in range(self.random.randint(2, 4)):
+            position_skills = self.random.sample(skills, k=min(len(skills), 3))
+            experience.append({
+                "title": self.random.choice(TITLES),
+                "company": self.random.choice(COMPANIES),
+                "responsibilities": [
+                    self.random.choice(skill["manifestations"])
+                    for skill in position_skills if skill["manifestations"]
+                ],
+            })
+        return {
+            "raw_text": f"Synthetic resume {index}",
+            "name": f"Candidate {index}",
+            "email": f"candidate{index}@example.com",
+            "phone_number": "555-0100",
+            "skills": [skill["name"] for skill in skills],
+            "education": "BSc Computer Science",
+            "experience": experience,
+            "summary": (
+                f"Engineer experienced with {', '.join(skill['name'] for skill in skills[:3])}."
+            ),
+            "projects": [],
+        }
+
+    def resumes(self, count: int) -> list[dict]:
+        return [self.resume(index) for index in range(count)]
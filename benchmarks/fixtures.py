@@ -0,0 +1,203 @@
+"""
+Local stand-ins for LinkedIn and Ollama so the pipeline can be benchmarked offline.
+
+`JobBoardServer` serves LinkedIn-style `base-card` listing pages and job detail pages for a
+synthetic corpus. `FakeOllamaServer` answers Ollama's streaming /api/generate endpoint
+with canned JSON after a configurable latency, recognising the job extraction, resume
+extraction and matching prompts. The tests build their own stand-ins on `FixtureServer`.
+"""
+
+import json
+import re
+import threading
+import time
+import zlib
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FixtureServer(ThreadingHTTPServer):
+    """Threaded HTTP server on a free local port, started and stopped as a context manager."""
+
+    daemon_threads = True
+
+    def __init__(self, handler_class):
+        super().__init__(("127.0.0.1", 0), handler_class)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class QuietHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class JobBoardServer(FixtureServer):
+    """
+    Serves GET /listing?start=N (every card on the first page, like the scraper expects)
+    and GET /job/<job_id> detail pages, after `latency` seconds per request.
+    """
+
+    def __init__(self, jobs: list[dict], latency: float = 0.0):
+        self.jobs = {job["job_id"]: job for job in jobs}
+        self.latency = latency
+        super().__init__(_JobBoardHandler)
+
+    @property
+    def listing_url(self) -> str:
+        # Same shape as Config.SCRAPER_URLs, formatted by the scraper with start_index
+        return self.base_url + "/listing?start={start_index}"
+
+    def listing_page(self, start: int) -> str:
+        if start > 0:
+            return ""
+        return "".join(
+            f'<div class="base-card" data-entity-urn="urn:li:jobPosting:{job_id}">'
+            f'<a class="base-card__full-link" href="{self.base_url}/job/{job_id}">'
+            f'{escape(job["title"])}</a></div>'
+            for job_id, job in self.jobs.items()
+        )
+
+    @staticmethod
+    def detail_page(job: dict) -> str:
+        paragraphs = "".join(f"<p>{escape(paragraph)}</p>" for paragraph in job["paragraphs"])
+        return (
+            "<html><body>"
+            f'<h1 class="top-card-layout__title">{escape(job["title"])}</h1>'
+            f'<a class="topcard__org-name-link">{escape(job["company"])}</a>'
+            f'<span class="aside-job-card__location">{escape(job["location"])}</span>'
+            f'<div class="show-more-less-html__markup">{paragraphs}</div>'
+            "</body></html>"
+        )
+
+
+class _JobBoardHandler(QuietHandler):
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        path, _, query = self.path.partition("?")
+        if path == "/listing":
+            params = dict(part.partition("=")[::2] for part in query.split("&") if part)
+            body = self.server.listing_page(int(params.get("start", 0)))
+            return self._send(200, body.encode(), "text/html")
+        job = self.server.jobs.get(path.rsplit("/", 1)[-1]) if path.startswith("/job/") else None
+        if job is None:
+            return self._send(404, b"Not Found", "text/plain")
+        self._send(200, JobBoardServer.detail_page(job).encode(), "text/html")
+
+
+class FakeOllamaServer(FixtureServer):
+    """
+    Ollama-compatible /api/generate endpoint. Each response takes `latency` seconds and
+    reports token counts, so LLM throughput figures come out as they would from Ollama.
+    Job extraction responses come from `jobs`, found by the posting's "Job reference".
+    `max_in_flight` records the most requests it was ever answering at once.
+    """
+
+    def __init__(self, latency: float = 0.2, jobs: list[dict] = None):
+        self.latency = latency
+        self.jobs = {job["job_id"]: job for job in jobs or []}
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        super().__init__(_FakeOllamaHandler)
+
+    def respond(self, prompt: str) -> dict:
+        if "total_score" in prompt:
+            score = zlib.crc32(prompt.encode()) % 101
+            recommendation = ("STRONG MATCH" if score >= 85 else "GOOD MATCH" if score >= 70
+                              else "MODERATE MATCH" if score >= 55 else "WEAK MATCH" if score >= 40
+                              else "POOR MATCH")
+            technical = score * 40 // 100
+            experience = score * 25 // 100
+            education = score * 15 // 100
+            return {
+                "reasoning": "Synthetic evaluation.",
+                "technical_score": technical,
+                "experience_score": experience,
+                "education_score": education,
+                "alignment_score": score - technical - experience - education,
+                "total_score": score,
+                "matching_skills": [],
+                "missing_skills": [],
+                "recommendation": recommendation,
+            }
+        if "RESUME TEXT:" in prompt:
+            return {
+                "name": "Synthetic Candidate", "email": "candidate@example.com",
+                "phone_number": "555-0100",
+                "skills": ["Python", "Docker"], "education": "BSc Computer Science",
+                "experience": [
+                    {"title": "Engineer", "company": "Acme", "responsibilities": ["Built services"]}
+                ],
+                "summary": "Synthetic resume.", "projects": [],
+            }
+        reference = re.search(r"Job reference: (\d+)", prompt)
+        job = self.jobs.get(reference.group(1)) if reference else None
+        if job is not None:
+            return {
+                "description": job["paragraphs"][0],
+                "requirements": job["requirements"],
+                "key_technologies": job["key_technologies"],
+            }
+        return {"description": "", "requirements": [], "key_technologies": []}
+
+
+class _FakeOllamaHandler(QuietHandler):
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        if self.path != "/api/generate":
+            return self._send(404, b"Not Found", "text/plain")
+        with self.server._lock:
+            self.server.requests += 1
+            self.server.in_flight += 1
+            self.server.max_in_flight = max(self.server.max_in_flight, self.server.in_flight)
+        try:
+            time.sleep(self.server.latency)
+            prompt = request.get("prompt", "")
+            response = json.dumps(self.server.respond(prompt))
+        finally:
+            with self.server._lock:
+                self.server.in_flight -= 1
+        eval_count = max(1, len(response) // 4)
+        chunks = [
+            {"model": request.get("model"), "response": response, "done": False},
+            {
+                "model": request.get("model"), "response": "", "done": True,
+                "prompt_eval_count": max(1, len(prompt) // 4),
+                "eval_count": eval_count,
+                # Ollama reports nanoseconds
+                "eval_duration": int(self.server.latency * 1e9) or 1,
+                "total_duration": int(self.server.latency * 1e9) or 1,
+            },
+        ]
+        body = "".join(json.dumps(chunk) + "\n" for chunk in chunks).encode()
+        self._send(200, body, "application/x-ndjson")
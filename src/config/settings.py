@@ -9,19 +9,128 @@ class Config:
     DATA_DIR = PROJECT_ROOT_DIR.joinpath("data")
     PROMPT_DIR = PROJECT_ROOT_DIR.joinpath("src", "prompts")
     VECTOR_DB_DIR = DATA_DIR.joinpath("vector_db")
+    RESUME_DIR = DATA_DIR.joinpath("resumes")
+    DEFAULT_RESUME_PATH = RESUME_DIR.joinpath("resume_2025.pdf")
+
+    # LLM configuration
+    LLM_MODEL = "llama3.2"
+    OLLAMA_BASE_URL = "http://localhost:11434"
+    # Keep at or below the Ollama server's OLLAMA_NUM_PARALLEL
+    LLM_EXTRACTION_WORKERS = 4
+    # Processes for PDF text extraction when ingesting a directory of resumes
+    RESUME_EXTRACTION_WORKERS = 4
+
+    # LLM response cache configuration
+    LLM_CACHE_ENABLED = True
+    LLM_CACHE_PATH = DATA_DIR.joinpath("llm_cache.db")
+    LLM_CACHE_MAX_ENTRIES = 20000
+    LLM_CACHE_MAX_AGE_DAYS = 30
+
+    # Metrics configuration: exported at the end of every CLI run
+    METRICS_ENABLED = True
+    METRICS_EXPORT_FORMATS = ["jsonl"]  # "jsonl" and/or "prometheus"
+    METRICS_JSONL_PATH = DATA_DIR.joinpath("metrics.jsonl")
+    METRICS_PROMETHEUS_PATH = DATA_DIR.joinpath("metrics.prom")
+
+    # Database configuration
+    SQLITE_PRAGMAS = [
+        "journal_mode=WAL",
+        "synchronous=NORMAL",
+        "busy_timeout=5000",
+        "temp_store=MEMORY",
+        "cache_size=-64000",  # 64 MB
+    ]
+    JOB_PERSIST_BATCH_SIZE = 20
+    # Near-duplicate reposts: MinHash over word shingles of the role details, LSH bands to
+    # find candidates; a posting at or above JOB_DEDUP_SIMILARITY (estimated Jaccard) to a
+    # stored one reuses its extraction and match results instead of calling the LLM again.
+    # 3-word shingles at 0.75 keep reposts with ~3% of words edited or an agency header/footer
+    # added (0.78-0.90) and reject distinct postings (~0.3); 32 bands of 4 rows make pairs at
+    # 0.75 candidates with near certainty
+    JOB_DEDUP_ENABLED = True
+    JOB_DEDUP_SIMILARITY = 0.75
+    JOB_DEDUP_NUM_PERM = 128  # must be a multiple of JOB_DEDUP_BANDS
+    JOB_DEDUP_BANDS = 32
+    JOB_DEDUP_SHINGLE_SIZE = 3  # words per shingle
+    # One engine is shared per process; each thread checks out its own pooled connection
+    DB_POOL_SIZE = 5
+    DB_MAX_OVERFLOW = 10
 
     # Scraper configuration
     SCRAPER_URLs = {
         "LinkedIn": "https://linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search?keywords=AI&location=Greater%20Toronto%20Area,%20Canada&f_TPR=r84600&start={start_index}"
     }
+    SCRAPER_MAX_WORKERS = 8
+    SCRAPER_REQUESTS_PER_SECOND = 2.0  # per host
+    SCRAPER_RATE_LIMIT_BURST = 4
+    SCRAPER_MAX_RETRIES = 3
+    SCRAPER_BACKOFF_SECONDS = 1.0
+    SCRAPER_TIMEOUT_SECONDS = 15
+    SCRAPER_HTML_FAST_PATH = True  # lxml + XPath for the few elements used, html.parser as fallback
+
+    # On-disk HTTP response cache for scraped pages (ETag / Last-Modified revalidation once stale)
+    HTTP_CACHE_ENABLED = True
+    HTTP_CACHE_PATH = DATA_DIR.joinpath("http_cache.db")
+    HTTP_CACHE_LISTING_TTL_SECONDS = 15 * 60  # listings change as postings come and go
+    HTTP_CACHE_DETAIL_TTL_SECONDS = 7 * 24 * 60 * 60
+    HTTP_CACHE_MAX_AGE_DAYS = 30
+    HTTP_CACHE_IGNORED_PARAMS = ["refId", "trackingId", "trk", "position", "pageNum"]
+    # Replay mode: serve every page from the cache and never touch the network
+    HTTP_CACHE_OFFLINE = False
+    # Scraped postings wait here until the extract step has parsed and stored them
+    SCRAPED_JOBS_PATH = DATA_DIR.joinpath("scraped_jobs.jsonl")
+    # Postings that failed extraction this many times move to the dead-letter file and can be
+    # scraped again
+    JOB_EXTRACTION_MAX_ATTEMPTS = 3
+    SCRAPED_JOBS_DEAD_LETTER_PATH = DATA_DIR.joinpath("scraped_jobs_failed.jsonl")
 
     # Knowledge store configuration
     CHROMADB_PERSISTANCE_PATH = VECTOR_DB_DIR
     KNOWLEDGE_PATH = DATA_DIR.joinpath("knowledge")
     SKILL_KNOWLEDGE_DIR = "skills"
     SKILL_COLLECTION_NAME = "skills"
+    JOB_COLLECTION_NAME = "jobs"
+    RESUME_COLLECTION_NAME = "resumes"
+    KNOWLEDGE_MANIFEST_PATH = VECTOR_DB_DIR.joinpath("skills_manifest.json")
+    SKILL_ALIAS_INDEX_PATH = VECTOR_DB_DIR.joinpath("skill_aliases.json")
 
     # Knowledge retrieval limits
     PER_SKILL_DEFINITIONS = 1
     PER_SKILL_TOOLS = 1
     PER_EXPERIENCE_MANIFESTATIONS = 3
+
+    # Matching prompt context assembly
+    MATCHING_CONTEXT_TOKEN_BUDGET = 1500
+    CONTEXT_CHARS_PER_TOKEN = 4  # rough estimate for llama-family tokenizers
+    CONTEXT_DEDUP_SIMILARITY = 0.8  # word-set Jaccard above which two examples are near-identical
+
+    # Matching configuration
+    MATCHING_WORKERS = 4  # concurrent LLM scoring requests
+    MATCHING_CONTEXT_WORKERS = 2  # concurrent context builds feeding the LLM workers
+    MATCHING_CHUNK_SIZE = 50
+    MATCHING_LEASE_SECONDS = 1800  # must cover scoring a whole chunk
+    MATCHING_MAX_ATTEMPTS = 3
+
+    # Embedding shortlist ahead of LLM matching (set a limit to None to disable it)
+    MATCHING_SHORTLIST_ENABLED = True
+    MATCHING_SHORTLIST_TOP_K = 50
+    MATCHING_SHORTLIST_MIN_SIMILARITY = 0.3
+    # SQL prefilter on normalized skills before the shortlist; 0 considers every unprocessed job
+    MATCHING_MIN_SHARED_SKILLS = 0
+
+    # Scoring mode: "llm" (LLM scores every job), "skills" (deterministic skill coverage only)
+    # or "hybrid" (skill coverage for every job, LLM for the top MATCHING_HYBRID_LLM_TOP_K)
+    MATCHING_MODE = "llm"
+    MATCHING_HYBRID_LLM_TOP_K = 20
+    # Cosine similarity between a job skill and its closest resume skill: full credit at or
+    # above SKILL_MATCH_SIMILARITY, none at or below SKILL_PARTIAL_SIMILARITY, linear between
+    SKILL_MATCH_SIMILARITY = 0.8
+    SKILL_PARTIAL_SIMILARITY = 0.5
+    # Job/resume document similarity mapped linearly onto the role alignment points
+    ALIGNMENT_MIN_SIMILARITY = 0.2
+    ALIGNMENT_MAX_SIMILARITY = 0.7
+
+    # Retrieval cache configuration
+    RETRIEVAL_CACHE_SIZE = 10000
+    RETRIEVAL_CACHE_PERSIST = False
+    RETRIEVAL_CACHE_PATH = VECTOR_DB_DIR.joinpath("retrieval_cache.json")
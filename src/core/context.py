@@ -0,0 +1,128 @@
+import logging
+import threading
+
+import yaml
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from ..config.settings import Config
+from ..models.database import DatabaseManager
+
+
+class AppContext:
+    """
+    Process-wide resources shared by the services and the matching agent.
+
+    Owns the single pooled database engine and a thread-local `scoped_session` registry,
+    the LLM clients (one per model and settings, sharing one response cache) and the parsed
+    prompt files and templates. Everything is created on first use, so a command only pays
+    for what it touches.
+    """
+
+    def __init__(self):
+        self._engine=None
+        self._session_factory=None
+        self._llm_cache=None
+        self._llms={}
+        self._prompts={}
+        self._prompt_templates={}
+        self._skill_aliases=None
+        self._lock=threading.RLock()
+
+    @property
+    def engine(self):
+        with self._lock:
+            if(self._engine is None):
+                self._engine=DatabaseManager.build_engine()
+            return self._engine
+
+    @property
+    def session_factory(self) -> scoped_session:
+        """Thread-local session registry: each thread calling it gets its own session."""
+        with self._lock:
+            if(self._session_factory is None):
+                # Loaded rows stay readable from worker threads after a commit instead of lazily
+                # refreshing
+                self._session_factory=scoped_session(
+                    sessionmaker(bind=self.engine, expire_on_commit=False)
+                )
+            return self._session_factory
+
+    @property
+    def skill_aliases(self):
+        """The knowledge base's skill alias index, used to canonicalize skill names."""
+        with self._lock:
+            if(self._skill_aliases is None):
+                from .knowledge.aliases import SkillAliasIndex
+                self._skill_aliases=SkillAliasIndex(Config.SKILL_ALIAS_INDEX_PATH)
+            return self._skill_aliases
+
+    def reload_skill_aliases(self):
+        """Drops the loaded alias index so the next use picks up a re-ingested knowledge base."""
+        with self._lock:
+            self._skill_aliases=None
+
+    def get_llm(self, model: str=None, **llm_kwargs):
+        """Returns the cached client for `model` (default Config.LLM_MODEL) and settings."""
+        model=model or Config.LLM_MODEL
+        key=(model, tuple(sorted(llm_kwargs.items())))
+        with self._lock:
+            if(key not in self._llms):
+                from .llm import LLMResponseCache, create_llm
+                if(Config.LLM_CACHE_ENABLED and self._llm_cache is None):
+                    self._llm_cache=LLMResponseCache(
+                        db_path=Config.LLM_CACHE_PATH,
+                        max_entries=Config.LLM_CACHE_MAX_ENTRIES,
+                        max_age_seconds=Config.LLM_CACHE_MAX_AGE_DAYS*24*60*60
+                    )
+                self._llms[key]=create_llm(model=model, cache=self._llm_cache, **llm_kwargs)
+                logging.info(f"Created LLM client for {model} {llm_kwargs}.")
+            return self._llms[key]
+
+    def get_prompts(self, prompt_file: str) -> dict:
+        """Returns the parsed contents of a YAML file in Config.PROMPT_DIR."""
+        with self._lock:
+            if(prompt_file not in self._prompts):
+                prompts_path=Config.PROMPT_DIR.joinpath(prompt_file)
+                if(not prompts_path.exists()):
+                    raise Exception(f"Prompt file {prompts_path} does not exist")
+                with open(prompts_path, 'r') as file:
+                    self._prompts[prompt_file]=yaml.safe_load(file)
+            return self._prompts[prompt_file]
+
+    def get_prompt_template(self, prompt_file: str, prompt_name: str):
+        """Returns the compiled PromptTemplate for one prompt of a prompt file."""
+        key=(prompt_file, prompt_name)
+        with self._lock:
+            if(key not in self._prompt_templates):
+                from langchain_core.prompts import PromptTemplate
+                template=self.get_prompts(prompt_file).get(prompt_name)
+                if(template is None):
+                    raise Exception(f"Prompt {prompt_name} is missing from {prompt_file}")
+                self._prompt_templates[key]=PromptTemplate.from_template(template)
+            return self._prompt_templates[key]
+
+    def close(self):
+        with self._lock:
+            if(self._session_factory is not None):
+                self._session_factory.remove()
+            if(self._engine is not None):
+                self._engine.dispose()
+            if(self._llm_cache is not None):
+                self._llm_cache.close()
+            self._engine=None
+            self._session_factory=None
+            self._llm_cache=None
+            self._llms={}
+
+
+_app_context=None
+_app_context_lock=threading.Lock()
+
+
+def get_app_context() -> AppContext:
+    """Returns the process-wide AppContext, creating it on first use."""
+    global _app_context
+    with _app_context_lock:
+        if(_app_context is None):
+            _app_context=AppContext()
+        return _app_context
@@ -1,3 +1,8 @@
-from .store import KnowledgeStore
+from ..lazy import lazy_exports
+from .aliases import SkillAliasIndex
+from .cache import RetrievalCache
 
-__all__ = ['KnowledgeStore']
+__all__ = ['KnowledgeStore', 'RetrievalCache', 'SkillAliasIndex']
+
+# The store needs ChromaDB; the caches do not
+__getattr__ = lazy_exports(__name__, {'KnowledgeStore': '.store'})
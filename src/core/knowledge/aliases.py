@@ -0,0 +1,117 @@
+import json
+import logging
+from pathlib import Path
+
+
+class SkillAliasIndex:
+    """
+    In-memory exact-match index from skill names and aliases to knowledge base records.
+
+    Built at ingestion time from each skill file's `skill_name`, `related_skills` and
+    `specific_tools`, and persisted per source file so incremental ingestion only has to
+    refresh the files that changed. Lookups are O(1) dictionary hits that let known skills
+    bypass vector search.
+    """
+
+    def __init__(self, index_path: Path):
+        self.index_path=index_path
+        self.sources={}
+        self._definitions={}
+        self._tools={}
+        self._load()
+
+    @staticmethod
+    def normalize(name: str) -> str:
+        return " ".join(name.split()).lower()
+
+    def set_source(self, source_key: str, skill_detail: dict, skill_docs: list):
+        """Replaces the alias entries of one skill file with those of its freshly built docs."""
+        definition=next(doc for doc in skill_docs if doc[2].get("type")=="definition")
+        self.sources[source_key]={
+            "skill_name": skill_detail.get("skill_name","").strip(),
+            "aliases": [
+                *skill_detail.get("related_skills",[]), *skill_detail.get("specific_tools",[])
+            ],
+            "definition": definition,
+            "tools": [doc for doc in skill_docs if doc[2].get("type")=="tool"]
+        }
+
+    def remove_source(self, source_key: str):
+        self.sources.pop(source_key, None)
+
+    def rebuild(self):
+        """
+        Rebuilds the lookup tables. Canonical skill names always win; an alias or tool name
+        shared by several skills is ambiguous and left to vector search.
+        """
+        canonical={}
+        alias_candidates={}
+        tool_candidates={}
+        for entry in self.sources.values():
+            definition=tuple(entry["definition"])
+            canonical[SkillAliasIndex.normalize(entry["skill_name"])]=definition
+            for alias in entry["aliases"]:
+                records=alias_candidates.setdefault(SkillAliasIndex.normalize(alias), {})
+                records[definition[0]]=definition
+            for tool in entry["tools"]:
+                tool_name=SkillAliasIndex.normalize(tool[2].get("tool",""))
+                tool_candidates.setdefault(tool_name, []).append(tuple(tool))
+
+        self._definitions={
+            alias: next(iter(records.values()))
+            for alias, records in alias_candidates.items()
+            if len(records)==1
+        }
+        self._definitions.update(canonical)
+
+        self._tools={}
+        for name, records in tool_candidates.items():
+            if(len(records)>1):
+                # Prefer the tool listed under the skill of the same name, e.g. Docker under Docker
+                records=[
+                    record for record in records
+                    if SkillAliasIndex.normalize(record[2].get("skill",""))==name
+                ]
+            if(len(records)==1):
+                self._tools[name]=records[0]
+
+    def lookup(self, query: str, doc_type: str):
+        """Returns the (id, document, metadata) record for an exact or alias match, or None."""
+        if(doc_type=="definition"):
+            return self._definitions.get(SkillAliasIndex.normalize(query))
+        if(doc_type=="tool"):
+            return self._tools.get(SkillAliasIndex.normalize(query))
+        return None
+
+    def canonical_skill(self, name: str):
+        """Returns the knowledge base skill `name` refers to, or None for an unknown name."""
+        record=self._definitions.get(SkillAliasIndex.normalize(name))
+        return record[2].get("skill") if record else None
+
+    def save(self):
+        try:
+            with open(self.index_path, 'w') as f:
+                json.dump(self.sources, f, indent=2, sort_keys=True)
+            logging.info(
+                f"Saved skill alias index for {len(self.sources)} skill files to {self.index_path}."
+            )
+        except Exception:
+            logging.error(f"Failed to write skill alias index {self.index_path}.")
+            raise
+
+    def _load(self):
+        if(not self.index_path.exists()):
+            return
+        try:
+            with open(self.index_path, 'r') as f:
+                self.sources=json.load(f)
+            self.rebuild()
+            logging.info(
+                f"Loaded skill alias index for {len(self.sources)} skill files "
+                f"from {self.index_path}."
+            )
+        except Exception as e:
+            logging.error(
+                f"Failed to read skill alias index {self.index_path}, starting empty: {e}"
+            )
+            self.sources={}
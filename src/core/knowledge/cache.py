@@ -0,0 +1,95 @@
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+
+class RetrievalCache:
+    """
+    Bounded LRU cache for vector DB retrieval results.
+
+    Entries are keyed by (normalized query text, n_results, doc_type) so that the same
+    skill or responsibility looked up for many jobs only hits ChromaDB once. The cache can
+    optionally be persisted to a JSON file and reloaded by later runs.
+    """
+
+    def __init__(self, max_size: int, persist_path: Path = None):
+        self.max_size=max_size
+        self.persist_path=persist_path
+        self.hits=0
+        self.misses=0
+        self._entries=OrderedDict()
+        self._lock=threading.Lock()
+        if(self.persist_path):
+            self._load()
+
+    @staticmethod
+    def make_key(query: str, n_results: int, doc_type: str = None):
+        normalized=" ".join(query.split()).lower()
+        return (normalized, n_results, doc_type or "")
+
+    def get(self, key):
+        with self._lock:
+            if(key not in self._entries):
+                self.misses+=1
+                return None
+            self._entries.move_to_end(key)
+            self.hits+=1
+            return self._entries[key]
+
+    def put(self, key, results: list):
+        with self._lock:
+            self._entries[key]=results
+            self._entries.move_to_end(key)
+            while(len(self._entries)>self.max_size):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits=0
+            self.misses=0
+            if(self.persist_path and self.persist_path.exists()):
+                self.persist_path.unlink()
+        logging.info("Cleared retrieval cache.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups=self.hits+self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits/lookups if lookups else 0.0
+            }
+
+    def save(self):
+        if(not self.persist_path):
+            return
+        with self._lock:
+            entries=[[list(key), results] for key, results in self._entries.items()]
+        try:
+            with open(self.persist_path, 'w') as f:
+                json.dump(entries, f)
+            logging.info(f"Saved {len(entries)} retrieval cache entries to {self.persist_path}.")
+        except Exception as e:
+            logging.error(f"Failed to save retrieval cache to {self.persist_path}: {e}")
+
+    def _load(self):
+        if(not self.persist_path.exists()):
+            return
+        try:
+            with open(self.persist_path, 'r') as f:
+                entries=json.load(f)
+            for key, results in entries[-self.max_size:]:
+                self._entries[tuple(key)]=[tuple(result) for result in results]
+            logging.info(
+                f"Loaded {len(self._entries)} retrieval cache entries from {self.persist_path}."
+            )
+        except Exception as e:
+            logging.error(
+                f"Failed to load retrieval cache from {self.persist_path}, starting empty: {e}"
+            )
+            self._entries.clear()
@@ -1,10 +1,13 @@
 from chromadb import PersistentClient
 from ...config.settings import Config
+from .cache import RetrievalCache
+from .aliases import SkillAliasIndex
+from ..metrics import metrics
 from pathlib import Path
 import os
 import logging
 import yaml
-import uuid
+import hashlib
 import json
 
 class KnowledgeStore:
@@ -13,6 +16,13 @@ class KnowledgeStore:
         self._initialize_vector_db(Config.CHROMADB_PERSISTANCE_PATH)
         self.knowledge_dir=kowledge_path
         self.collection=None
+        self.knowledge_version=KnowledgeStore._manifest_version(self._load_manifest())
+        self.alias_index=SkillAliasIndex(Config.SKILL_ALIAS_INDEX_PATH)
+        self.alias_hits=0
+        self.retrieval_cache=RetrievalCache(
+            max_size=Config.RETRIEVAL_CACHE_SIZE,
+            persist_path=Config.RETRIEVAL_CACHE_PATH if Config.RETRIEVAL_CACHE_PERSIST else None
+        )
 
     
     def _initialize_vector_db(self, path: Path):
@@ -27,15 +37,17 @@ class KnowledgeStore:
             logging.error("Failed to initialize ChromaDB Persistent Client.")
             raise
     
-    def process_knowledge(self):
-        try:
-            if(Config.SKILL_COLLECTION_NAME in [collection.name for collection in self.vector_client.list_collections()]):
-                self.vector_client.delete_collection(Config.SKILL_COLLECTION_NAME)
-            self.collection=self.vector_client.get_or_create_collection(Config.SKILL_COLLECTION_NAME)
-        except Exception as e:
-            logging.error(f"Failed to initialize ChromaDB collection: {Config.SKILL_COLLECTION_NAME}")
-            raise
-        
+    def process_knowledge(self, rebuild: bool=False):
+        """
+        Incrementally ingests the skill knowledge files into the vector DB.
+
+        Each skill file is hashed and compared against the stored manifest; only new or
+        changed files are re-embedded (upserted under deterministic, content-hashed IDs),
+        and documents belonging to removed files are deleted.
+
+        Args:
+            rebuild: Drop the collection and re-embed every skill file
+        """
         if(not self.knowledge_dir.exists()):
             logging.error("Path for knowledge store data MUST be a valid directory.")
             raise FileNotFoundError(self.knowledge_dir)
@@ -43,92 +55,272 @@ class KnowledgeStore:
         if(not skills_dir_path.exists()):
             logging.error("Path for skill-specific knowledge store data MUST be a existing directory.")
             raise FileNotFoundError(skills_dir_path)
-        
-        skill_paths=list(skills_dir_path.glob('**/*.y[a]ml'))
-        skill_details=[]
-        for skill_path in skill_paths:
-            skill_details.append(KnowledgeStore.parse_skill_file(skill_file_path=skill_path))
-        
-        
+
+        manifest={} if rebuild else self._load_manifest()
+        try:
+            collection_exists=Config.SKILL_COLLECTION_NAME in [
+                collection.name for collection in self.vector_client.list_collections()
+            ]
+            if(collection_exists and not manifest):
+                # No manifest means the collection was not built incrementally (or a rebuild was
+                # requested)
+                self.vector_client.delete_collection(Config.SKILL_COLLECTION_NAME)
+            elif(not collection_exists):
+                manifest={}
+            self.collection=self.vector_client.get_or_create_collection(Config.SKILL_COLLECTION_NAME)
+        except Exception:
+            logging.error(
+                f"Failed to initialize ChromaDB collection: {Config.SKILL_COLLECTION_NAME}"
+            )
+            raise
+
+        file_hashes={}
+        for skill_path in sorted(skills_dir_path.glob('**/*.y[a]ml')):
+            source_key=skill_path.relative_to(skills_dir_path).as_posix()
+            file_hashes[source_key]=(
+                skill_path, hashlib.sha256(skill_path.read_bytes()).hexdigest()
+            )
+
         skill_docs=[]
-        for skill_detail in skill_details:
-            skill_name=skill_detail.get("skill_name","").strip()
-            definition=skill_detail.get("definition","").strip()
-            related_skills=skill_detail.get("related_skills",[])
-            resume_manifestations=skill_detail.get("resume_manifestations",[])
-            specific_tools=skill_detail.get("specific_tools",[])
-            category=skill_detail.get("category","").strip()
-            source=skill_detail.get("source","").strip()
-
-
-            id = str(uuid.uuid4())
-            content=f"Skill: {skill_name}\Definition: {definition}\nSimilar Skills: {",".join(related_skills)}"
+        stale_ids=[]
+        updated_manifest={}
+        for source_key, (skill_path, file_hash) in file_hashes.items():
+            previous=manifest.get(source_key)
+            unchanged=previous and previous.get("hash")==file_hash
+            if(unchanged and source_key in self.alias_index.sources):
+                updated_manifest[source_key]=previous
+                continue
+            skill_detail=KnowledgeStore.parse_skill_file(skill_file_path=skill_path)
+            file_docs=KnowledgeStore._build_skill_docs(skill_detail)
+            self.alias_index.set_source(source_key, skill_detail, file_docs)
+            file_ids=[doc[0] for doc in file_docs]
+            previous_ids=set(previous.get("ids",[])) if previous else set()
+            stale_ids.extend(previous_ids-set(file_ids))
+            # Chunks whose content is unchanged keep their ID and need no re-embedding
+            skill_docs.extend([doc for doc in file_docs if doc[0] not in previous_ids])
+            updated_manifest[source_key]={"hash":file_hash, "ids":file_ids}
+
+        for source_key in set(manifest)-set(file_hashes):
+            stale_ids.extend(manifest[source_key].get("ids",[]))
+            self.alias_index.remove_source(source_key)
+            logging.info(f"Removing knowledge for deleted skill file: {source_key}")
+
+        if(stale_ids):
+            self._delete_documents(stale_ids)
+        if(skill_docs):
+            self._embed_document(skill_docs=skill_docs)
+        self._save_manifest(updated_manifest)
+        for source_key in set(self.alias_index.sources)-set(updated_manifest):
+            self.alias_index.remove_source(source_key)
+        self.alias_index.rebuild()
+        self.alias_index.save()
+        self.knowledge_version=KnowledgeStore._manifest_version(updated_manifest)
+
+        if(skill_docs or stale_ids or not manifest):
+            # Cached results may point at documents that were replaced or removed
+            self.retrieval_cache.clear()
+        logging.info(
+            f"Knowledge ingestion complete: {len(skill_docs)} chunks upserted, "
+            f"{len(stale_ids)} chunks deleted."
+        )
+
+    @staticmethod
+    def _build_skill_docs(skill_detail: dict):
+        skill_name=skill_detail.get("skill_name","").strip()
+        definition=skill_detail.get("definition","").strip()
+        related_skills=skill_detail.get("related_skills",[])
+        resume_manifestations=skill_detail.get("resume_manifestations",[])
+        specific_tools=skill_detail.get("specific_tools",[])
+        category=skill_detail.get("category","").strip()
+        source=skill_detail.get("source","").strip()
+
+        skill_docs={}
+        content=(
+            f"Skill: {skill_name}\Definition: {definition}\n"
+            f"Similar Skills: {','.join(related_skills)}"
+        )
+        metadata={
+            "type":"definition",
+            "skill": skill_name,
+            "category": category,
+            "source": source
+        }
+        id=KnowledgeStore._document_id(source, content, metadata)
+        skill_docs[id]=[id,content,metadata]
+
+        for manifestation in resume_manifestations:
+            content=f"Resume example: {manifestation} demonstrates skill: {skill_name}"
             metadata={
-                "type":"definition",
+                "type":"manifestation",
                 "skill": skill_name,
-                "category": category,
                 "source": source
             }
-            skill_docs.append([id,content,metadata])
-
-            for manifestation in resume_manifestations:
-                id = str(uuid.uuid4())
-                content=f"Resume example: {manifestation} demonstrates skill: {skill_name}"
-                metadata={
-                    "type":"manifestation",
-                    "skill": skill_name,
-                    "source": source
-                }
-                skill_docs.append([id,content,metadata])
-            
-            for tool in specific_tools:
-                id = str(uuid.uuid4())
-                content=f"Tool: {tool} is a tool for: {skill_name}"
-                metadata={
-                    "type":"tool",
-                    "skill": skill_name,
-                    "tool":tool,
-                    "source": source
-                }
-                skill_docs.append([id,content,metadata])
-        self._embed_document(skill_docs=skill_docs)
-        
-    def _embed_document(self,skill_docs):
+            id=KnowledgeStore._document_id(source, content, metadata)
+            skill_docs[id]=[id,content,metadata]
+
+        for tool in specific_tools:
+            content=f"Tool: {tool} is a tool for: {skill_name}"
+            metadata={
+                "type":"tool",
+                "skill": skill_name,
+                "tool":tool,
+                "source": source
+            }
+            id=KnowledgeStore._document_id(source, content, metadata)
+            skill_docs[id]=[id,content,metadata]
+        return list(skill_docs.values())
+
+    @staticmethod
+    def _document_id(source: str, content: str, metadata: dict) -> str:
+        payload=json.dumps([source, content, metadata], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_manifest(self) -> dict:
+        if(not Config.KNOWLEDGE_MANIFEST_PATH.exists()):
+            return {}
         try:
-            self.collection.add(
-                ids=[doc[0] for doc in skill_docs],
-                documents=[doc[1] for doc in skill_docs],
-                metadatas=[doc[2] for doc in skill_docs]
+            with open(Config.KNOWLEDGE_MANIFEST_PATH, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logging.error(
+                f"Failed to read knowledge manifest {Config.KNOWLEDGE_MANIFEST_PATH}, "
+                f"rebuilding: {e}"
             )
+            return {}
+
+    @staticmethod
+    def _manifest_version(manifest: dict) -> str:
+        """Identifies the ingested knowledge base: changes whenever any skill file changes."""
+        file_hashes=sorted(
+            (source_key, entry.get("hash")) for source_key, entry in manifest.items()
+        )
+        return hashlib.sha256(json.dumps(file_hashes).encode("utf-8")).hexdigest()
+
+    def _save_manifest(self, manifest: dict):
+        try:
+            with open(Config.KNOWLEDGE_MANIFEST_PATH, 'w') as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+        except Exception:
+            logging.error(f"Failed to write knowledge manifest {Config.KNOWLEDGE_MANIFEST_PATH}.")
+            raise
+
+    def _embed_document(self,skill_docs):
+        try:
+            batch_size=self.vector_client.get_max_batch_size()
+            for start in range(0, len(skill_docs), batch_size):
+                batch=skill_docs[start:start+batch_size]
+                self.collection.upsert(
+                    ids=[doc[0] for doc in batch],
+                    documents=[doc[1] for doc in batch],
+                    metadatas=[doc[2] for doc in batch]
+                )
             logging.info(f"Successfully embedded {len(skill_docs)} chunks")
         except Exception as e:
             logging.error("Failed to embed chunks.")
             raise
 
+    def _delete_documents(self, ids: list[str]):
+        try:
+            batch_size=self.vector_client.get_max_batch_size()
+            for start in range(0, len(ids), batch_size):
+                self.collection.delete(ids=ids[start:start+batch_size])
+            logging.info(f"Successfully deleted {len(ids)} stale chunks")
+        except Exception:
+            logging.error("Failed to delete stale chunks.")
+            raise
     
     def query_vector_db(self, query: str, n_results:int, doc_type:str= None):
-        if(self.collection==None):
-            try:
-                self.collection=self.vector_client.get_collection(Config.SKILL_COLLECTION_NAME)
-                logging.info(f"Successfully retrieved ChromaDB collection: {Config.SKILL_COLLECTION_NAME}.")
-            except:
-                logging.error(f"Failed to get ChromaDB collection: {Config.SKILL_COLLECTION_NAME}.")
-                raise
+        return self.query_vector_db_batch([query], n_results, doc_type)[0]
+
+    def query_vector_db_batch(self, queries: list[str], n_results:int, doc_type:str= None):
+        """
+        Queries the vector DB for many texts in a single ChromaDB round-trip.
+        Single-result definition and tool lookups that exactly match a known skill, alias
+        or tool are resolved from the alias index; other results are served from the
+        retrieval cache where possible, and only the remaining misses are sent to ChromaDB.
+
+        Args:
+            queries: Query texts, embedded together in one call
+            n_results: Number of results to return per query
+            doc_type: Optional document type filter ("definition", "tool", "manifestation")
+
+        Returns:
+            One list of (id, document, metadata, distance) tuples per query, in query order
+        """
+        if(not queries):
+            return []
+        keys=[RetrievalCache.make_key(query, n_results, doc_type) for query in queries]
+        resolved={}
+        missing={}
+        for query, key in zip(queries, keys):
+            if(key in resolved or key in missing):
+                continue
+            alias_record=self.alias_index.lookup(query, doc_type) if n_results==1 else None
+            if(alias_record):
+                self.alias_hits+=1
+                metrics.increment("retrieval_lookups", source="alias")
+                resolved[key]=[(*alias_record, 0.0)]
+                continue
+            cached=self.retrieval_cache.get(key)
+            if(cached is None):
+                metrics.increment("retrieval_lookups", source="vector_db")
+                missing[key]=query
+            else:
+                metrics.increment("retrieval_lookups", source="cache")
+                resolved[key]=cached
+
+        if(missing):
+            query_results=self._query_collection(list(missing.values()), n_results, doc_type)
+            for key, results in zip(missing, query_results):
+                self.retrieval_cache.put(key, results)
+                resolved[key]=results
+        return [resolved[key] for key in keys]
+
+    def save_cache(self):
+        self.retrieval_cache.save()
+
+    def cache_stats(self) -> dict:
+        return {**self.retrieval_cache.stats(), "alias_hits": self.alias_hits}
+
+    def _query_collection(self, queries: list[str], n_results:int, doc_type:str= None):
+        self._get_collection()
         results=None
         try:
-            if(doc_type):
-                results=self.collection.query(query_texts=[query],n_results=n_results, where={"type":doc_type})
-            else:
-                results=self.collection.query(query_texts=[query],n_results=n_results)
+            with metrics.span("vector_query", collection=Config.SKILL_COLLECTION_NAME):
+                if(doc_type):
+                    results=self.collection.query(
+                        query_texts=queries,n_results=n_results, where={"type":doc_type}
+                    )
+                else:
+                    results=self.collection.query(query_texts=queries,n_results=n_results)
         except Exception as e:
+            metrics.increment("vector_query_failures", collection=Config.SKILL_COLLECTION_NAME)
             logging.error(f"Failed to query ChromaDB collection {Config.SKILL_COLLECTION_NAME}.")
             raise
 
-        logging.info(f"Sucessfully qeried {len(results["ids"][0])} results from ChromaDB collection {Config.SKILL_COLLECTION_NAME}.")
-        return list(zip(results["ids"][0], results["documents"][0], results["metadatas"][0], results["distances"][0]))
+        logging.info(
+            f"Sucessfully queried {len(queries)} texts from ChromaDB collection "
+            f"{Config.SKILL_COLLECTION_NAME}."
+        )
+        return [
+            list(zip(ids, documents, metadatas, distances))
+            for ids, documents, metadatas, distances in zip(
+                results["ids"], results["documents"], results["metadatas"], results["distances"]
+            )
+        ]
 
+    def _get_collection(self):
+        if(self.collection==None):
+            try:
+                self.collection=self.vector_client.get_collection(Config.SKILL_COLLECTION_NAME)
+                logging.info(
+                    f"Successfully retrieved ChromaDB collection: {Config.SKILL_COLLECTION_NAME}."
+                )
+            except:
+                logging.error(f"Failed to get ChromaDB collection: {Config.SKILL_COLLECTION_NAME}.")
+                raise
+        return self.collection
 
-    
     @staticmethod
     def parse_skill_file(skill_file_path: Path):
         skill_details=None
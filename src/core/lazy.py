@@ -0,0 +1,14 @@
+import importlib
+
+
+def lazy_exports(package: str, exports: dict[str, str]):
+    """
+    Returns a module-level `__getattr__` for `package` that imports each name in `exports`
+    from its submodule on first access, so importing one module of the package does not
+    load the heavy dependencies (LangChain, ChromaDB) of the others.
+    """
+    def module_getattr(name):
+        if name in exports:
+            return getattr(importlib.import_module(exports[name], package), name)
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+    return module_getattr
@@ -0,0 +1,7 @@
+from ..lazy import lazy_exports
+from .cache import CachedLLM, LLMResponseCache
+
+__all__ = ['LLMResponseCache', 'CachedLLM', 'create_llm']
+
+# The client needs LangChain; the response cache does not
+__getattr__ = lazy_exports(__name__, {'create_llm': '.client'})
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from ..metrics import metrics
+
+
+class LLMResponseCache:
+    """
+    Persistent, content-addressed cache of LLM responses stored in SQLite.
+
+    Entries are keyed by a hash of the model name, temperature, prompt-template version and
+    rendered prompt, so any change to one of them is a cache miss. Entries older than
+    `max_age_seconds` are dropped, and the least recently used entries are evicted once the
+    cache holds more than `max_entries`.
+    """
+
+    def __init__(self, db_path: Path, max_entries: int, max_age_seconds: float):
+        self.db_path=db_path
+        self.max_entries=max_entries
+        self.max_age_seconds=max_age_seconds
+        self.hits=0
+        self.misses=0
+        self._lock=threading.Lock()
+        try:
+            self._connection=sqlite3.connect(db_path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_accessed REAL NOT NULL
+                )"""
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_llm_responses_last_accessed "
+                "ON llm_responses (last_accessed)"
+            )
+            self._connection.commit()
+            logging.info(f"Successfully opened LLM response cache: {db_path}")
+        except Exception:
+            logging.error(f"Failed to open LLM response cache: {db_path}")
+            raise
+        self.evict()
+
+    @staticmethod
+    def make_key(model: str, temperature: float, prompt: str, template: str) -> str:
+        template_version=hashlib.sha256(template.encode("utf-8")).hexdigest()
+        payload=json.dumps([model, temperature, template_version, prompt])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        now=time.time()
+        with self._lock:
+            row=self._connection.execute(
+                "SELECT response FROM llm_responses WHERE key = ? AND created_at >= ?",
+                (key, now-self.max_age_seconds)
+            ).fetchone()
+            if(row is None):
+                self.misses+=1
+                return None
+            self._connection.execute(
+                "UPDATE llm_responses SET last_accessed = ? WHERE key = ?", (now, key)
+            )
+            self._connection.commit()
+            self.hits+=1
+            return row[0]
+
+    def put(self, key: str, model: str, response: str):
+        now=time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, model, response, created_at, last_accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now)
+            )
+            self._connection.commit()
+
+    def evict(self):
+        """Drops expired entries, then the least recently used ones beyond `max_entries`."""
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM llm_responses WHERE created_at < ?",
+                (time.time()-self.max_age_seconds,)
+            )
+            self._connection.execute(
+                """DELETE FROM llm_responses WHERE key IN (
+                    SELECT key FROM llm_responses ORDER BY last_accessed DESC LIMIT -1 OFFSET ?
+                )""",
+                (self.max_entries,)
+            )
+            self._connection.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size=self._connection.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+            lookups=self.hits+self.misses
+            return {
+                "size": size,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits/lookups if lookups else 0.0
+            }
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class CachedLLM:
+    """Wraps a LangChain LLM so that prompts it has already answered are served from the cache."""
+
+    def __init__(self, llm, cache: LLMResponseCache = None):
+        self.llm=llm
+        self.cache=cache
+
+    def invoke_json(self, prompt: str, template: str, required_keys: list[str] = ()) -> dict:
+        """
+        Invokes the LLM (or the cache) and parses the response as a JSON object.
+
+        Only responses that parse and contain `required_keys` are cached, so a malformed
+        response is retried on the next call instead of being replayed.
+        """
+        key=None
+        if(self.cache):
+            key=LLMResponseCache.make_key(self.llm.model, self.llm.temperature, prompt, template)
+            cached_response=self.cache.get(key)
+            metrics.increment(
+                "llm_cache_lookups", result="miss" if cached_response is None else "hit"
+            )
+            if(cached_response is not None):
+                return json.loads(cached_response)
+
+        resp=self._generate(prompt)
+        try:
+            resp_obj=json.loads(resp)
+        except Exception:
+            metrics.increment("llm_failures", model=self.llm.model, reason="invalid_json")
+            raise
+        for required_key in required_keys:
+            if(required_key not in resp_obj):
+                metrics.increment("llm_failures", model=self.llm.model, reason="missing_keys")
+                raise Exception("INVALID LLM RESPONSE")
+
+        if(self.cache):
+            self.cache.put(key, self.llm.model, resp)
+        return resp_obj
+
+    def _generate(self, prompt: str) -> str:
+        """Calls the LLM and records its latency and, when Ollama reports them, token counts."""
+        try:
+            with metrics.span("llm_call", model=self.llm.model):
+                generation=self.llm.generate([prompt]).generations[0][0]
+        except Exception:
+            metrics.increment("llm_failures", model=self.llm.model, reason="request")
+            raise
+        info=generation.generation_info or {}
+        if(info.get("prompt_eval_count")):
+            metrics.increment("llm_prompt_tokens", info["prompt_eval_count"], model=self.llm.model)
+        if(info.get("eval_count")):
+            metrics.increment("llm_completion_tokens", info["eval_count"], model=self.llm.model)
+            if(info.get("eval_duration")):
+                # Ollama reports durations in nanoseconds
+                tokens_per_second=info["eval_count"]/(info["eval_duration"]/1e9)
+                metrics.observe("llm_tokens_per_second", tokens_per_second, model=self.llm.model)
+        return generation.text
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats() if self.cache else {}
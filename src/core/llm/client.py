@@ -0,0 +1,19 @@
+from langchain_community.llms import Ollama
+
+from ...config.settings import Config
+from .cache import CachedLLM, LLMResponseCache
+
+
+def create_llm(model: str = None, cache: LLMResponseCache = None, **llm_kwargs) -> CachedLLM:
+    """
+    Creates an Ollama client for `model` (default Config.LLM_MODEL), backed by the persistent
+    response cache if enabled. Pass `cache` to share one response cache between clients.
+    """
+    llm=Ollama(model=model or Config.LLM_MODEL, base_url=Config.OLLAMA_BASE_URL, **llm_kwargs)
+    if(cache is None and Config.LLM_CACHE_ENABLED):
+        cache=LLMResponseCache(
+            db_path=Config.LLM_CACHE_PATH,
+            max_entries=Config.LLM_CACHE_MAX_ENTRIES,
+            max_age_seconds=Config.LLM_CACHE_MAX_AGE_DAYS*24*60*60
+        )
+    return CachedLLM(llm, cache)
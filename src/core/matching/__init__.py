@@ -1,4 +1,10 @@
-from .agent import MatchingAgent
-from .context_builder import ContextBuilder
+from ..lazy import lazy_exports
 
-__all__ = ['MatchingAgent', 'ContextBuilder']
+__all__ = ['MatchingAgent', 'ContextBuilder', 'JobIndex']
+
+# Each of these loads ChromaDB, and the agent LangChain too
+__getattr__ = lazy_exports(__name__, {
+    'MatchingAgent': '.agent',
+    'ContextBuilder': '.context_builder',
+    'JobIndex': '.job_index',
+})
@@ -1,90 +1,352 @@
 from ...models.database import DatabaseManager
 from ...models.entities import Resume, Job
-from langchain_community.llms import Ollama
-from langchain_core.prompts import PromptTemplate
+from ..context import AppContext, get_app_context
+from ..metrics import metrics
 from ...config.settings import Config
 from ..knowledge.store import KnowledgeStore
 from .context_builder import ContextBuilder   
-import yaml, json
+from .job_index import JobIndex
+from .report import sort_match_results, print_match_results, print_batch_summary
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime
+import json
+import socket
 import time
+import uuid
+import os
 
 class MatchingAgent:
-    def __init__(self):
-        self.db_manager=DatabaseManager()
-        self.llm = Ollama(model="llama3.2", temperature=0)
+    def __init__(self, context: AppContext=None):
+        self.context=context or get_app_context()
+        self.db_manager=DatabaseManager(self.context)
+        self.llm = self.context.get_llm(temperature=0)
 
         # Initialize KnowledgeStore once - it can be reused for all job matchings
         self.knowledge_store = KnowledgeStore(Config.KNOWLEDGE_PATH)
-
-        prompts_file=Config.PROMPT_DIR.joinpath("matching.yaml")
-        if(not prompts_file.exists()):
-            raise Exception("MatchingAgent prompt file foes not exist")
-        with open(prompts_file, 'r') as file:
-            self.prompts = yaml.safe_load(file)
+        self.context_builder = ContextBuilder(knowledge_store=self.knowledge_store)
+        self.job_index = JobIndex(vector_client=self.knowledge_store.vector_client)
+        self._skill_scorer = None
+        # Identifies this run's leases in the matching work queue
+        self.context_tokens_saved = 0
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
     
-    def match_all_jobs(self):
+    @property
+    def skill_scorer(self):
+        # Created on first use so LLM-only runs never load the embedding model
+        if(self._skill_scorer is None):
+            from .skill_scorer import SkillCoverageScorer
+            self._skill_scorer=SkillCoverageScorer(job_index=self.job_index, context=self.context)
+        return self._skill_scorer
+
+    def match_all_jobs(self, chunk_size: int=None, max_workers: int=None, mode: str=None):
+        chunk_size=max(1, chunk_size or Config.MATCHING_CHUNK_SIZE)
+        max_workers=max(1, max_workers or Config.MATCHING_WORKERS)
+        mode=mode or Config.MATCHING_MODE
+        if(mode not in ("llm", "skills", "hybrid")):
+            raise ValueError(f"Unknown matching mode {mode}, expected llm, skills or hybrid.")
         # GET ACTIVE RESUME
         active_resume=self.db_manager.get_active_resume()
+        if(active_resume is None):
+            print("No active resume found, nothing to match.")
+            return []
         print(f"ACTIVE RESUME: {active_resume.id}")
-        # GET ALL UNPROCESSED JOBS
-        unprocessed_jobs=self.db_manager.get_all_unprocessed_jobs()
-        print(f"Processing {len(unprocessed_jobs[:10])} jobs...\n")
-
-        # Collect all match results
-        results = []
-        for job in unprocessed_jobs[:10]:
-            self.match_job(active_resume, job)
-            # match_result = self.match_job(active_resume, job)
-        #     results.append({
-        #         'job': job,
-        #         'match': match_result
-        #     })
-
-        # # Sort results by recommendation priority
-        # recommendation_order = {
-        #     'STRONG MATCH': 1,
-        #     'GOOD MATCH': 2,
-        #     'MODERATE MATCH': 3,
-        #     'WEAK MATCH': 4,
-        #     'POOR MATCH': 5
-        # }
-
-        # sorted_results = sorted(
-        #     results,
-        #     key=lambda x: (
-        #         recommendation_order.get(x['match'].get('recommendation', 'POOR MATCH'), 6),
-        #         -x['match'].get('total_score', 0)
-        #     )
-        # )
-
-        # # Print sorted results
-        # print("\n" + "=" * 80)
-        # print("SORTED RESULTS (Best to Worst)")
-        # print("=" * 80)
-        # for i, result in enumerate(sorted_results, 1):
-        #     job = result['job']
-        #     match = result['match']
-        #     print(f"\n{i}. {job.title} at {job.company}")
-        #     print(f"   Score: {match.get('total_score')}/100 - {match.get('recommendation')}")
-        #     print(f"   URL: {job.url}")
-        #     print(f"   Matching Skills: {match.get('matching_skills')}")
-        #     print(f"   Missing Skills: {match.get('missing_skills')}")
-
-        # return sorted_results
+        # QUEUE ALL JOBS NOT YET MATCHED AGAINST THIS RESUME; TASKS LEFT OVER FROM INTERRUPTED RUNS
+        # ARE STILL QUEUED
+        if(Config.MATCHING_MIN_SHARED_SKILLS>0):
+            # Skill overlap is counted inside SQLite; jobs stored before the skill tables existed
+            # are backfilled first
+            self.db_manager.backfill_skill_tables()
+            unprocessed_jobs=[
+                job for job, _ in self.db_manager.get_unprocessed_jobs_sharing_skills(
+                    active_resume.id, min_shared_skills=Config.MATCHING_MIN_SHARED_SKILLS
+                )
+            ]
+            print(
+                f"{len(unprocessed_jobs)} unprocessed jobs share at least "
+                f"{Config.MATCHING_MIN_SHARED_SKILLS} skills with the resume."
+            )
+        else:
+            unprocessed_jobs=self.db_manager.get_all_unprocessed_jobs(active_resume.id)
+        unprocessed_jobs, duplicate_jobs=MatchingAgent._split_duplicates(unprocessed_jobs)
+        unprocessed_jobs=self._llm_candidates(active_resume, unprocessed_jobs, mode)
+        self.db_manager.enqueue_match_tasks(active_resume.id, [job.id for job in unprocessed_jobs])
+        print(f"Processing queued jobs with {max_workers} workers...\n")
+
+        matched_jobs, failed_jobs, elapsed_time=self._process_queue(
+            [active_resume], chunk_size, max_workers
+        )
+        self._reuse_duplicate_matches(active_resume, duplicate_jobs)
+
+        # Collect all match results for this resume, including ones checkpointed by earlier runs
+        sorted_results = sort_match_results(self.db_manager.get_match_results(active_resume.id))
+        print_match_results(sorted_results)
+        self._print_run_stats(matched_jobs, failed_jobs, elapsed_time)
+        return sorted_results
+
+    def match_batch(self, resume_ids: list[int]=None, job_ids: list[int]=None,
+                    scraped_since: datetime=None, chunk_size: int=None, max_workers: int=None,
+                    mode: str=None):
+        """
+        Matches a set of resumes against a set of jobs, e.g. several resume variants against
+        the same daily job pool, without touching which resume is active.
+
+        Each resume's context and each job's context is retrieved once and shared by every
+        pair it appears in. The resume x job pairs go through the same work queue as
+        `match_all_jobs`, so results are stored per pair and pairs finished by an earlier
+        run are skipped.
+
+        Args:
+            resume_ids: Resumes to match, None for every stored resume
+            job_ids: Jobs to match (jobs.id), None for every stored job
+            scraped_since: Only jobs scraped at or after this time
+
+        Returns:
+            resume id -> sorted match results for the requested jobs
+        """
+        chunk_size=max(1, chunk_size or Config.MATCHING_CHUNK_SIZE)
+        max_workers=max(1, max_workers or Config.MATCHING_WORKERS)
+        mode=mode or Config.MATCHING_MODE
+        if(mode not in ("llm", "skills", "hybrid")):
+            raise ValueError(f"Unknown matching mode {mode}, expected llm, skills or hybrid.")
+        resumes=self.db_manager.get_resumes(resume_ids)
+        jobs=self.db_manager.get_jobs(job_ids, scraped_since=scraped_since)
+        if(not resumes or not jobs):
+            print(f"Nothing to match: {len(resumes)} resumes and {len(jobs)} jobs selected.")
+            return {}
+        print(
+            f"Matching {len(resumes)} resumes against {len(jobs)} jobs "
+            f"with {max_workers} workers...\n"
+        )
+        original_jobs, duplicate_jobs=MatchingAgent._split_duplicates(jobs)
+        # Pairs finished by earlier runs keep their results and are never scored again
+        finished_job_ids={
+            resume.id: self.db_manager.get_finished_job_ids(resume.id) for resume in resumes
+        }
+        for resume in resumes:
+            unfinished_jobs=[
+                job for job in original_jobs if job.id not in finished_job_ids[resume.id]
+            ]
+            candidates=self._llm_candidates(resume, unfinished_jobs, mode)
+            self.db_manager.enqueue_match_tasks(resume.id, [job.id for job in candidates])
+
+        with self.context_builder.shared_job_contexts():
+            matched_jobs, failed_jobs, elapsed_time=self._process_queue(
+                resumes, chunk_size, max_workers
+            )
+        for resume in resumes:
+            self._reuse_duplicate_matches(
+                resume,
+                [job for job in duplicate_jobs if job.id not in finished_job_ids[resume.id]]
+            )
+
+        selected_job_ids={job.id for job in jobs}
+        results_by_resume={
+            resume.id: sort_match_results([
+                (task, job) for task, job in self.db_manager.get_match_results(resume.id)
+                if job.id in selected_job_ids
+            ])
+            for resume in resumes
+        }
+        print_batch_summary(resumes, results_by_resume)
+        self._print_run_stats(matched_jobs, failed_jobs, elapsed_time)
+        return results_by_resume
+
+    @staticmethod
+    def _split_duplicates(jobs:list[Job]) -> tuple[list[Job], list[Job]]:
+        """
+        Splits `jobs` into originals and near-duplicate reposts, which reuse their original's match.
+        """
+        if(not Config.JOB_DEDUP_ENABLED):
+            return jobs, []
+        originals=[job for job in jobs if job.canonical_job_id is None]
+        duplicates=[job for job in jobs if job.canonical_job_id is not None]
+        return originals, duplicates
+
+    def _reuse_duplicate_matches(self, resume:Resume, duplicate_jobs:list[Job]) -> int:
+        """
+        Stores the resume's match result of each repost's original for the repost itself.
+        Reposts whose original has no result yet (e.g. it was not shortlisted) are left for
+        a later run.
+        """
+        if(not duplicate_jobs):
+            return 0
+        original_ids=list({job.canonical_job_id for job in duplicate_jobs})
+        original_results={
+            job.id: json.loads(task.result)
+            for task, job in self.db_manager.get_match_results(resume.id, job_ids=original_ids)
+        }
+        results={
+            job.id: {
+                **original_results[job.canonical_job_id], "duplicate_of": job.canonical_job_id
+            }
+            for job in duplicate_jobs
+            if job.canonical_job_id in original_results
+        }
+        stored=self.db_manager.store_match_results(resume.id, results)
+        metrics.increment("matches", stored, result="duplicate")
+        print(
+            f"Reused {stored} match results of original postings for {len(duplicate_jobs)} "
+            f"reposts (resume {resume.id})."
+        )
+        return stored
+
+    def _llm_candidates(self, resume:Resume, jobs:list[Job], mode:str) -> list[Job]:
+        """Narrows `jobs` down to the ones the LLM should score for `resume` in the given mode."""
+        if(mode!="llm"):
+            llm_top_k=0 if mode=="skills" else Config.MATCHING_HYBRID_LLM_TOP_K
+            return self._score_skill_coverage(resume, jobs, llm_top_k=llm_top_k)
+        if(Config.MATCHING_SHORTLIST_ENABLED):
+            # Cheap embedding ranker first; only shortlisted jobs reach the LLM scorer
+            shortlisted_jobs=self.job_index.shortlist(
+                resume=resume,
+                jobs=jobs,
+                top_k=Config.MATCHING_SHORTLIST_TOP_K,
+                min_similarity=Config.MATCHING_SHORTLIST_MIN_SIMILARITY
+            )
+            print(
+                f"Shortlisted {len(shortlisted_jobs)} of {len(jobs)} jobs for resume {resume.id}."
+            )
+            return shortlisted_jobs
+        return jobs
+
+    def _process_queue(self, resumes:list[Resume], chunk_size:int, max_workers:int):
+        """
+        Leases and scores the queued tasks of `resumes` chunk by chunk until none are left.
+
+        Returns:
+            The number of matched and failed pairs, and the elapsed seconds
+        """
+        resumes_by_id={resume.id: resume for resume in resumes}
+        matched_jobs = 0
+        failed_jobs = 0
+        self.context_tokens_saved = 0
+        start_time = time.perf_counter()
+        while True:
+            leased_tasks=self.db_manager.lease_match_tasks(
+                resume_id=list(resumes_by_id),
+                owner=self.worker_id,
+                limit=chunk_size,
+                lease_seconds=Config.MATCHING_LEASE_SECONDS,
+                max_attempts=Config.MATCHING_MAX_ATTEMPTS
+            )
+            if(not leased_tasks):
+                break
+            tasks={(task.resume_id, job.id): task for task, job in leased_tasks}
+            pairs=[(resumes_by_id[task.resume_id], job) for task, job in leased_tasks]
+            # Checkpoint every pair as soon as it finishes
+            for resume, job, match, error in self._match_pairs(pairs, max_workers):
+                task=tasks[(resume.id, job.id)]
+                if(error):
+                    failed_jobs+=1
+                    metrics.increment("matches", result="failed")
+                    self.db_manager.fail_match_task(
+                        task.id, self.worker_id, str(error), Config.MATCHING_MAX_ATTEMPTS
+                    )
+                elif(self.db_manager.complete_match_task(task.id, self.worker_id, match)):
+                    matched_jobs+=1
+                    metrics.increment("matches", result="ok")
+        return matched_jobs, failed_jobs, time.perf_counter() - start_time
+
+    def _print_run_stats(self, matched_jobs:int, failed_jobs:int, elapsed_time:float):
+        jobs_per_minute = matched_jobs / elapsed_time * 60 if elapsed_time > 0 else 0.0
+        print("\n" + "=" * 80)
+        print(
+            f"Matched {matched_jobs} jobs ({failed_jobs} failed) in {elapsed_time:.2f}s "
+            f"({jobs_per_minute:.1f} jobs/min)"
+        )
+        print(f"Context budget saved ~{self.context_tokens_saved} prompt tokens")
+
+        self.knowledge_store.save_cache()
+        cache_stats=self.knowledge_store.cache_stats()
+        print(
+            f"Retrieval cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%} hit rate), {cache_stats['alias_hits']} alias hits"
+        )
+        llm_cache_stats=self.llm.cache_stats()
+        if(llm_cache_stats):
+            print(
+                f"LLM cache: {llm_cache_stats['hits']} hits, {llm_cache_stats['misses']} misses "
+                f"({llm_cache_stats['hit_rate']:.0%} hit rate)"
+            )
+
+    def _score_skill_coverage(self, resume:Resume, jobs:list[Job], llm_top_k:int) -> list[Job]:
+        """
+        Scores every job by deterministic skill coverage and stores the results, except for
+        the `llm_top_k` best jobs, which are returned for the LLM to score and explain.
+        """
+        start_time = time.perf_counter()
+        results=self.skill_scorer.score_jobs(resume, jobs)
+        ranked_jobs=sorted(jobs, key=lambda job: -results[job.id]["total_score"])
+        llm_jobs=ranked_jobs[:llm_top_k]
+        self.db_manager.store_match_results(
+            resume.id, {job.id: results[job.id] for job in ranked_jobs[llm_top_k:]}
+        )
+        metrics.increment("matches", len(jobs)-len(llm_jobs), result="skill_coverage")
+        print(
+            f"Scored skill coverage for {len(jobs)} jobs in "
+            f"{time.perf_counter() - start_time:.2f}s, "
+            f"{len(llm_jobs)} best go to the LLM."
+        )
+        return llm_jobs
+
+    def _match_pairs(self, pairs:list[tuple[Resume, Job]], max_workers:int):
+        """
+        Matches a chunk of resume/job pairs, overlapping context retrieval with LLM scoring:
+        a pair is handed to the LLM pool as soon as its context is built, while retrieval for
+        the remaining pairs continues in the context pool.
+
+        Yields (resume, job, match, error) as each pair finishes; `error` is None on success.
+        """
+        with ThreadPoolExecutor(max_workers=Config.MATCHING_CONTEXT_WORKERS) as context_executor, \
+                ThreadPoolExecutor(max_workers=max_workers) as llm_executor:
+            context_futures={
+                context_executor.submit(
+                    self.context_builder.build_context_with_stats, job, resume
+                ): (resume, job)
+                for resume, job in pairs
+            }
+            match_futures={}
+            pending=set(context_futures)
+            while pending:
+                done, pending=wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if(future in context_futures):
+                        resume, job=context_futures[future]
+                        try:
+                            skill_context, context_stats=future.result()
+                        except Exception as e:
+                            print(f"CONTEXT BUILDING FAILED FOR JOB {job.url} BECAUSE: {e}")
+                            yield resume, job, None, e
+                            continue
+                        self.context_tokens_saved+=context_stats["tokens_saved"]
+                        print(
+                            f"Context for {job.title} at {job.company}: ~{context_stats['tokens']} "
+                            f"tokens ({context_stats['tokens_saved']} saved)"
+                        )
+                        match_future=llm_executor.submit(
+                            self._llm_match_job, resume, job, skill_context
+                        )
+                        match_futures[match_future]=(resume, job)
+                        pending.add(match_future)
+                    else:
+                        resume, job=match_futures[future]
+                        try:
+                            yield resume, job, future.result(), None
+                        except Exception as e:
+                            print(f"MATCHING FAILED FOR JOB {job.url} BECAUSE: {e}")
+                            yield resume, job, None, e
 
     def match_job(self, resume:Resume, job:Job):
         return self._llm_match_job(resume, job)
     
-    def _llm_match_job(self, resume:Resume, job:Job):
-        # Build context using ContextBuilder for this specific job-resume pair
-        context_builder = ContextBuilder(
-            resume=resume,
-            job=job,
-            knowledge_store=self.knowledge_store
-        )
-        skill_context = context_builder.build_context()
+    def _llm_match_job(self, resume:Resume, job:Job, skill_context:str=None):
+        # Build context for this specific job-resume pair unless it was built ahead of time
+        if(skill_context is None):
+            skill_context = self.context_builder.build_context(job=job, resume=resume)
 
-        prompt=PromptTemplate.from_template(self.prompts.get("job_matching")).format(
+        prompt_template=self.context.get_prompt_template("matching.yaml", "job_matching")
+        template=prompt_template.template
+        prompt=prompt_template.format(
         resume_name=resume.name or '',
         resume_skills=resume.skills or '',
         resume_experience=resume.experience or '',
@@ -97,16 +359,20 @@ class MatchingAgent:
         job_key_technologies=job.key_technologies or '',
         skill_context=skill_context
         )
-        print(prompt)
-        # start_time = time.perf_counter()
-        # try:
-        #     resp=self.llm.invoke(prompt)
-        #     resp_obj=json.loads(resp)
-        # except Exception as e:
-        #     print("LLM Inference ERROR")
-        #     raise Exception(e)
-        # end_time = time.perf_counter()
-
-        # elapsed_time = end_time - start_time
-        # print(f"Processed: {job.title} at {job.company} - Score: {resp_obj.get('total_score')}/100 - {resp_obj.get('recommendation')} ({elapsed_time:.2f}s)")
-        # return resp_obj
+        start_time = time.perf_counter()
+        try:
+            with metrics.span("job_match"):
+                resp_obj=self.llm.invoke_json(
+                    prompt, template=template, required_keys=["total_score", "recommendation"]
+                )
+        except Exception as e:
+            print("LLM Inference ERROR")
+            raise Exception(e)
+        end_time = time.perf_counter()
+
+        elapsed_time = end_time - start_time
+        print(
+            f"Processed: {job.title} at {job.company} - Score: {resp_obj.get('total_score')}/100 - "
+            f"{resp_obj.get('recommendation')} ({elapsed_time:.2f}s)"
+        )
+        return resp_obj
@@ -1,87 +1,280 @@
 from ..knowledge.store import KnowledgeStore
 from ...models.entities import Job, Resume
 from ...config.settings import Config
+from ..metrics import metrics
+from contextlib import contextmanager
+import threading
 import logging
 import json
+import re
 
 
 class ContextBuilder:
-    def __init__(self, job:Job, resume: Resume, knowledge_store: KnowledgeStore):
-        if(job==None):
-            logging.error(f"Job and Resume must not be None.")
-            raise
-        if(resume==None):
-            logging.error(f"Job and Resume must not be None.")
-            raise
+    _CONTEXT_HEADER = "TECHNICAL KNOWLEDGE CONTEXT:\n" + "=" * 80 + "\n\n"
+    # Skill header, separator line and the placeholder lines of an otherwise empty skill block
+    _SKILL_OVERHEAD_CHARS = 2*81 + len("SKILL: ") + len("Definition: Not available") \
+        + len("Common Tools/Technologies: None listed") \
+        + len("Practical Applications: None listed") + 4
+    _ENTRY_OVERHEAD_CHARS = 8
+
+    def __init__(self, knowledge_store: KnowledgeStore):
         if(knowledge_store==None):
-            logging.error(f"Job and Resume must not be None.")
-            raise
-        self.job=job
-        self.resume=resume
+            logging.error("KnowledgeStore must not be None.")
+            raise ValueError("KnowledgeStore must not be None.")
         self.kt_manager=knowledge_store
+        # Resume-side context keyed by (resume id, knowledge base version)
+        self._resume_contexts={}
+        self._resume_contexts_lock=threading.Lock()
+        # Job-side context keyed the same way, kept only inside `shared_job_contexts`
+        self._job_contexts=None
+        self._job_contexts_lock=threading.Lock()
         
     
-    def build_context(self)->str:
+    def build_context(self, job:Job, resume: Resume)->str:
+        return self.build_context_with_stats(job=job, resume=resume)[0]
+
+    def build_context_with_stats(self, job:Job, resume: Resume, token_budget: int=None):
+        """
+        Builds the matching context for a job/resume pair within a token budget.
+
+        Returns:
+            The formatted context string, and stats with its estimated token count and the
+            number of tokens the budget and deduplication saved compared to the full context
+        """
+        if(job==None or resume==None):
+            logging.error("Job and Resume must not be None.")
+            raise ValueError("Job and Resume must not be None.")
+        token_budget=token_budget or Config.MATCHING_CONTEXT_TOKEN_BUDGET
+        with metrics.span("context_build"):
+            context_data=ContextBuilder._merge_context(
+                self.build_resume_context(resume),
+                self.build_job_context(job)
+            )
+
+            # Build formatted context string for LLM
+            full_tokens=ContextBuilder.estimate_tokens(self._format_context_for_llm(
+                ContextBuilder._select_context(context_data, token_budget=None, deduplicate=False)
+            ))
+            context_string = self._format_context_for_llm(
+                ContextBuilder._select_context(context_data, token_budget=token_budget)
+            )
+            context_tokens=ContextBuilder.estimate_tokens(context_string)
+        metrics.observe("context_tokens", context_tokens)
+        return context_string, {
+            "tokens": context_tokens, "tokens_saved": max(0, full_tokens-context_tokens)
+        }
+
+    @staticmethod
+    def estimate_tokens(text: str) -> int:
+        return -(-len(text)//Config.CONTEXT_CHARS_PER_TOKEN)
+
+    def build_resume_context(self, resume: Resume) -> dict:
+        """
+        Retrieves the context for the resume's skills and responsibilities. None of it depends
+        on the job, so it is computed once per resume and knowledge base version.
+        """
+        cache_key=(resume.id, self.kt_manager.knowledge_version)
+        with self._resume_contexts_lock:
+            metrics.increment(
+                "resume_context_lookups",
+                result="hit" if cache_key in self._resume_contexts else "miss"
+            )
+            if(cache_key not in self._resume_contexts):
+                resume_experiences=json.loads(resume.experience)
+                responsibilities=[]
+                for experience in resume_experiences:
+                    responsibilities.extend(experience.get("responsibilities",[]))
+                self._resume_contexts[cache_key]=self._retrieve_context(
+                    skills=json.loads(resume.skills),
+                    experiences=responsibilities
+                )
+            return self._resume_contexts[cache_key]
+
+    @contextmanager
+    def shared_job_contexts(self):
+        """
+        Keeps each job's context for the duration of the block, so a job matched against
+        several resumes is retrieved once. Outside the block job contexts are not retained.
+        """
+        with self._job_contexts_lock:
+            self._job_contexts={}
+        try:
+            yield
+        finally:
+            with self._job_contexts_lock:
+                self._job_contexts=None
+
+    def build_job_context(self, job: Job) -> dict:
+        """Retrieves the context for the job's key technologies and requirements."""
+        with self._job_contexts_lock:
+            if(self._job_contexts is None):
+                entry=None
+            else:
+                cache_key=(job.id, self.kt_manager.knowledge_version)
+                metrics.increment(
+                    "job_context_lookups",
+                    result="hit" if cache_key in self._job_contexts else "miss"
+                )
+                # One lock per job, so concurrent builds of different jobs still run in parallel
+                entry=self._job_contexts.setdefault(
+                    cache_key, {"lock": threading.Lock(), "context": None}
+                )
+        if(entry is None):
+            return self._retrieve_job_context(job)
+        with entry["lock"]:
+            if(entry["context"] is None):
+                entry["context"]=self._retrieve_job_context(job)
+            return entry["context"]
+
+    def _retrieve_job_context(self, job: Job) -> dict:
+        return self._retrieve_context(
+            skills=json.loads(job.key_technologies),
+            experiences=json.loads(job.requirements)
+        )
+
+    def _retrieve_context(self, skills: list[str], experiences: list[str]) -> dict:
         context_data={}
-        job_tech=json.loads(self.job.key_technologies)
-        resume_skills=json.loads(self.resume.skills)
-        
-        skills=set()
-        for skill_set in [job_tech,resume_skills]:
-            skills.update([skill.strip().lower() for skill in skill_set])
+        skills={skill.strip().lower() for skill in skills}
         
-        for skill in list(skills):
-            for definition in self.kt_manager.query_vector_db(skill, Config.PER_SKILL_DEFINITIONS, "definition"):
+        # One batched query per doc type instead of one round-trip per skill
+        skill_queries=list(skills)
+        tool_queries=[]
+        definition_results=self.kt_manager.query_vector_db_batch(
+            skill_queries, Config.PER_SKILL_DEFINITIONS, "definition"
+        )
+        for skill, definitions in zip(skill_queries, definition_results):
+            for definition in definitions:
                 skill=definition[2].get("skill")
                 if(skill not in context_data):
-                    context_data[skill]={
-                        "definition":None,
-                        "tools":set(),
-                        "resume_examples":set()
-                    }
-                context_data[skill]["definition"]=definition[1]
-            for tool in self.kt_manager.query_vector_db(skill,Config.PER_SKILL_TOOLS,"tool"):
+                    context_data[skill]=ContextBuilder._empty_skill_context()
+                context_data[skill]["definition"]=(definition[1], definition[3])
+            # Tools are looked up by the canonical skill name the definition resolved to
+            tool_queries.append(skill)
+        for tools in self.kt_manager.query_vector_db_batch(
+            tool_queries, Config.PER_SKILL_TOOLS, "tool"
+        ):
+            for tool in tools:
                 skill=tool[2].get("skill")
                 if(skill not in context_data):
-                    context_data[skill]={
-                        "definition":None,
-                        "tools":set(),
-                        "resume_examples":set()
-                    }
-                context_data[skill]["tools"].add(tool[1])
-        
-        all_exp=[]
-        resume_experiences=json.loads(self.resume.experience)
-        job_requirements=json.loads(self.job.requirements)
-        for experience in resume_experiences:
-            all_exp.extend(experience.get("responsibilities",[]))
-        all_exp.extend(job_requirements)
-
-        for exp in all_exp:
-            exp_contexts=self.kt_manager.query_vector_db(exp,3,"manifestation")
+                    context_data[skill]=ContextBuilder._empty_skill_context()
+                ContextBuilder._keep_closest(context_data[skill]["tools"], tool[1], tool[3])
+
+        for exp_contexts in self.kt_manager.query_vector_db_batch(
+            experiences, Config.PER_EXPERIENCE_MANIFESTATIONS, "manifestation"
+        ):
             for exp_context in exp_contexts:
                 skill=exp_context[2].get("skill")
                 if(skill not in context_data):
-                    context_data[skill]={
-                        "definition":None,
-                        "tools":set(),
-                        "resume_examples":set()
-                    }
-                context_data[skill]["resume_examples"].add(exp_context[1])
-        for skill in context_data:
-            context_data[skill]["tools"]=list(context_data[skill]["tools"])
-            context_data[skill]["resume_examples"]=list(context_data[skill]["resume_examples"])
+                    context_data[skill]=ContextBuilder._empty_skill_context()
+                ContextBuilder._keep_closest(
+                    context_data[skill]["resume_examples"], exp_context[1], exp_context[3]
+                )
+        return context_data
+
+    @staticmethod
+    def _empty_skill_context() -> dict:
+        # Every entry keeps the vector distance it was retrieved at, lower is more relevant
+        return {
+            "definition":None,
+            "tools":{},
+            "resume_examples":{}
+        }
+
+    @staticmethod
+    def _keep_closest(entries: dict, text: str, distance: float):
+        if(text not in entries or distance<entries[text]):
+            entries[text]=distance
 
-        # Build formatted context string for LLM
-        context_string = self._format_context_for_llm(context_data)
-        return context_string
+    @staticmethod
+    def _merge_context(*partial_contexts: dict) -> dict:
+        """Merges resume- and job-side context into a new dict, leaving the inputs untouched."""
+        context_data={}
+        for partial_context in partial_contexts:
+            for skill, skill_info in partial_context.items():
+                if(skill not in context_data):
+                    context_data[skill]=ContextBuilder._empty_skill_context()
+                definition=skill_info["definition"]
+                kept_definition=context_data[skill]["definition"]
+                if(definition and (kept_definition is None or definition[1]<kept_definition[1])):
+                    context_data[skill]["definition"]=definition
+                for key in ["tools", "resume_examples"]:
+                    for text, distance in skill_info[key].items():
+                        ContextBuilder._keep_closest(context_data[skill][key], text, distance)
+        return context_data
+
+    @staticmethod
+    def _select_context(context_data: dict, token_budget: int=None, deduplicate: bool=True) -> dict:
+        """
+        Ranks the retrieved entries by relevance and keeps the most relevant ones that fit in
+        the token budget, dropping near-duplicate resume examples first. Definitions, tools and
+        resume examples are ranked within their own kind and taken in turns: distances of
+        different kinds are not comparable, and alias-index hits all come back at 0.0.
+
+        Args:
+            context_data: Merged context with a retrieval distance for every entry
+            token_budget: Approximate token limit for the formatted context, None for no limit
+            deduplicate: Drop resume examples that are near-identical to a more relevant one
+
+        Returns:
+            Skill -> {"definition", "tools", "resume_examples"} ordered by relevance
+        """
+        entries=[]
+        for skill, skill_info in context_data.items():
+            if(skill_info["definition"]):
+                definition_text, distance=skill_info["definition"]
+                entries.append((distance, skill, "definition", definition_text))
+            for key in ["tools", "resume_examples"]:
+                for text, distance in skill_info[key].items():
+                    entries.append((distance, skill, key, text))
+        ranked_entries=[]
+        for kind in ["definition", "tools", "resume_examples"]:
+            kind_entries=sorted(entry for entry in entries if entry[2]==kind)
+            ranked_entries.extend((rank, *entry) for rank, entry in enumerate(kind_entries))
+        ranked_entries.sort()
+
+        budget_chars=token_budget*Config.CONTEXT_CHARS_PER_TOKEN if token_budget else None
+        used_chars=len(ContextBuilder._CONTEXT_HEADER)
+        selected={}
+        kept_examples=[]
+        for _, distance, skill, key, text in ranked_entries:
+            if(deduplicate and key=="resume_examples"):
+                words=set(re.findall(r"\w+", text.lower()))
+                if(any(
+                    ContextBuilder._jaccard(words, kept)>=Config.CONTEXT_DEDUP_SIMILARITY
+                    for kept in kept_examples
+                )):
+                    continue
+            cost=len(text)+ContextBuilder._ENTRY_OVERHEAD_CHARS
+            if(skill not in selected):
+                cost+=len(skill)+ContextBuilder._SKILL_OVERHEAD_CHARS
+            if(budget_chars is not None and used_chars+cost>budget_chars):
+                continue
+            used_chars+=cost
+            if(skill not in selected):
+                selected[skill]={"definition":None, "tools":[], "resume_examples":[]}
+            if(key=="definition"):
+                selected[skill]["definition"]=text
+            else:
+                selected[skill][key].append(text)
+                if(key=="resume_examples" and deduplicate):
+                    kept_examples.append(words)
+        # Skills were first selected with their most relevant entry, so insertion order is rank
+        # order
+        return selected
+
+    @staticmethod
+    def _jaccard(first: set, second: set) -> float:
+        if(not first and not second):
+            return 1.0
+        return len(first & second)/len(first | second)
 
     def _format_context_for_llm(self, context_data: dict) -> str:
         """
         Formats the context data into a human-readable string optimized for LLM consumption.
 
         Args:
-            context_data: Dictionary containing skill definitions, tools, and resume examples
+            context_data: Dictionary containing skill definitions, tools, and resume examples,
+                ordered by relevance
 
         Returns:
             Formatted string with technical context for each skill
@@ -94,10 +287,8 @@ class ContextBuilder:
         context_lines.append("=" * 80)
         context_lines.append("")
 
-        # Sort skills alphabetically for consistent output
-        sorted_skills = sorted(context_data.keys())
-
-        for skill in sorted_skills:
+        # Skills are already ranked by relevance, most relevant first
+        for skill in context_data:
             skill_info = context_data[skill]
 
             # Skill header
@@ -0,0 +1,172 @@
+import json
+import logging
+
+from chromadb import PersistentClient
+
+from ...config.settings import Config
+from ...models.entities import Job, Resume
+from ..metrics import metrics
+
+
+class JobIndex:
+    """
+    Vector index of job and resume embeddings used as a cheap first-stage ranker.
+
+    Each job is embedded once from its title, key technologies and requirements, and each
+    resume once from its summary, skills and responsibilities. `shortlist` returns the jobs
+    closest to a resume so that only those go on to the LLM scorer.
+    """
+
+    def __init__(self, vector_client=None):
+        self.vector_client=vector_client or PersistentClient(path=Config.CHROMADB_PERSISTANCE_PATH)
+        try:
+            # Cosine space so distances map directly onto a similarity threshold
+            self.job_collection=self.vector_client.get_or_create_collection(
+                Config.JOB_COLLECTION_NAME, metadata={"hnsw:space": "cosine"}
+            )
+            self.resume_collection=self.vector_client.get_or_create_collection(
+                Config.RESUME_COLLECTION_NAME, metadata={"hnsw:space": "cosine"}
+            )
+        except Exception:
+            logging.error("Failed to initialize ChromaDB collections for the job index.")
+            raise
+
+    @staticmethod
+    def job_key(source: str, job_id: str) -> str:
+        return f"{source}:{job_id}"
+
+    @staticmethod
+    def _job_document(title: str, key_technologies: list, requirements: list) -> str:
+        return "\n".join([
+            title or "",
+            f"Technologies: {', '.join(key_technologies or [])}",
+            f"Requirements: {'; '.join(requirements or [])}"
+        ])
+
+    @staticmethod
+    def _resume_document(resume: Resume) -> str:
+        responsibilities=[]
+        for experience in json.loads(resume.experience or "[]"):
+            responsibilities.extend(experience.get("responsibilities",[]))
+        return "\n".join([
+            resume.summary or "",
+            f"Skills: {', '.join(json.loads(resume.skills or '[]'))}",
+            f"Experience: {'; '.join(responsibilities)}"
+        ])
+
+    def add_jobs(self, jobs: list[dict]):
+        """Embeds freshly scraped job dicts (as passed to DatabaseManager.add_job_postings)."""
+        if(not jobs):
+            return
+        self._upsert_jobs(
+            keys=[JobIndex.job_key(job.get("source"), job.get("job_id")) for job in jobs],
+            documents=[
+                JobIndex._job_document(
+                    job.get("title"), job.get("key_technologies"), job.get("requirements")
+                )
+                for job in jobs
+            ]
+        )
+
+    def index_missing_jobs(self, jobs: list[Job]):
+        """Embeds stored jobs that are not in the index yet, e.g. jobs saved before it existed."""
+        if(not jobs):
+            return
+        keys=[JobIndex.job_key(job.source, job.job_id) for job in jobs]
+        indexed=set(self.job_collection.get(ids=keys, include=[])["ids"])
+        missing=[(key, job) for key, job in zip(keys, jobs) if key not in indexed]
+        if(not missing):
+            return
+        self._upsert_jobs(
+            keys=[key for key, _ in missing],
+            documents=[
+                JobIndex._job_document(
+                    job.title,
+                    json.loads(job.key_technologies or "[]"),
+                    json.loads(job.requirements or "[]")
+                )
+                for _, job in missing
+            ]
+        )
+
+    def _upsert_jobs(self, keys: list[str], documents: list[str]):
+        try:
+            batch_size=self.vector_client.get_max_batch_size()
+            for start in range(0, len(keys), batch_size):
+                self.job_collection.upsert(
+                    ids=keys[start:start+batch_size],
+                    documents=documents[start:start+batch_size],
+                    metadatas=[{"job_key": key} for key in keys[start:start+batch_size]]
+                )
+            logging.info(f"Successfully embedded {len(keys)} jobs.")
+        except Exception:
+            logging.error("Failed to embed jobs.")
+            raise
+
+    def add_resume(self, resume: Resume):
+        try:
+            self.resume_collection.upsert(
+                ids=[str(resume.id)],
+                documents=[JobIndex._resume_document(resume)]
+            )
+            logging.info(f"Successfully embedded resume {resume.id}.")
+        except Exception:
+            logging.error(f"Failed to embed resume {resume.id}.")
+            raise
+
+    def resume_embedding(self, resume: Resume):
+        """Returns the resume's stored embedding, embedding it first if needed."""
+        result=self.resume_collection.get(ids=[str(resume.id)], include=["embeddings"])
+        if(len(result["ids"])==0):
+            self.add_resume(resume)
+            result=self.resume_collection.get(ids=[str(resume.id)], include=["embeddings"])
+        return result["embeddings"][0]
+
+    def job_embeddings(self, jobs: list[Job]) -> list:
+        """
+        Returns the stored embedding of each job, in order, embedding any that are missing first.
+        """
+        if(not jobs):
+            return []
+        self.index_missing_jobs(jobs)
+        keys=[JobIndex.job_key(job.source, job.job_id) for job in jobs]
+        embeddings={}
+        batch_size=self.vector_client.get_max_batch_size()
+        for start in range(0, len(keys), batch_size):
+            result=self.job_collection.get(ids=keys[start:start+batch_size], include=["embeddings"])
+            embeddings.update(zip(result["ids"], result["embeddings"]))
+        return [embeddings[key] for key in keys]
+
+    def shortlist(
+        self, resume: Resume, jobs: list[Job], top_k: int=None, min_similarity: float=None
+    ) -> list[Job]:
+        """
+        Returns the jobs most similar to the resume, best first: at most `top_k` of them,
+        and only those with cosine similarity of at least `min_similarity`. Either limit can
+        be None to disable it.
+        """
+        if(not jobs):
+            return []
+        self.index_missing_jobs(jobs)
+        jobs_by_key={JobIndex.job_key(job.source, job.job_id): job for job in jobs}
+        n_results=len(jobs_by_key) if top_k is None else min(top_k, len(jobs_by_key))
+        try:
+            query_embedding=self.resume_embedding(resume)
+            with metrics.span("vector_query", collection=Config.JOB_COLLECTION_NAME):
+                results=self.job_collection.query(
+                    query_embeddings=[query_embedding],
+                    n_results=n_results,
+                    where={"job_key": {"$in": list(jobs_by_key)}},
+                    include=["distances"]
+                )
+        except Exception:
+            metrics.increment("vector_query_failures", collection=Config.JOB_COLLECTION_NAME)
+            logging.error(f"Failed to query ChromaDB collection {Config.JOB_COLLECTION_NAME}.")
+            raise
+
+        shortlisted=[]
+        for key, distance in zip(results["ids"][0], results["distances"][0]):
+            if(min_similarity is not None and 1-distance<min_similarity):
+                continue
+            shortlisted.append(jobs_by_key[key])
+        return shortlisted
@@ -0,0 +1,64 @@
+import json
+
+from ...models.entities import Job, MatchTask
+
+# Sort results by recommendation priority
+RECOMMENDATION_ORDER = {
+    'STRONG MATCH': 1,
+    'GOOD MATCH': 2,
+    'MODERATE MATCH': 3,
+    'WEAK MATCH': 4,
+    'POOR MATCH': 5
+}
+
+
+def sort_match_results(match_results: list[tuple[MatchTask, Job]]) -> list[dict]:
+    """Turns stored (task, job) match results into result dicts, best match first."""
+    results = [
+        {
+            'job': job,
+            'match': json.loads(task.result)
+        }
+        for task, job in match_results
+    ]
+    return sorted(
+        results,
+        key=lambda x: (
+            RECOMMENDATION_ORDER.get(x['match'].get('recommendation', 'POOR MATCH'), 6),
+            -(x['match'].get('total_score') or 0)
+        )
+    )
+
+
+def print_match_results(sorted_results: list[dict], limit: int = None):
+    print("\n" + "=" * 80)
+    print("SORTED RESULTS (Best to Worst)")
+    print("=" * 80)
+    for i, result in enumerate(sorted_results[:limit], 1):
+        job = result['job']
+        match = result['match']
+        print(f"\n{i}. {job.title} at {job.company}")
+        print(f"   Score: {match.get('total_score')}/100 - {match.get('recommendation')}")
+        print(f"   URL: {job.url}")
+        print(f"   Matching Skills: {match.get('matching_skills')}")
+        print(f"   Missing Skills: {match.get('missing_skills')}")
+
+
+def print_batch_summary(resumes: list, results_by_resume: dict[int, list[dict]], top: int = 3):
+    """Compares resume variants side by side: result counts, average score and best matches."""
+    print("\n" + "=" * 80)
+    print("BATCH RESULTS BY RESUME")
+    print("=" * 80)
+    for resume in resumes:
+        results = results_by_resume.get(resume.id, [])
+        scores = [result['match'].get('total_score') or 0 for result in results]
+        strong = sum(
+            1 for result in results
+            if result['match'].get('recommendation') in ('STRONG MATCH', 'GOOD MATCH')
+        )
+        average = sum(scores) / len(scores) if scores else 0.0
+        print(f"\nResume {resume.id} ({resume.name}): {len(results)} matched, "
+              f"average score {average:.1f}, {strong} good or strong")
+        for result in results[:top]:
+            job = result['job']
+            print(f"   {result['match'].get('total_score')}/100 - {job.title} at {job.company}")
@@ -0,0 +1,171 @@
+import json
+import logging
+
+import numpy as np
+from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+
+from ...config.settings import Config
+from ...models.entities import Job, Resume
+from ..context import AppContext, get_app_context
+from ..knowledge.aliases import SkillAliasIndex
+from ..metrics import metrics
+from .job_index import JobIndex
+
+
+class SkillCoverageScorer:
+    """
+    Deterministic, LLM-free scorer for the technical skills and role alignment parts of the
+    matching rubric.
+
+    Every distinct job and resume skill is canonicalized through the skill alias index and
+    embedded once with the knowledge base's embedding model (ChromaDB's default). One
+    job-skill x resume-skill similarity matrix gives each job skill its closest resume
+    skill, and per-job coverage is summed with `np.bincount`, so a whole job pool is scored
+    in a single vectorized pass. Role alignment is the similarity of the job and resume
+    embeddings already stored in the JobIndex.
+
+    Experience and education need the prose read, so they are left to the LLM: the
+    technical (40) and alignment (20) points are scaled onto the usual 0-100 total.
+    """
+
+    TECHNICAL_POINTS = 40
+    ALIGNMENT_POINTS = 20
+    RECOMMENDATIONS = [
+        (80, 'STRONG MATCH'), (65, 'GOOD MATCH'), (50, 'MODERATE MATCH'), (35, 'WEAK MATCH'),
+        (0, 'POOR MATCH'),
+    ]
+
+    def __init__(self, job_index: JobIndex, context: AppContext=None, embedding_function=None):
+        self.job_index=job_index
+        self.context=context or get_app_context()
+        self.embedding_function=embedding_function or DefaultEmbeddingFunction()
+        self._embeddings={}
+
+    @staticmethod
+    def _skill_names(raw: str) -> list[str]:
+        try:
+            names=json.loads(raw or "[]")
+        except json.JSONDecodeError:
+            logging.warning(f"Skipping unparseable skill list: {raw[:80]}")
+            return []
+        if(not isinstance(names, list)):
+            # Missing lists are stored as JSON null
+            return []
+        return [name.strip() for name in names if isinstance(name, str) and name.strip()]
+
+    @staticmethod
+    def _unit_rows(matrix: np.ndarray) -> np.ndarray:
+        norms=np.linalg.norm(matrix, axis=-1, keepdims=True)
+        return matrix/np.where(norms==0, 1, norms)
+
+    @staticmethod
+    def _credit(similarity: np.ndarray, low: float, high: float) -> np.ndarray:
+        """Maps similarities linearly onto [0, 1]: 0 at or below `low`, 1 at or above `high`."""
+        return np.clip((similarity-low)/(high-low), 0.0, 1.0)
+
+    @staticmethod
+    def recommendation(total_score: int) -> str:
+        return next(
+            label for threshold, label in SkillCoverageScorer.RECOMMENDATIONS
+            if total_score>=threshold
+        )
+
+    def _skill_key(self, name: str) -> str:
+        return SkillAliasIndex.normalize(self.context.skill_aliases.canonical_skill(name) or name)
+
+    def _embed(self, keys: list[str]) -> np.ndarray:
+        """Unit-length embedding rows for `keys`; each distinct key is embedded once per scorer."""
+        missing=[key for key in dict.fromkeys(keys) if key not in self._embeddings]
+        if(missing):
+            with metrics.span("skill_embedding"):
+                self._embeddings.update(zip(missing, self.embedding_function(missing)))
+            metrics.increment("skill_embeddings", len(missing))
+        rows=np.array([self._embeddings[key] for key in keys], dtype=np.float32)
+        return SkillCoverageScorer._unit_rows(rows)
+
+    def score_jobs(self, resume: Resume, jobs: list[Job]) -> dict[int, dict]:
+        """
+        Scores every job against the resume. Returns {job.id: result}, each result shaped
+        like the LLM's match JSON so both kinds are stored and reported the same way.
+        """
+        if(not jobs):
+            return {}
+        with metrics.span("skill_scoring"):
+            # One {skill key: display name} per job, so aliases of the same skill count once
+            job_skills=[
+                {
+                    self._skill_key(name): name
+                    for name in SkillCoverageScorer._skill_names(job.key_technologies)
+                }
+                for job in jobs
+            ]
+            resume_keys=list(dict.fromkeys(
+                self._skill_key(name) for name in SkillCoverageScorer._skill_names(resume.skills)
+            ))
+            job_keys=list(dict.fromkeys(key for skills in job_skills for key in skills))
+            key_index={key: i for i, key in enumerate(job_keys)}
+
+            # Closest resume skill for every distinct job skill, from one similarity matrix
+            if(job_keys and resume_keys):
+                best_similarity=(self._embed(job_keys)@self._embed(resume_keys).T).max(axis=1)
+            else:
+                best_similarity=np.zeros(len(job_keys), dtype=np.float32)
+            skill_credit=SkillCoverageScorer._credit(
+                best_similarity, Config.SKILL_PARTIAL_SIMILARITY, Config.SKILL_MATCH_SIMILARITY
+            )
+
+            # Flattened (job, skill) entries, summed back per job
+            entry_jobs=np.repeat(np.arange(len(jobs)), [len(skills) for skills in job_skills])
+            entry_skills=np.fromiter(
+                (key_index[key] for skills in job_skills for key in skills),
+                dtype=np.int64, count=len(entry_jobs)
+            )
+            skill_counts=np.bincount(entry_jobs, minlength=len(jobs))
+            covered=np.bincount(entry_jobs, weights=skill_credit[entry_skills], minlength=len(jobs))
+
+            job_vectors=SkillCoverageScorer._unit_rows(
+                np.array(self.job_index.job_embeddings(jobs), dtype=np.float32)
+            )
+            resume_vector=SkillCoverageScorer._unit_rows(
+                np.array(self.job_index.resume_embedding(resume), dtype=np.float32)
+            )
+            document_similarity=job_vectors@resume_vector
+            alignment=SkillCoverageScorer._credit(
+                document_similarity,
+                Config.ALIGNMENT_MIN_SIMILARITY,
+                Config.ALIGNMENT_MAX_SIMILARITY,
+            )
+
+            # Jobs that list no technologies are judged on alignment alone
+            coverage=np.where(skill_counts>0, covered/np.maximum(skill_counts, 1), alignment)
+            technical_points=coverage*SkillCoverageScorer.TECHNICAL_POINTS
+            alignment_points=alignment*SkillCoverageScorer.ALIGNMENT_POINTS
+            technical_scores=np.rint(technical_points).astype(int)
+            alignment_scores=np.rint(alignment_points).astype(int)
+            max_points=SkillCoverageScorer.TECHNICAL_POINTS+SkillCoverageScorer.ALIGNMENT_POINTS
+            total_scores=np.rint((technical_points+alignment_points)*100/max_points).astype(int)
+
+        results={}
+        for i, job in enumerate(jobs):
+            credits={name: skill_credit[key_index[key]] for key, name in job_skills[i].items()}
+            matching=[name for name, credit in credits.items() if credit>=0.5]
+            missing=[name for name, credit in credits.items() if credit<0.5]
+            total_score=int(total_scores[i])
+            results[job.id]={
+                "scorer": "skill_coverage",
+                "reasoning": (
+                    f"Deterministic skill coverage: the resume covers {covered[i]:.1f} of "
+                    f"{int(skill_counts[i])} key technologies and its embedding similarity to "
+                    f"the posting is {document_similarity[i]:.2f}. "
+                    "Experience and education were not assessed."
+                ),
+                "technical_score": int(technical_scores[i]),
+                "experience_score": None,
+                "education_score": None,
+                "alignment_score": int(alignment_scores[i]),
+                "total_score": total_score,
+                "matching_skills": ", ".join(matching),
+                "missing_skills": ", ".join(missing),
+                "recommendation": SkillCoverageScorer.recommendation(total_score)
+            }
+        return results
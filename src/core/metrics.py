@@ -0,0 +1,180 @@
+import json
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from ..config.settings import Config
+
+
+class _Summary:
+    """Count, sum and max of a series, plus a bounded window of recent samples for quantiles."""
+
+    def __init__(self, max_samples: int):
+        self.count=0
+        self.total=0.0
+        self.max=0.0
+        self.samples=deque(maxlen=max_samples)
+
+    def add(self, value: float):
+        self.count+=1
+        self.total+=value
+        self.max=max(self.max, value)
+        self.samples.append(value)
+
+    def quantile(self, q: float) -> float:
+        if(not self.samples):
+            return 0.0
+        ordered=sorted(self.samples)
+        return ordered[max(0, math.ceil(q*len(ordered))-1)]
+
+
+class MetricsRegistry:
+    """
+    Thread-safe, in-process metrics for one run of the pipeline.
+
+    Records timing spans (`span`), counters (`increment`) and value summaries (`observe`),
+    each optionally labelled, and exports them at the end of the run as a JSON line and/or
+    a Prometheus text file.
+    """
+
+    QUANTILES = (0.5, 0.95)
+
+    def __init__(self, prefix: str = "career_copilot", max_samples: int = 10000):
+        self.prefix=prefix
+        self.max_samples=max_samples
+        self.started_at=datetime.now()
+        self._counters={}
+        self._summaries={}
+        self._lock=threading.Lock()
+
+    @staticmethod
+    def _key(name: str, labels: dict):
+        return (name, tuple(sorted((label, str(value)) for label, value in labels.items())))
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """Times the enclosed block into the `<name>_seconds` summary, whether or not it raises."""
+        start=time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter()-start, **labels)
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key=MetricsRegistry._key(name, labels)
+        with self._lock:
+            self._counters[key]=self._counters.get(key, 0)+value
+
+    def observe(self, name: str, value: float, **labels):
+        key=MetricsRegistry._key(name, labels)
+        with self._lock:
+            if(key not in self._summaries):
+                self._summaries[key]=_Summary(self.max_samples)
+            self._summaries[key].add(value)
+
+    def reset(self):
+        with self._lock:
+            self._counters={}
+            self._summaries={}
+            self.started_at=datetime.now()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "started_at": self.started_at.isoformat(),
+                "finished_at": datetime.now().isoformat(),
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "summaries": [
+                    {
+                        "name": name,
+                        "labels": dict(labels),
+                        "count": summary.count,
+                        "sum": summary.total,
+                        "max": summary.max,
+                        **{f"p{int(q*100)}": summary.quantile(q) for q in MetricsRegistry.QUANTILES}
+                    }
+                    for (name, labels), summary in sorted(self._summaries.items())
+                ]
+            }
+
+    def export_jsonl(self, path: Path, **run_labels):
+        """Appends this run's metrics to `path` as one JSON line."""
+        record={**run_labels, **self.snapshot()}
+        with open(path, 'a') as f:
+            f.write(json.dumps(record)+"\n")
+        logging.info(f"Appended run metrics to {path}.")
+
+    def export_prometheus(self, path: Path):
+        """Writes this run's metrics to `path` in the Prometheus text exposition format."""
+        snapshot=self.snapshot()
+        lines=[]
+        typed=set()
+
+        def labels_text(labels: dict, **extra) -> str:
+            labels={**labels, **extra}
+            if(not labels):
+                return ""
+            escaped=[
+                label+'="'
+                +str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                +'"'
+                for label, value in sorted(labels.items())
+            ]
+            return "{"+",".join(escaped)+"}"
+
+        for counter in snapshot["counters"]:
+            name=f"{self.prefix}_{counter['name']}_total"
+            if(name not in typed):
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{name}{labels_text(counter['labels'])} {counter['value']}")
+        for summary in snapshot["summaries"]:
+            name=f"{self.prefix}_{summary['name']}"
+            if(name not in typed):
+                lines.append(f"# TYPE {name} summary")
+                typed.add(name)
+            for q in MetricsRegistry.QUANTILES:
+                quantile_labels=labels_text(summary['labels'], quantile=q)
+                lines.append(f"{name}{quantile_labels} {summary[f'p{int(q*100)}']}")
+            lines.append(f"{name}_sum{labels_text(summary['labels'])} {summary['sum']}")
+            lines.append(f"{name}_count{labels_text(summary['labels'])} {summary['count']}")
+
+        # Write-then-rename so a node exporter textfile collector never reads a partial file
+        tmp_path=path.with_suffix(path.suffix+".tmp")
+        with open(tmp_path, 'w') as f:
+            f.write("\n".join(lines)+"\n")
+        tmp_path.replace(path)
+        logging.info(f"Wrote run metrics to {path}.")
+
+
+# Process-wide registry used by every instrumented module
+metrics = MetricsRegistry()
+
+
+def export_run_metrics(**run_labels):
+    """
+    Exports the process-wide registry in every format listed in Config.METRICS_EXPORT_FORMATS,
+    then resets it for the next run.
+    """
+    if(not Config.METRICS_ENABLED):
+        metrics.reset()
+        return
+    for export_format in Config.METRICS_EXPORT_FORMATS:
+        try:
+            if(export_format=="jsonl"):
+                metrics.export_jsonl(Config.METRICS_JSONL_PATH, **run_labels)
+            elif(export_format=="prometheus"):
+                metrics.export_prometheus(Config.METRICS_PROMETHEUS_PATH)
+            else:
+                logging.error(f"Unknown metrics export format {export_format}.")
+        except Exception as e:
+            logging.error(f"Failed to export {export_format} metrics: {e}")
+    metrics.reset()
@@ -0,0 +1,118 @@
+import hashlib
+import re
+
+import numpy as np
+
+from ..config.settings import Config
+
+
+class MinHashLSH:
+    """
+    MinHash signatures and LSH banding for near-duplicate job postings.
+
+    A posting's role details are cleaned (lowercased, URLs, emails, numbers and punctuation
+    dropped) and split into overlapping word shingles. The signature keeps, for each of
+    `num_perm` seeded hash permutations, the minimum hash over all shingles, so the share of
+    equal positions between two signatures estimates the Jaccard similarity of their shingle
+    sets. Signatures are cut into `bands` bands; postings that share any band bucket are
+    candidates, and a candidate is a near-duplicate if its estimated similarity reaches
+    `threshold`.
+
+    Signatures depend on every parameter and the seed, so changing them only makes stored
+    postings stop matching new ones; it never produces false links.
+    """
+
+    _MERSENNE_PRIME = np.uint64((1<<61)-1)
+    _MAX_HASH = np.uint64((1<<32)-1)
+    _URL_OR_EMAIL = re.compile(r"\S+@\S+|https?://\S+|www\.\S+")
+    _WORD = re.compile(r"[a-z0-9+#]+")
+
+    def __init__(self, num_perm: int=None, bands: int=None, shingle_size: int=None,
+                 threshold: float=None, seed: int=1):
+        self.num_perm=num_perm or Config.JOB_DEDUP_NUM_PERM
+        self.bands=bands or Config.JOB_DEDUP_BANDS
+        self.shingle_size=shingle_size or Config.JOB_DEDUP_SHINGLE_SIZE
+        self.threshold=threshold if threshold is not None else Config.JOB_DEDUP_SIMILARITY
+        if(self.num_perm%self.bands!=0):
+            raise ValueError(
+                f"MinHash permutations ({self.num_perm}) must divide evenly "
+                f"into {self.bands} bands."
+            )
+        self.rows=self.num_perm//self.bands
+        generator=np.random.RandomState(seed)
+        max_int=np.iinfo(np.int64).max
+        a=generator.randint(1, max_int, size=self.num_perm, dtype=np.int64)
+        b=generator.randint(0, max_int, size=self.num_perm, dtype=np.int64)
+        self._a=a.astype(np.uint64)%MinHashLSH._MERSENNE_PRIME
+        self._b=b.astype(np.uint64)%MinHashLSH._MERSENNE_PRIME
+
+    @staticmethod
+    def clean_text(text: str) -> list[str]:
+        """Returns the words of `text` that survive cleaning, in order."""
+        text=MinHashLSH._URL_OR_EMAIL.sub(" ", (text or "").lower())
+        return [word for word in MinHashLSH._WORD.findall(text) if not word.isdigit()]
+
+    def shingles(self, text: str) -> set[str]:
+        words=MinHashLSH.clean_text(text)
+        if(len(words)<=self.shingle_size):
+            return {" ".join(words)} if words else set()
+        return {
+            " ".join(words[i:i+self.shingle_size])
+            for i in range(len(words)-self.shingle_size+1)
+        }
+
+    def signature(self, text: str):
+        """
+        Returns the uint32 MinHash signature of `text`, or None if nothing is left after cleaning.
+        """
+        shingles=self.shingles(text)
+        if(not shingles):
+            return None
+        hashes=np.fromiter(
+            (
+                int.from_bytes(
+                    hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little"
+                )
+                for shingle in shingles
+            ),
+            dtype=np.uint64,
+            count=len(shingles)
+        )
+        # Universal hashing (a*x + b) mod p for every permutation at once; uint64 wrap-around is
+        # part of the hash
+        with np.errstate(over="ignore"):
+            permuted=(np.outer(hashes, self._a)+self._b)%MinHashLSH._MERSENNE_PRIME
+        return (permuted&MinHashLSH._MAX_HASH).min(axis=0).astype(np.uint32)
+
+    def buckets(self, signature) -> list[int]:
+        """Returns one signed 64-bit bucket key per band, indexed by band."""
+        return [
+            int.from_bytes(
+                hashlib.blake2b(
+                    signature[band*self.rows:(band+1)*self.rows].tobytes(), digest_size=8
+                ).digest(),
+                "little",
+                signed=True
+            )
+            for band in range(self.bands)
+        ]
+
+    @staticmethod
+    def similarity(first, second) -> float:
+        """
+        Estimated Jaccard similarity of two signatures; 0.0 if they were built with different sizes.
+        """
+        if(first is None or second is None or len(first)!=len(second)):
+            return 0.0
+        return float(np.mean(first==second))
+
+    def is_duplicate(self, first, second) -> bool:
+        return MinHashLSH.similarity(first, second)>=self.threshold
+
+    @staticmethod
+    def to_hex(signature) -> str:
+        return signature.tobytes().hex()
+
+    @staticmethod
+    def from_bytes(data: bytes):
+        return np.frombuffer(data, dtype=np.uint32)
@@ -1,16 +1,130 @@
 """
 Career Copilot - AI-powered job matching system
 Main entry point for the application
+
+Each subcommand imports only the modules it needs, so e.g. `report` starts without
+loading LangChain or ChromaDB:
+
+    python -m src.main ingest-resume [PATH | DIRECTORY]
+    python -m src.main scrape [--offline]
+    python -m src.main extract
+    python -m src.main ingest-knowledge [--rebuild]
+    python -m src.main match [--chunk-size N] [--workers N] [--mode llm|skills|hybrid]
+    python -m src.main match-batch [--resumes ID ...] [--days N]
+    python -m src.main report [--limit N | --skills N]
+    python -m src.main run            # resume -> scrape + extract -> match
 """
 
-from .services.resume_service import ResumeManager
-from .services.job_service import JobsManager
-from .core.matching.agent import MatchingAgent
-from .config.settings import Config
+import argparse
+from datetime import datetime, timedelta
 from pathlib import Path
 
+from .config.settings import Config
+from .core.metrics import export_run_metrics
+
+
+def ingest_resume(args):
+    """Parse a resume PDF (or every PDF in a directory) and store it as the active resume"""
+    from .services.resume_service import ResumeManager
+
+    resume_manager = ResumeManager()
+    if args.path.is_dir():
+        resume_manager.process_resume_directory(directory=args.path)
+        print("✓ Resumes processed and stored")
+        return
+    resume_manager.process_resume(file_path=args.path)
+    print("✓ Resume processed and stored")
+
+
+def scrape(args, job_manager=None):
+    """Scrape new postings and stage them for extraction"""
+    from .services.job_service import JobsManager
+
+    job_manager = job_manager or JobsManager(offline=args.offline or None)
+    job_manager.scrape_jobs()
+    print("✓ Jobs scraped and staged")
+
+
+def extract(args, job_manager=None):
+    """Extract structured details from staged postings and store them"""
+    from .services.job_service import JobsManager
+
+    job_manager = job_manager or JobsManager()
+    job_manager.extract_staged_jobs()
+    print("✓ Jobs extracted and stored")
+
+
+def ingest_knowledge(args):
+    """Load the skill knowledge base into the vector store"""
+    from .core.context import get_app_context
+    from .core.knowledge.store import KnowledgeStore
+    from .models.database import DatabaseManager
+
+    knowledge_store = KnowledgeStore(Config.KNOWLEDGE_PATH)
+    knowledge_store.process_knowledge(rebuild=args.rebuild)
+    # Skill names are canonicalized against the knowledge base, so re-derive the skill tables
+    context = get_app_context()
+    context.reload_skill_aliases()
+    DatabaseManager(context).backfill_skill_tables(rebuild=True)
+    print("✓ Knowledge base ingested")
+
+
+def match(args):
+    """Match unprocessed jobs against the active resume"""
+    from .core.matching.agent import MatchingAgent
+
+    matcher = MatchingAgent()
+    matcher.match_all_jobs(chunk_size=args.chunk_size, max_workers=args.workers, mode=args.mode)
+    print("✓ Job matching complete")
+
+
+def match_batch(args):
+    """Match several resumes (e.g. variants) against the same jobs, sharing job-side work"""
+    from .core.matching.agent import MatchingAgent
+
+    scraped_since = datetime.now() - timedelta(days=args.days) if args.days else None
+    matcher = MatchingAgent()
+    matcher.match_batch(resume_ids=args.resumes, scraped_since=scraped_since,
+                        chunk_size=args.chunk_size, max_workers=args.workers, mode=args.mode)
+    print("✓ Batch matching complete")
+
+
+def report(args):
+    """Print stored match results for the active resume (or --resume ID)"""
+    from .core.matching.report import print_match_results, sort_match_results
+    from .models.database import DatabaseManager
 
-def main():
+    db_manager = DatabaseManager()
+    if args.resume is not None:
+        resumes = db_manager.get_resumes([args.resume])
+        active_resume = resumes[0] if resumes else None
+    else:
+        active_resume = db_manager.get_active_resume()
+    if active_resume is None:
+        print("No matching resume found, nothing to report.")
+        return
+    if args.skills:
+        print_skill_demand(db_manager, active_resume, limit=args.skills)
+        return
+    sorted_results = sort_match_results(db_manager.get_match_results(active_resume.id))
+    if not sorted_results:
+        print("No match results yet, run `match` first.")
+        return
+    print_match_results(sorted_results, limit=args.limit)
+
+
+def print_skill_demand(db_manager, resume, limit: int):
+    db_manager.backfill_skill_tables()
+    resume_skills = db_manager.get_resume_skills(resume.id)
+    print("\n" + "=" * 80)
+    print(f"TOP {limit} SKILLS IN DEMAND (jobs asking for each)")
+    print("=" * 80)
+    for skill, job_count in db_manager.get_skill_demand(limit=limit):
+        status = "✓ on resume" if skill in resume_skills else "missing"
+        print(f"   {job_count:>5}  {skill:<40} {status}")
+
+
+def run(args):
     """Simple end-to-end workflow for Career Copilot"""
 
     print("=" * 60)
@@ -19,28 +133,95 @@ def main():
 
     # Step 1: Process resume
     print("\n[1/3] Processing resume...")
-    resume_manager = ResumeManager()
-    resume_path = Config.DATA_DIR.joinpath("resumes", "resume_2025.pdf")
-    resume_manager.process_resume(file_path=resume_path)
-    print("✓ Resume processed and stored")
+    ingest_resume(args)
 
     # Step 2: Scrape jobs
     print("\n[2/3] Scraping jobs from configured sources...")
-    job_manager = JobsManager()
-    job_manager.scrape_all_jobs()
-    print("✓ Jobs scraped and stored")
+    from .services.job_service import JobsManager
+
+    job_manager = JobsManager(offline=args.offline or None)
+    scrape(args, job_manager)
+    extract(args, job_manager)
 
     # Step 3: Match jobs with resume
     print("\n[3/3] Matching jobs with your resume...")
-    matcher = MatchingAgent()
-    matcher.match_all_jobs()
-    print("✓ Job matching complete")
+    match(args)
 
     print("\n" + "=" * 60)
     print("Workflow complete! Check the database for results.")
     print("=" * 60)
 
 
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="career-copilot",
+                                     description="Career Copilot - AI-Powered Job Matching")
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND", required=True)
+
+    def add_command(name, handler):
+        command_parser = subparsers.add_parser(name, help=handler.__doc__,
+                                               description=handler.__doc__)
+        command_parser.set_defaults(handler=handler)
+        return command_parser
+
+    def add_resume_path(command_parser):
+        command_parser.add_argument(
+            "path", nargs="?", type=Path, default=Config.DEFAULT_RESUME_PATH,
+            help="resume PDF, or a directory of them (default: %(default)s)")
+
+    def add_match_options(command_parser):
+        command_parser.add_argument(
+            "--chunk-size", type=int, default=None,
+            help=f"jobs leased per chunk (default: {Config.MATCHING_CHUNK_SIZE})")
+        command_parser.add_argument(
+            "--workers", type=int, default=None,
+            help=f"concurrent LLM scoring calls (default: {Config.MATCHING_WORKERS})")
+        command_parser.add_argument("--mode", choices=["llm", "skills", "hybrid"], default=None,
+                                    help="LLM scoring, deterministic skill coverage, or "
+                                         "coverage with the LLM for the top "
+                                         f"{Config.MATCHING_HYBRID_LLM_TOP_K} "
+                                         f"(default: {Config.MATCHING_MODE})")
+
+    add_resume_path(add_command("ingest-resume", ingest_resume))
+    def add_scrape_options(command_parser):
+        command_parser.add_argument("--offline", action="store_true",
+                                    help="replay pages from the HTTP cache "
+                                         "without touching the network")
+
+    add_scrape_options(add_command("scrape", scrape))
+    add_command("extract", extract)
+    add_command("ingest-knowledge", ingest_knowledge).add_argument(
+        "--rebuild", action="store_true", help="drop and re-embed the whole knowledge base")
+    add_match_options(add_command("match", match))
+    batch_parser = add_command("match-batch", match_batch)
+    add_match_options(batch_parser)
+    batch_parser.add_argument("--resumes", type=int, nargs="+", metavar="ID", default=None,
+                              help="resume ids to match (default: every stored resume)")
+    batch_parser.add_argument("--days", type=float, default=None,
+                              help="only jobs scraped in the last N days "
+                                   "(default: every stored job)")
+    report_parser = add_command("report", report)
+    report_parser.add_argument("--limit", type=int, default=None,
+                               help="show only the top N results")
+    report_parser.add_argument("--resume", type=int, metavar="ID", default=None,
+                               help="report on this resume instead of the active one")
+    report_parser.add_argument("--skills", type=int, metavar="N", default=None,
+                               help="instead show the N most demanded skills "
+                                    "and whether the resume has them")
+    run_parser = add_command("run", run)
+    add_resume_path(run_parser)
+    add_scrape_options(run_parser)
+    add_match_options(run_parser)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        args.handler(args)
+    finally:
+        # Spans, counters and LLM token figures collected during this command
+        export_run_metrics(command=args.command)
+
 
 if __name__ == "__main__":
     main()
@@ -1,4 +1,16 @@
-from .entities import Base, Resume, Job
 from .database import DatabaseManager
+from .entities import (
+    Base,
+    Job,
+    JobLSHBucket,
+    JobSignature,
+    JobSkill,
+    MatchTask,
+    Resume,
+    ResumeSkill,
+)
 
-__all__ = ['Base', 'Resume', 'Job', 'DatabaseManager']
+__all__ = [
+    'Base', 'Resume', 'Job', 'JobSkill', 'ResumeSkill', 'JobSignature', 'JobLSHBucket', 'MatchTask',
+    'DatabaseManager',
+]
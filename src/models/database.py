@@ -1,25 +1,142 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from .entities import Base, Resume, Job
-from ..config.settings import Config
 import json
+from datetime import datetime, timedelta
+
+from sqlalchemy import (
+    case,
+    create_engine,
+    delete,
+    event,
+    exists,
+    func,
+    inspect,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.pool import QueuePool
+
+from ..config.settings import Config
+from ..core.metrics import metrics
+from .entities import (
+    Base,
+    Job,
+    JobLSHBucket,
+    JobSignature,
+    JobSkill,
+    MatchTask,
+    Resume,
+    ResumeSkill,
+)
 
 
 class DatabaseManager:
     """Manages database connections and operations for resumes and jobs."""
 
-    def __init__(self):
+    # Keeps IN (...) lists well below SQLite's bound-parameter limit
+    SKILL_QUERY_CHUNK_SIZE = 500
+    # Indexes earlier versions created that nothing queries anymore
+    RETIRED_INDEXES = ("ix_jobs_processed",)
+
+    def __init__(self, context=None):
+        """
+        Uses the shared engine and thread-local sessions of `context` (default: the
+        process-wide AppContext).
+        """
+        if context is None:
+            from ..core.context import get_app_context
+            context = get_app_context()
+        self._context = context
+        # Proxies every call to the calling thread's own session
+        self.session = context.session_factory
+
+    @staticmethod
+    def build_engine():
+        """
+        Create the pooled engine shared by every DatabaseManager, with pragmas, tables and
+        indexes in place.
+        """
         db_path = Config.DATA_DIR.joinpath("database.db")
         try:
-            engine = create_engine(f"sqlite:///{db_path}")
+            engine = create_engine(
+                f"sqlite:///{db_path}",
+                poolclass=QueuePool,
+                pool_size=Config.DB_POOL_SIZE,
+                max_overflow=Config.DB_MAX_OVERFLOW,
+            )
+            event.listen(engine, "connect", DatabaseManager._set_sqlite_pragmas)
             Base.metadata.create_all(engine)
-            self.session = sessionmaker(bind=engine)()
+            DatabaseManager._add_missing_columns(engine)
+            DatabaseManager._create_missing_indexes(engine)
+            DatabaseManager._drop_retired_indexes(engine)
             print(f"Connection to the db successful.")
+            return engine
         except Exception as ex:
             print("Connection could not be made due to the following error: \n", ex)
+            raise
+
+    @staticmethod
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        """WAL lets readers run alongside the writer; NORMAL sync avoids an fsync per commit."""
+        cursor = dbapi_connection.cursor()
+        for pragma in Config.SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    @staticmethod
+    def _add_missing_columns(engine):
+        """create_all() skips existing tables, so add any nullable columns they lack."""
+        inspector = inspect(engine)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                try:
+                    with engine.begin() as connection:
+                        column_type = column.type.compile(engine.dialect)
+                        connection.execute(text(
+                            f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                        ))
+                except Exception as e:
+                    print(f"Adding column {table.name}.{column.name} UNSUCCESSFUL: \n", e)
+
+    @staticmethod
+    def _create_missing_indexes(engine):
+        """create_all() skips existing tables, so add any indexes they were created without."""
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                try:
+                    index.create(bind=engine, checkfirst=True)
+                except Exception as e:
+                    print(f"Creating index {index.name} UNSUCCESSFUL: \n", e)
+
+    @staticmethod
+    def _drop_retired_indexes(engine):
+        """Drop indexes that existing databases still carry but the models no longer declare."""
+        for index_name in DatabaseManager.RETIRED_INDEXES:
+            try:
+                with engine.begin() as connection:
+                    connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+            except Exception as e:
+                print(f"Dropping index {index_name} UNSUCCESSFUL: \n", e)
+
+    def _commit(self, operation: str):
+        """Commit the current session, timing it as a db_commit span labelled with the operation."""
+        try:
+            with metrics.span("db_commit", operation=operation):
+                self.session.commit()
+        except Exception:
+            metrics.increment("db_commit_failures", operation=operation)
+            raise
 
-    def add_resume(self, resume_details: dict):
-        """Add a new resume and set it as active."""
+    def add_resume(self, resume_details: dict, activate: bool = True):
+        """
+        Add a new resume, by default setting it as active. Returns the stored resume, or None
+        on failure.
+        """
         new_resume = Resume(
             raw_text=resume_details.get("raw_text"),
             name=resume_details.get("name"),
@@ -31,16 +148,55 @@ class DatabaseManager:
             summary=resume_details.get("summary"),
             projects=json.dumps(resume_details.get("projects")),
             uploaded_at=resume_details.get("uploaded_at"),
-            is_active=True
+            content_hash=resume_details.get("content_hash"),
+            is_active=activate
         )
         try:
-            self.session.query(Resume).update({Resume.is_active: False})
+            if activate:
+                self.session.query(Resume).update({Resume.is_active: False})
             self.session.add(new_resume)
-            self.session.commit()
+            self.session.flush()
+            self._replace_resume_skills({new_resume.id: resume_details.get("skills")})
+            self._commit("add_resume")
             print("Resume successfully added.")
+            return new_resume
         except Exception as e:
             print("Commit for adding a new resume UNSUCCESSFUL: \n", e)
             self.session.rollback()
+            return None
+
+    def set_active_resume(self, resume_id: int):
+        """Make the given resume the only active one."""
+        try:
+            self.session.query(Resume).update({Resume.is_active: Resume.id == resume_id})
+            self._commit("set_active_resume")
+        except Exception as e:
+            print(f"Commit for activating resume {resume_id} UNSUCCESSFUL: \n", e)
+            self.session.rollback()
+
+    def get_resume_by_hash(self, content_hash: str):
+        """Retrieve the resume ingested from a file with the given content hash, if any."""
+        try:
+            resume: Resume = (
+                self.session.query(Resume).where(Resume.content_hash == content_hash).first()
+            )
+            return resume
+        except Exception as e:
+            print(f"Retrieving resume with hash {content_hash} UNSUCCESSFUL: \n", e)
+            return None
+
+    def get_resume_hashes(self) -> set[str]:
+        """Retrieve the content hashes of all stored resumes in a single query."""
+        try:
+            return {
+                content_hash
+                for (content_hash,) in self.session.query(Resume.content_hash)
+                .where(Resume.content_hash.isnot(None))
+                .all()
+            }
+        except Exception as e:
+            print("Retrieving resume hashes UNSUCCESSFUL: \n", e)
+            return set()
 
     def get_all_resumes(self):
         """Retrieve all resumes from the database."""
@@ -51,6 +207,18 @@ class DatabaseManager:
             print("Commit for retrieving all resumes UNSUCCESSFUL: \n", e)
             return []
 
+    def get_resumes(self, resume_ids: list[int] = None):
+        """Retrieve the given resumes in id order, or all resumes when `resume_ids` is None."""
+        try:
+            query = self.session.query(Resume)
+            if resume_ids is not None:
+                query = query.where(Resume.id.in_(resume_ids))
+            resumes: list[Resume] = query.order_by(Resume.id).all()
+            return resumes
+        except Exception as e:
+            print(f"Retrieving resumes {resume_ids} UNSUCCESSFUL: \n", e)
+            return []
+
     def get_active_resume(self):
         """Retrieve the currently active resume."""
         try:
@@ -62,25 +230,243 @@ class DatabaseManager:
 
     def add_job_posting(self, job_details: dict):
         """Add a new job posting to the database."""
-        new_job_posting = Job(
-            job_id=job_details.get("job_id"),
-            title=job_details.get("title"),
-            company=job_details.get("company"),
-            location=job_details.get("location"),
-            description=job_details.get("description"),
-            requirements=json.dumps(job_details.get("requirements")),
-            key_technologies=json.dumps(job_details.get("key_technologies")),
-            url=job_details.get("url"),
-            source=job_details.get("source"),
-            scraped_at=job_details.get("scraped_at"),
+        self.add_job_postings([job_details])
+
+    def add_job_postings(self, batch: list[dict]) -> int:
+        """Upsert a batch of job postings in a single transaction, keyed on (source, job_id)."""
+        if not batch:
+            return 0
+        rows = [
+            {
+                "job_id": job_details.get("job_id"),
+                "title": job_details.get("title"),
+                "company": job_details.get("company"),
+                "location": job_details.get("location"),
+                "description": job_details.get("description"),
+                "requirements": json.dumps(job_details.get("requirements")),
+                "key_technologies": json.dumps(job_details.get("key_technologies")),
+                "url": job_details.get("url"),
+                "source": job_details.get("source"),
+                "scraped_at": job_details.get("scraped_at") or datetime.now(),
+                "canonical_job_id": job_details.get("canonical_job_id"),
+            }
+            for job_details in batch
+        ]
+        try:
+            statement = insert(Job)
+            statement = statement.on_conflict_do_update(
+                index_elements=[Job.source, Job.job_id],
+                set_={
+                    column: statement.excluded[column]
+                    for column in rows[0]
+                    if column not in ("job_id", "source")
+                },
+            )
+            # executemany: SQLAlchemy batches the rows into multi-row INSERTs itself
+            self.session.execute(statement, rows)
+            row_ids = self._job_row_ids(batch)
+            self._replace_job_skills({
+                row_ids[(job.get("source"), job.get("job_id"))]: job.get("key_technologies")
+                for job in batch
+            })
+            self._replace_job_signatures({
+                row_ids[(job.get("source"), job.get("job_id"))]: (
+                    bytes.fromhex(job["minhash"]), job.get("lsh_buckets") or []
+                )
+                for job in batch
+                if job.get("minhash")
+            })
+            self._commit("add_job_postings")
+            print(f"{len(rows)} jobs successfully added.")
+            return len(rows)
+        except Exception as e:
+            print("Commit for adding job postings UNSUCCESSFUL: \n", e)
+            self.session.rollback()
+            return 0
+
+    def _canonical_skills(self, names) -> dict[str, bool]:
+        """Map raw skill names to normalized knowledge base skill names (or themselves if unknown),
+        deduplicated."""
+        skill_aliases = self._context.skill_aliases
+        skills = {}
+        for name in names or []:
+            if not isinstance(name, str) or not name.strip():
+                continue
+            canonical = skill_aliases.canonical_skill(name)
+            skill = skill_aliases.normalize(canonical or name)
+            skills[skill] = skills.get(skill, False) or canonical is not None
+        return skills
+
+    def _job_row_ids(self, batch: list[dict]) -> dict[tuple[str, str], int]:
+        """Look up the row ids of freshly upserted job dicts, keyed by (source, job_id)."""
+        job_ids_by_source = {}
+        for job in batch:
+            job_ids_by_source.setdefault(job.get("source"), []).append(job.get("job_id"))
+        row_ids = {}
+        for source, job_ids in job_ids_by_source.items():
+            for start in range(0, len(job_ids), self.SKILL_QUERY_CHUNK_SIZE):
+                rows = self.session.execute(
+                    select(Job.id, Job.job_id)
+                    .where(Job.source == source)
+                    .where(Job.job_id.in_(job_ids[start:start + self.SKILL_QUERY_CHUNK_SIZE]))
+                )
+                for id, job_id in rows:
+                    row_ids[(source, job_id)] = id
+        return row_ids
+
+    def _replace_job_skills(self, skills_by_job_id: dict[int, list[str]]):
+        """Rewrite the job_skills rows of the given jobs; the caller commits."""
+        job_ids = list(skills_by_job_id)
+        for start in range(0, len(job_ids), self.SKILL_QUERY_CHUNK_SIZE):
+            chunk = job_ids[start:start + self.SKILL_QUERY_CHUNK_SIZE]
+            self.session.execute(delete(JobSkill).where(JobSkill.job_id.in_(chunk)))
+        rows = [
+            {"job_id": job_id, "skill": skill, "canonical": canonical}
+            for job_id, names in skills_by_job_id.items()
+            for skill, canonical in self._canonical_skills(names).items()
+        ]
+        if rows:
+            self.session.execute(insert(JobSkill), rows)
+
+    def _replace_job_signatures(self, signatures_by_job_id: dict[int, tuple[bytes, list[int]]]):
+        """
+        Rewrite the MinHash signature and LSH bucket rows of the given jobs; the caller commits.
+        """
+        job_ids = list(signatures_by_job_id)
+        for start in range(0, len(job_ids), self.SKILL_QUERY_CHUNK_SIZE):
+            chunk = job_ids[start:start + self.SKILL_QUERY_CHUNK_SIZE]
+            self.session.execute(delete(JobSignature).where(JobSignature.job_id.in_(chunk)))
+            self.session.execute(delete(JobLSHBucket).where(JobLSHBucket.job_id.in_(chunk)))
+        if not signatures_by_job_id:
+            return
+        self.session.execute(
+            insert(JobSignature),
+            [
+                {"job_id": job_id, "signature": signature}
+                for job_id, (signature, _) in signatures_by_job_id.items()
+            ],
         )
+        bucket_rows = [
+            {"band": band, "bucket": bucket, "job_id": job_id}
+            for job_id, (_, buckets) in signatures_by_job_id.items()
+            for band, bucket in enumerate(buckets)
+        ]
+        if bucket_rows:
+            self.session.execute(insert(JobLSHBucket), bucket_rows)
+
+    def _replace_resume_skills(self, skills_by_resume_id: dict[int, list[str]]):
+        """Rewrite the resume_skills rows of the given resumes; the caller commits."""
+        if not skills_by_resume_id:
+            return
+        self.session.execute(delete(ResumeSkill).where(ResumeSkill.resume_id.in_(list(skills_by_resume_id))))
+        rows = [
+            {"resume_id": resume_id, "skill": skill, "canonical": canonical}
+            for resume_id, names in skills_by_resume_id.items()
+            for skill, canonical in self._canonical_skills(names).items()
+        ]
+        if rows:
+            self.session.execute(insert(ResumeSkill), rows)
+
+    def backfill_skill_tables(self, rebuild: bool = False) -> int:
+        """
+        Fill job_skills and resume_skills for rows stored without them, or for every row if
+        `rebuild` (e.g. after the knowledge base changed). Returns the number of rows refreshed.
+        """
         try:
-            self.session.add(new_job_posting)
-            self.session.commit()
-            print("Job successfully added.")
+            jobs = select(Job.id, Job.key_technologies)
+            resumes = select(Resume.id, Resume.skills)
+            if not rebuild:
+                jobs = jobs.where(~exists().where(JobSkill.job_id == Job.id))
+                resumes = resumes.where(~exists().where(ResumeSkill.resume_id == Resume.id))
+            job_skills = {
+                id: json.loads(key_technologies or "[]")
+                for id, key_technologies in self.session.execute(jobs)
+            }
+            resume_skills = {
+                id: json.loads(skills or "[]") for id, skills in self.session.execute(resumes)
+            }
+            if rebuild:
+                self.session.execute(delete(JobSkill))
+                self.session.execute(delete(ResumeSkill))
+            self._replace_job_skills(job_skills)
+            self._replace_resume_skills(resume_skills)
+            self._commit("backfill_skill_tables")
+            return len(job_skills) + len(resume_skills)
         except Exception as e:
-            print("Commit for adding a new job posting UNSUCCESSFUL: \n", e)
+            print("Commit for backfilling skill tables UNSUCCESSFUL: \n", e)
             self.session.rollback()
+            return 0
+
+    @staticmethod
+    def _unmatched(resume_id: int):
+        """Filter for jobs without a finished (done or failed) match task for the resume."""
+        return ~exists().where(
+            (MatchTask.job_id == Job.id)
+            & (MatchTask.resume_id == resume_id)
+            & MatchTask.state.in_([MatchTask.DONE, MatchTask.FAILED])
+        )
+
+    def get_unprocessed_jobs_sharing_skills(self, resume_id: int, min_shared_skills: int = 1):
+        """
+        Retrieve jobs not yet matched against the resume that share at least
+        `min_shared_skills` skills with it, as (Job, shared skill count) pairs with the
+        largest overlap first, in one SQL query.
+        """
+        shared_skills = func.count(JobSkill.skill).label("shared_skills")
+        try:
+            return (
+                self.session.query(Job, shared_skills)
+                .join(JobSkill, JobSkill.job_id == Job.id)
+                .join(
+                    ResumeSkill,
+                    (ResumeSkill.skill == JobSkill.skill) & (ResumeSkill.resume_id == resume_id),
+                )
+                .where(self._unmatched(resume_id))
+                .group_by(Job.id)
+                .having(shared_skills >= min_shared_skills)
+                .order_by(shared_skills.desc(), Job.id)
+                .all()
+            )
+        except Exception as e:
+            print(f"Retrieving jobs sharing skills with resume {resume_id} UNSUCCESSFUL: \n", e)
+            return []
+
+    def get_skill_demand(
+        self, limit: int = None, unmatched_resume_id: int = None, missing_from_resume_id: int = None
+    ):
+        """
+        Count the jobs asking for each skill, most demanded first, as (skill, job count) pairs.
+        Optionally only over jobs not yet matched against a resume, and/or only skills the
+        given resume lacks.
+        """
+        job_count = func.count(JobSkill.job_id).label("job_count")
+        try:
+            query = self.session.query(JobSkill.skill, job_count)
+            if unmatched_resume_id is not None:
+                query = query.join(Job, Job.id == JobSkill.job_id).where(
+                    self._unmatched(unmatched_resume_id)
+                )
+            if missing_from_resume_id is not None:
+                query = query.where(~exists().where(
+                    (ResumeSkill.resume_id == missing_from_resume_id)
+                    & (ResumeSkill.skill == JobSkill.skill)
+                ))
+            query = query.group_by(JobSkill.skill).order_by(job_count.desc(), JobSkill.skill)
+            if limit:
+                query = query.limit(limit)
+            return query.all()
+        except Exception as e:
+            print("Retrieving skill demand UNSUCCESSFUL: \n", e)
+            return []
+
+    def get_resume_skills(self, resume_id: int) -> set[str]:
+        """Retrieve the normalized skills of a resume."""
+        try:
+            query = self.session.query(ResumeSkill.skill).where(ResumeSkill.resume_id == resume_id)
+            return {skill for (skill,) in query}
+        except Exception as e:
+            print(f"Retrieving skills of resume {resume_id} UNSUCCESSFUL: \n", e)
+            return set()
 
     def get_all_jobs(self):
         """Retrieve all jobs from the database."""
@@ -91,10 +477,65 @@ class DatabaseManager:
             print("Retrieving all jobs UNSUCCESSFUL: \n", e)
             return []
 
-    def get_all_unprocessed_jobs(self):
-        """Retrieve all jobs that haven't been processed for matching yet."""
+    def get_jobs(self, job_ids: list[int] = None, scraped_since: datetime = None):
+        """Retrieve the given jobs (by jobs.id) or all jobs, optionally only recent ones."""
+        try:
+            query = self.session.query(Job)
+            if job_ids is not None:
+                query = query.where(Job.id.in_(job_ids))
+            if scraped_since is not None:
+                query = query.where(Job.scraped_at >= scraped_since)
+            jobs: list[Job] = query.order_by(Job.id).all()
+            return jobs
+        except Exception as e:
+            print("Retrieving jobs UNSUCCESSFUL: \n", e)
+            return []
+
+    def get_lsh_bucket_jobs(self, buckets: list[tuple[int, int]]):
+        """
+        Retrieve the stored jobs with a signature in any of the given (band, bucket) LSH
+        buckets, as (band, bucket, Job, signature) rows.
+        """
+        buckets = list(dict.fromkeys(buckets))
+        rows = []
+        try:
+            # Two bound parameters per bucket
+            chunk_size = self.SKILL_QUERY_CHUNK_SIZE // 2
+            for start in range(0, len(buckets), chunk_size):
+                rows.extend(
+                    self.session.query(
+                        JobLSHBucket.band, JobLSHBucket.bucket, Job, JobSignature.signature
+                    )
+                    .join(Job, Job.id == JobLSHBucket.job_id)
+                    .join(JobSignature, JobSignature.job_id == JobLSHBucket.job_id)
+                    .where(
+                        tuple_(JobLSHBucket.band, JobLSHBucket.bucket)
+                        .in_(buckets[start:start + chunk_size])
+                    )
+                    .all()
+                )
+            return rows
+        except Exception as e:
+            print("Retrieving jobs by LSH bucket UNSUCCESSFUL: \n", e)
+            return []
+
+    def get_finished_job_ids(self, resume_id: int) -> set[int]:
+        """Retrieve the ids of the jobs with a done or failed match task for the resume."""
+        try:
+            return {
+                job_id
+                for (job_id,) in self.session.query(MatchTask.job_id)
+                .where(MatchTask.resume_id == resume_id)
+                .where(MatchTask.state.in_([MatchTask.DONE, MatchTask.FAILED]))
+            }
+        except Exception as e:
+            print(f"Retrieving finished jobs of resume {resume_id} UNSUCCESSFUL: \n", e)
+            return set()
+
+    def get_all_unprocessed_jobs(self, resume_id: int):
+        """Retrieve all jobs that haven't been matched against the resume yet."""
         try:
-            jobs: list[Job] = self.session.query(Job).where(Job.processed == False).all()
+            jobs: list[Job] = self.session.query(Job).where(self._unmatched(resume_id)).all()
             return jobs
         except Exception as e:
             print("Retrieving UNPROCESSED jobs UNSUCCESSFUL: \n", e)
@@ -109,9 +550,222 @@ class DatabaseManager:
             print(f"Retrieving job {job_id} UNSUCCESSFUL: \n", e)
             return False
 
+    def get_job_ids(self, source: str = None) -> set[str]:
+        """Retrieve the IDs of all stored jobs, optionally of one source only, in a single query."""
+        try:
+            query = self.session.query(Job.job_id)
+            if source:
+                query = query.where(Job.source == source)
+            return {job_id for (job_id,) in query.all()}
+        except Exception as e:
+            print(f"Retrieving job IDs for source {source} UNSUCCESSFUL: \n", e)
+            return set()
+
+    def enqueue_match_tasks(self, resume_id: int, job_ids: list[int]):
+        """Queue resume/job pairs for matching; pairs that are already queued keep their state."""
+        if not job_ids:
+            return
+        try:
+            statement = insert(MatchTask).on_conflict_do_nothing(
+                index_elements=[MatchTask.resume_id, MatchTask.job_id]
+            )
+            self.session.execute(
+                statement,
+                [
+                    {"resume_id": resume_id, "job_id": job_id, "state": MatchTask.PENDING}
+                    for job_id in job_ids
+                ],
+            )
+            self._commit("enqueue_match_tasks")
+        except Exception as e:
+            print("Commit for enqueuing match tasks UNSUCCESSFUL: \n", e)
+            self.session.rollback()
+
+    def lease_match_tasks(self, resume_id: int | list[int], owner: str, limit: int,
+                          lease_seconds: int, max_attempts: int):
+        """
+        Atomically claim up to `limit` pending tasks (or tasks whose lease has expired) of one
+        resume, or of a list of resumes, for `owner`, and return the tasks claimed by this
+        call with their jobs as (MatchTask, Job) pairs. Expired leases that already used
+        their last attempt are marked failed.
+        """
+        resume_ids = resume_id if isinstance(resume_id, (list, tuple, set)) else [resume_id]
+        now = datetime.now()
+        expired = (MatchTask.state == MatchTask.LEASED) & (MatchTask.lease_expires_at < now)
+        claimable = (
+            select(MatchTask.id)
+            .where(MatchTask.resume_id.in_(resume_ids))
+            .where(MatchTask.attempts < max_attempts)
+            .where(or_(MatchTask.state == MatchTask.PENDING, expired))
+            .order_by(MatchTask.id)
+            .limit(limit)
+        )
+        try:
+            # The run holding these leases stopped on their last attempt, so nobody will finish them
+            self.session.execute(
+                update(MatchTask)
+                .where(MatchTask.resume_id.in_(resume_ids))
+                .where(expired)
+                .where(MatchTask.attempts >= max_attempts)
+                .values(
+                    state=MatchTask.FAILED,
+                    error="Lease expired on the last attempt",
+                    lease_owner=None,
+                    lease_expires_at=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            # A single UPDATE runs under SQLite's write lock, so concurrent runs never claim the
+            # same task
+            claimed_ids = self.session.execute(
+                update(MatchTask)
+                .where(MatchTask.id.in_(claimable.scalar_subquery()))
+                .values(
+                    state=MatchTask.LEASED,
+                    lease_owner=owner,
+                    lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    attempts=MatchTask.attempts + 1,
+                )
+                .returning(MatchTask.id)
+                .execution_options(synchronize_session=False)
+            ).scalars().all()
+            self._commit("lease_match_tasks")
+            if not claimed_ids:
+                return []
+            # Only this call's claims: a task whose checkpoint failed stays leased until it expires
+            return (
+                self.session.query(MatchTask, Job)
+                .join(Job, Job.id == MatchTask.job_id)
+                .where(MatchTask.id.in_(claimed_ids))
+                .order_by(MatchTask.id)
+                .populate_existing()
+                .all()
+            )
+        except Exception as e:
+            print("Leasing match tasks UNSUCCESSFUL: \n", e)
+            self.session.rollback()
+            return []
+
+    def complete_match_task(self, task_id: int, owner: str, result: dict) -> bool:
+        """Checkpoint a finished match by storing its result on the task."""
+        match_score = result.get("total_score")
+        try:
+            updated = self.session.execute(
+                update(MatchTask)
+                .where(MatchTask.id == task_id)
+                .where(MatchTask.lease_owner == owner)
+                .where(MatchTask.state == MatchTask.LEASED)
+                .values(
+                    state=MatchTask.DONE,
+                    result=json.dumps(result),
+                    match_score=match_score,
+                    error=None,
+                )
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            self._commit("complete_match_task")
+            return bool(updated)
+        except Exception as e:
+            print(f"Commit for completing match task {task_id} UNSUCCESSFUL: \n", e)
+            self.session.rollback()
+            return False
+
+    def store_match_results(self, resume_id: int, results: dict[int, dict]) -> int:
+        """
+        Store finished matches scored outside the work queue, e.g. by the skill coverage
+        scorer, keyed by jobs.id. Each pair's task is created or overwritten as done, except
+        for tasks that are already done or leased by a run that may still finish them.
+        Returns the number of results stored.
+        """
+        if not results:
+            return 0
+        rows = [
+            {
+                "resume_id": resume_id,
+                "job_id": job_id,
+                "state": MatchTask.DONE,
+                "result": json.dumps(result),
+                "match_score": result.get("total_score"),
+                "error": None,
+                "lease_owner": None,
+                "lease_expires_at": None,
+                "updated_at": datetime.now(),
+            }
+            for job_id, result in results.items()
+        ]
+        now = datetime.now()
+        try:
+            statement = insert(MatchTask)
+            stored = self.session.execute(
+                statement.on_conflict_do_update(
+                    index_elements=[MatchTask.resume_id, MatchTask.job_id],
+                    set_={
+                        column: statement.excluded[column]
+                        for column in (
+                            "state", "result", "match_score", "error", "lease_owner",
+                            "lease_expires_at", "updated_at",
+                        )
+                    },
+                    where=(MatchTask.state != MatchTask.DONE) & ~(
+                        (MatchTask.state == MatchTask.LEASED) & (MatchTask.lease_expires_at >= now)
+                    ),
+                ).returning(MatchTask.id),
+                rows,
+            ).scalars().all()
+            self._commit("store_match_results")
+            print(f"{len(stored)} match results successfully stored.")
+            return len(stored)
+        except Exception as e:
+            print(f"Commit for storing match results of resume {resume_id} UNSUCCESSFUL: \n", e)
+            self.session.rollback()
+            return 0
+
+    def fail_match_task(self, task_id: int, owner: str, error: str, max_attempts: int):
+        """Release a failed task for retry, or mark it failed once it has used all its attempts."""
+        try:
+            self.session.execute(
+                update(MatchTask)
+                .where(MatchTask.id == task_id)
+                .where(MatchTask.lease_owner == owner)
+                .where(MatchTask.state == MatchTask.LEASED)
+                .values(
+                    state=case(
+                        (MatchTask.attempts >= max_attempts, MatchTask.FAILED),
+                        else_=MatchTask.PENDING,
+                    ),
+                    error=error,
+                    lease_owner=None,
+                    lease_expires_at=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            self._commit("fail_match_task")
+        except Exception as e:
+            print(f"Commit for failing match task {task_id} UNSUCCESSFUL: \n", e)
+            self.session.rollback()
+
+    def get_match_results(self, resume_id: int, job_ids: list[int] = None):
+        """
+        Retrieve the finished matches for a resume, optionally only for the given jobs, as
+        (MatchTask, Job) pairs.
+        """
+        try:
+            query = (
+                self.session.query(MatchTask, Job)
+                .join(Job, Job.id == MatchTask.job_id)
+                .where(MatchTask.resume_id == resume_id)
+                .where(MatchTask.state == MatchTask.DONE)
+            )
+            if job_ids is not None:
+                query = query.where(MatchTask.job_id.in_(job_ids))
+            return query.populate_existing().all()
+        except Exception as e:
+            print(f"Retrieving match results for resume {resume_id} UNSUCCESSFUL: \n", e)
+            return []
+
     def close_connection(self):
-        """Close the database session."""
+        """Close the calling thread's database session and return its connection to the pool."""
         try:
-            self.session.close()
+            self.session.remove()
         except Exception as e:
             print("Close session connection UNSUCCESSFUL: \n", e)
@@ -1,7 +1,21 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float
-from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
+from sqlalchemy import (
+    BigInteger,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    PrimaryKeyConstraint,
+    String,
+    Text,
+)
+from sqlalchemy.ext.declarative import declarative_base
+
 Base = declarative_base()
 
 
@@ -21,6 +35,11 @@ class Resume(Base):
     projects = Column(Text)
     uploaded_at = Column(DateTime, default=datetime.now())
     is_active = Column(Boolean)
+    content_hash = Column(String)  # sha256 of the source file, used to skip re-ingesting it
+
+    __table_args__ = (
+        Index('ix_resumes_content_hash', 'content_hash', unique=True),
+    )
 
 
 class Job(Base):
@@ -39,5 +58,89 @@ class Job(Base):
     source = Column(String)  # 'remoteok', 'hackernews', etc.
 
     scraped_at = Column(DateTime, default=datetime.now)
+    # Not written or indexed anymore: match state and scores are per resume, in match_tasks
     processed = Column(Boolean, default=False)
     match_score = Column(Float, nullable=True)
+    canonical_job_id = Column(Integer, ForeignKey('jobs.id'), nullable=True)  # set on reposts
+
+    __table_args__ = (
+        Index('ix_jobs_source_job_id', 'source', 'job_id', unique=True),
+        Index('ix_jobs_canonical_job_id', 'canonical_job_id'),
+    )
+
+
+class JobSignature(Base):
+    """MinHash signature of a job's cleaned role details, used to detect near-duplicate postings."""
+    __tablename__ = 'job_signatures'
+
+    job_id = Column(Integer, ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)  # jobs.id
+    signature = Column(LargeBinary, nullable=False)  # uint32 MinHash values
+
+
+class JobLSHBucket(Base):
+    """One LSH band bucket of a job's signature; jobs sharing a bucket are duplicate candidates."""
+    __tablename__ = 'job_lsh_buckets'
+
+    band = Column(Integer, nullable=False)
+    bucket = Column(BigInteger, nullable=False)  # 64-bit hash of the band's signature values
+    job_id = Column(Integer, ForeignKey('jobs.id', ondelete='CASCADE'), nullable=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('band', 'bucket', 'job_id'),
+    )
+
+
+class JobSkill(Base):
+    """One canonical skill of a job, normalized out of Job.key_technologies for SQL-side queries."""
+    __tablename__ = 'job_skills'
+
+    job_id = Column(Integer, ForeignKey('jobs.id', ondelete='CASCADE'), nullable=False)  # jobs.id
+    skill = Column(String, nullable=False)  # knowledge base skill name, or the raw name if unknown
+    canonical = Column(Boolean, nullable=False, default=False)  # True if the skill is known
+
+    __table_args__ = (
+        PrimaryKeyConstraint('job_id', 'skill'),
+        Index('ix_job_skills_skill', 'skill', 'job_id'),
+    )
+
+
+class ResumeSkill(Base):
+    """One canonical skill of a resume, normalized out of Resume.skills for SQL-side queries."""
+    __tablename__ = 'resume_skills'
+
+    resume_id = Column(Integer, ForeignKey('resumes.id', ondelete='CASCADE'), nullable=False)
+    skill = Column(String, nullable=False)
+    canonical = Column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        PrimaryKeyConstraint('resume_id', 'skill'),
+        Index('ix_resume_skills_skill', 'skill', 'resume_id'),
+    )
+
+
+class MatchTask(Base):
+    """Durable work-queue entry for scoring one resume against one job."""
+    __tablename__ = 'match_tasks'
+
+    PENDING = 'pending'
+    LEASED = 'leased'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    resume_id = Column(Integer, ForeignKey('resumes.id'), nullable=False)
+    # jobs.id, not the source's job_id
+    job_id = Column(Integer, ForeignKey('jobs.id'), nullable=False)
+    state = Column(String, nullable=False, default=PENDING)
+    lease_owner = Column(String)
+    lease_expires_at = Column(DateTime)
+    attempts = Column(Integer, nullable=False, default=0)
+    match_score = Column(Float, nullable=True)
+    result = Column(Text)
+    error = Column(Text)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+    __table_args__ = (
+        Index('ix_match_tasks_resume_job', 'resume_id', 'job_id', unique=True),
+        Index('ix_match_tasks_state', 'resume_id', 'state'),
+    )
@@ -1,6 +1,7 @@
 from pathlib import Path
 from dataclasses import dataclass
 import logging
+import hashlib
 import os
 try:
     import PyPDF2
@@ -14,6 +15,16 @@ class ParsedResume:
 class ResumeParser:
     def __init__(self):
         pass
+
+    @staticmethod
+    def content_hash(file_path:Path) -> str:
+        """sha256 of the file's bytes; identical resume files share a hash whatever their name."""
+        digest=hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for block in iter(lambda: file.read(1024*1024), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
     def extract_resume(self,file_path:Path) -> ParsedResume:
         logging.info(f"Extracting resume: {file_path.name} ...")
         #check if file exists
@@ -35,10 +46,7 @@ class ResumeParser:
         # determine which parser you need
         try:
             reader=PdfReader(file_path)
-            raw_txt=""
-            for page in reader.pages:
-                extracted_txt=page.extract_text()
-                raw_txt+=extracted_txt
+            raw_txt="".join(page.extract_text() for page in reader.pages)
             logging.info(f"Successfully extracted resume details from {file_path.name}.")
             return raw_txt
         except Exception as e:
@@ -1,4 +1,8 @@
 from .base import BaseScraper
 from .linkedin import LinkedInScraper
+from .http import HTTPResponseCache, OfflineCacheMiss, TokenBucketRateLimiter
 
-__all__ = ['BaseScraper', 'LinkedInScraper']
+__all__ = [
+    'BaseScraper', 'LinkedInScraper', 'HTTPResponseCache', 'OfflineCacheMiss',
+    'TokenBucketRateLimiter',
+]
@@ -7,5 +7,6 @@ class BaseScraper(ABC):
         self.source=source
         
     @abstractmethod
-    def scrapeJobs(self):
+    def scrapeJobs(self, known_job_ids: set[str] = None):
+        """Scrapes job postings, skipping cards whose job ID is in `known_job_ids`."""
         pass
\ No newline at end of file
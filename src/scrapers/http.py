@@ -0,0 +1,293 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from requests.structures import CaseInsensitiveDict
+
+from ..core.metrics import metrics
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucketRateLimiter:
+    """
+    Thread-safe token-bucket rate limiter with one bucket per host.
+
+    Each host gets `capacity` tokens that refill at `rate` tokens per second; `acquire`
+    blocks until a token is available for the URL's host.
+    """
+
+    def __init__(self, rate: float, capacity: int):
+        if(rate<=0 or capacity<1):
+            raise ValueError("Rate limiter rate must be positive and capacity at least 1.")
+        self.rate=rate
+        self.capacity=capacity
+        self._buckets={}
+        self._lock=threading.Lock()
+
+    def acquire(self, url: str):
+        host=urlparse(url).netloc
+        while True:
+            with self._lock:
+                now=time.monotonic()
+                tokens, last_refill=self._buckets.get(host, (self.capacity, now))
+                tokens=min(self.capacity, tokens+(now-last_refill)*self.rate)
+                if(tokens>=1):
+                    self._buckets[host]=(tokens-1, now)
+                    return
+                self._buckets[host]=(tokens, now)
+                wait_time=(1-tokens)/self.rate
+            time.sleep(wait_time)
+
+
+class OfflineCacheMiss(RequestException):
+    """Raised in offline replay mode for a URL the HTTP cache has no response for."""
+
+
+class HTTPResponseCache:
+    """
+    Persistent cache of successful GET responses stored in SQLite, keyed by URL.
+
+    Callers pass a TTL per request, so each kind of page can go stale at its own pace. A
+    fresh entry is served without touching the network; a stale one is revalidated with
+    If-None-Match / If-Modified-Since and served again on 304 Not Modified. In `offline`
+    (replay) mode only the cache is used, whatever the age of its entries, and a missing
+    entry raises OfflineCacheMiss.
+
+    Query parameters listed in `ignored_params` (tracking IDs and the like) are dropped from
+    the key so the same page is recognized however it was linked. Entries not fetched or
+    revalidated for `max_age_seconds` are dropped.
+    """
+
+    def __init__(self, db_path: Path, max_age_seconds: float, ignored_params: set[str] = (),
+                 offline: bool = False):
+        self.db_path=db_path
+        self.max_age_seconds=max_age_seconds
+        self.ignored_params=set(ignored_params)
+        self.offline=offline
+        self.hits=0
+        self.revalidated=0
+        self.misses=0
+        self._lock=threading.Lock()
+        try:
+            self._connection=sqlite3.connect(db_path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS http_responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    status_code INTEGER NOT NULL,
+                    headers TEXT NOT NULL,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    fetched_at REAL NOT NULL
+                )"""
+            )
+            self._connection.commit()
+            logging.info(f"Successfully opened HTTP response cache: {db_path}")
+        except Exception:
+            logging.error(f"Failed to open HTTP response cache: {db_path}")
+            raise
+        if(not offline):
+            self.evict()
+
+    def make_key(self, url: str) -> str:
+        parsed=urlparse(url)
+        params=[
+            (name, value) for name, value in parse_qsl(parsed.query, keep_blank_values=True)
+            if name not in self.ignored_params
+        ]
+        return parsed._replace(query=urlencode(sorted(params)), fragment="").geturl()
+
+    def get(self, url: str):
+        """Returns the cached entry for `url` as a dict with its response and age, or None."""
+        with self._lock:
+            row=self._connection.execute(
+                "SELECT url, status_code, headers, body, etag, last_modified, fetched_at "
+                "FROM http_responses WHERE key = ?",
+                (self.make_key(url),)
+            ).fetchone()
+        if(row is None):
+            return None
+        cached_url, status_code, headers, body, etag, last_modified, fetched_at=row
+        response=requests.Response()
+        response.status_code=status_code
+        response.headers=CaseInsensitiveDict(json.loads(headers))
+        response._content=body
+        response.url=cached_url
+        response.encoding=requests.utils.get_encoding_from_headers(response.headers)
+        return {
+            "response": response, "etag": etag, "last_modified": last_modified,
+            "age": time.time()-fetched_at
+        }
+
+    def put(self, url: str, response: requests.Response):
+        with self._lock:
+            self._connection.execute(
+                """INSERT OR REPLACE INTO http_responses
+                (key, url, status_code, headers, body, etag, last_modified, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (
+                    self.make_key(url), url, response.status_code,
+                    json.dumps(dict(response.headers)), response.content,
+                    response.headers.get("ETag"), response.headers.get("Last-Modified"), time.time()
+                )
+            )
+            self._connection.commit()
+
+    def touch(self, url: str):
+        """Marks the entry for `url` as fetched now, after the server confirmed it is unchanged."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE http_responses SET fetched_at = ? WHERE key = ?",
+                (time.time(), self.make_key(url))
+            )
+            self._connection.commit()
+
+    def evict(self):
+        """Drops entries that have not been fetched or revalidated for `max_age_seconds`."""
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM http_responses WHERE fetched_at < ?",
+                (time.time()-self.max_age_seconds,)
+            )
+            self._connection.commit()
+
+    def record(self, result: str):
+        with self._lock:
+            if(result=="fresh"):
+                self.hits+=1
+            elif(result=="revalidated"):
+                self.revalidated+=1
+            else:
+                self.misses+=1
+        metrics.increment("http_cache_lookups", result=result)
+
+    def stats(self) -> dict:
+        with self._lock:
+            size=self._connection.execute("SELECT COUNT(*) FROM http_responses").fetchone()[0]
+            lookups=self.hits+self.revalidated+self.misses
+            return {
+                "size": size,
+                "hits": self.hits,
+                "revalidated": self.revalidated,
+                "misses": self.misses,
+                "hit_rate": (self.hits+self.revalidated)/lookups if lookups else 0.0
+            }
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def create_session(headers: dict, pool_size: int) -> requests.Session:
+    """Creates a keep-alive session whose connection pool can serve `pool_size` workers."""
+    session=requests.Session()
+    session.headers.update(headers)
+    adapter=HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def fetch_with_retries(
+    session: requests.Session,
+    url: str,
+    rate_limiter: TokenBucketRateLimiter = None,
+    max_retries: int = 3,
+    backoff_seconds: float = 1.0,
+    timeout: float = 15,
+    cache: HTTPResponseCache = None,
+    ttl_seconds: float = 0
+) -> requests.Response:
+    """
+    GETs a URL, retrying with exponential backoff on 429/5xx responses and connection errors.
+
+    A `Retry-After` header on a retryable response overrides the computed backoff. With a
+    `cache`, a response cached less than `ttl_seconds` ago is returned without a request, a
+    stale one is revalidated with a conditional request, and successful responses are stored.
+
+    Raises:
+        RequestException: If the request still fails after `max_retries` retries
+        OfflineCacheMiss: If the cache is in offline mode and has no response for the URL
+    """
+    if(cache is None):
+        return _get_with_retries(session, url, rate_limiter, max_retries, backoff_seconds, timeout)
+
+    cached=cache.get(url)
+    if(cached is not None and (cache.offline or cached["age"]<ttl_seconds)):
+        cache.record("fresh")
+        return cached["response"]
+    if(cache.offline):
+        cache.record("offline_miss")
+        raise OfflineCacheMiss(f"No cached response for {url} in offline replay mode.")
+
+    conditional_headers={}
+    if(cached is not None and cached["etag"]):
+        conditional_headers["If-None-Match"]=cached["etag"]
+    if(cached is not None and cached["last_modified"]):
+        conditional_headers["If-Modified-Since"]=cached["last_modified"]
+    try:
+        response=_get_with_retries(
+            session, url, rate_limiter, max_retries, backoff_seconds, timeout,
+            headers=conditional_headers
+        )
+    except RequestException:
+        cache.record("miss")
+        raise
+    if(response.status_code==304 and cached is not None):
+        cache.touch(url)
+        cache.record("revalidated")
+        return cached["response"]
+    cache.record("miss")
+    if(response.status_code==200):
+        cache.put(url, response)
+    return response
+
+
+def _get_with_retries(
+    session: requests.Session,
+    url: str,
+    rate_limiter: TokenBucketRateLimiter,
+    max_retries: int,
+    backoff_seconds: float,
+    timeout: float,
+    headers: dict = None
+) -> requests.Response:
+    for attempt in range(max_retries+1):
+        if(rate_limiter):
+            rate_limiter.acquire(url)
+        delay=backoff_seconds*(2**attempt)
+        try:
+            response=session.get(url=url, timeout=timeout, headers=headers)
+        except RequestException as e:
+            if(attempt==max_retries):
+                metrics.increment("http_failures", reason="connection")
+                raise
+            metrics.increment("http_retries", reason="connection")
+            logging.warning(f"Request to {url} failed ({e}), retrying in {delay:.1f}s.")
+        else:
+            if(response.status_code not in RETRYABLE_STATUS_CODES):
+                if(response.status_code>=400):
+                    metrics.increment("http_failures", reason=str(response.status_code))
+                response.raise_for_status()
+                return response
+            if(attempt==max_retries):
+                metrics.increment("http_failures", reason=str(response.status_code))
+                response.raise_for_status()
+            metrics.increment("http_retries", reason=str(response.status_code))
+            retry_after=response.headers.get("Retry-After")
+            if(retry_after and retry_after.isdigit()):
+                delay=float(retry_after)
+            logging.warning(
+                f"Request to {url} returned {response.status_code}, retrying in {delay:.1f}s."
+            )
+        time.sleep(delay)
@@ -1,10 +1,9 @@
 from .base import BaseScraper
+from .http import HTTPResponseCache, TokenBucketRateLimiter, create_session, fetch_with_retries
+from .linkedin_pages import LinkedInPageParser
 from ..config.settings import Config
-from requests.exceptions import RequestException
-from bs4 import BeautifulSoup
-import json
-import time
-import requests
+from ..core.metrics import metrics
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 
@@ -19,55 +18,109 @@ headers = {
 
 
 class LinkedInScraper(BaseScraper):
-    def __init__(self):
-        super().__init__(url=Config.SCRAPER_URLs.get("LinkedIn"), source="LinkedIn")
+    def __init__(self, url: str=None, max_workers: int=None, offline: bool=None):
+        super().__init__(url=url or Config.SCRAPER_URLs.get("LinkedIn"), source="LinkedIn")
+        self.max_workers=max(1, max_workers or Config.SCRAPER_MAX_WORKERS)
+        self.session=create_session(headers=headers, pool_size=self.max_workers)
+        self.rate_limiter=TokenBucketRateLimiter(
+            rate=Config.SCRAPER_REQUESTS_PER_SECOND,
+            capacity=Config.SCRAPER_RATE_LIMIT_BURST
+        )
+        self.page_parser=LinkedInPageParser()
+        offline=Config.HTTP_CACHE_OFFLINE if offline is None else offline
+        self.http_cache=None
+        # Replay mode needs the cache even if it is otherwise turned off
+        if(Config.HTTP_CACHE_ENABLED or offline):
+            self.http_cache=HTTPResponseCache(
+                db_path=Config.HTTP_CACHE_PATH,
+                max_age_seconds=Config.HTTP_CACHE_MAX_AGE_DAYS*24*60*60,
+                ignored_params=Config.HTTP_CACHE_IGNORED_PARAMS,
+                offline=offline
+            )
     
-    def scrapeJobs(self):
-        jobs=[]
+    def scrapeJobs(self, known_job_ids: set[str]=None):
+        known_job_ids=set(known_job_ids or ())
+        job_cards=[]
+        skipped_jobs=0
         start_index=0
         while True:
             if(start_index>0):
                 break
             url_to_fetch=self.fetched_url.format(start_index=start_index)
-            response=requests.get(url=url_to_fetch)
-            soup=BeautifulSoup(response.content,"html.parser")
-            job_cards=soup.find_all(class_="base-card")
-            if(len(job_cards)==0):
+            try:
+                with metrics.span("scrape_page", source=self.source):
+                    response=self._fetch(
+                        url_to_fetch, ttl_seconds=Config.HTTP_CACHE_LISTING_TTL_SECONDS
+                    )
+            except Exception as e:
+                print(f"FAILED TO RETRIEVE JOB LISTING: {url_to_fetch}",e)
+                break
+            with metrics.span("html_parse", source=self.source, page="listing"):
+                page_cards=self.page_parser.parse_listing(response.content)
+            if(len(page_cards)==0):
                 break
             else:
-                start_index=start_index+len(job_cards)
+                start_index=start_index+len(page_cards)
             
-            for index in range(len(job_cards)):
-                job_card=job_cards[index].find(class_="base-card__full-link")
-                job_url=job_card.attrs.get("href")
-                job_id=job_cards[index].attrs.get("data-entity-urn").split(":")[-1]
-                try:
-                    response=requests.get(url=job_url, headers=headers)
-                    time.sleep(1)
-                except Exception as e:
-                    print(f"FAILED TO RETRIEVE: {job_url}",e)
-                    continue
-                jobSoup=BeautifulSoup(response.content, "html.parser")
-                company=jobSoup.find(class_="topcard__org-name-link")
-                role=jobSoup.find(class_="top-card-layout__title")
-                job_location=jobSoup.find(class_="aside-job-card__location")
-                raw_role_details=jobSoup.find(class_="show-more-less-html__markup")
-                try:
-                    job={
-                        "job_id":job_id,
-                        "company":company.text.strip(),
-                        "title":role.text.strip(),
-                        "location":job_location.text.strip(),
-                        "role_details":raw_role_details.get_text('\n').strip(),
-                        "url":f"https://www.linkedin.com/jobs/view/{job_id}",
-                        "source":self.source,
-                        "scraped_at":datetime.now()
-                    }
-                    jobs.append(job)
-                    print(f"Scrape Successful for job: {job["job_id"]}")
-                except Exception as e:
-                    print(f"Scrape FAILED for job {job_url} because: {e}")
+            for job_id, job_url in page_cards:
+                # Known postings are dropped before any detail request is made
+                if(job_id in known_job_ids):
+                    skipped_jobs+=1
                     continue
+                known_job_ids.add(job_id)
+                job_cards.append((job_id, job_url))
+
+        print(f"Skipping {skipped_jobs} already known jobs, fetching {len(job_cards)} new jobs.")
+        metrics.increment("jobs_skipped", skipped_jobs, source=self.source)
+
+        # Detail pages are fetched concurrently over the pooled session; the per-host
+        # rate limiter keeps the overall request rate polite.
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            scraped_jobs=executor.map(lambda card: self._scrape_job(*card), job_cards)
+            jobs=[job for job in scraped_jobs if job is not None]
+        if(self.http_cache):
+            cache_stats=self.http_cache.stats()
+            print(
+                f"HTTP cache: {cache_stats['hits']} fresh, "
+                f"{cache_stats['revalidated']} revalidated, {cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.0%} hit rate)"
+            )
         return jobs
 
-            
\ No newline at end of file
+    def _fetch(self, url: str, ttl_seconds: float):
+        return fetch_with_retries(
+            session=self.session,
+            url=url,
+            rate_limiter=self.rate_limiter,
+            max_retries=Config.SCRAPER_MAX_RETRIES,
+            backoff_seconds=Config.SCRAPER_BACKOFF_SECONDS,
+            timeout=Config.SCRAPER_TIMEOUT_SECONDS,
+            cache=self.http_cache,
+            ttl_seconds=ttl_seconds
+        )
+
+    def _scrape_job(self, job_id: str, job_url: str):
+        try:
+            with metrics.span("detail_fetch", source=self.source):
+                response=self._fetch(job_url, ttl_seconds=Config.HTTP_CACHE_DETAIL_TTL_SECONDS)
+        except Exception as e:
+            print(f"FAILED TO RETRIEVE: {job_url}",e)
+            metrics.increment("scrape_failures", source=self.source, stage="fetch")
+            return None
+        try:
+            with metrics.span("html_parse", source=self.source, page="job"):
+                page_fields=self.page_parser.parse_job(response.content)
+            job={
+                "job_id":job_id,
+                **page_fields,
+                "url":f"https://www.linkedin.com/jobs/view/{job_id}",
+                "source":self.source,
+                "scraped_at":datetime.now()
+            }
+            print(f"Scrape Successful for job: {job_id}")
+            metrics.increment("jobs_scraped", source=self.source)
+            return job
+        except Exception as e:
+            print(f"Scrape FAILED for job {job_url} because: {e}")
+            metrics.increment("scrape_failures", source=self.source, stage="parse")
+            return None
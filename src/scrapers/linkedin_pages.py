@@ -0,0 +1,150 @@
+import logging
+
+from bs4 import BeautifulSoup
+
+from ..config.settings import Config
+from ..core.metrics import metrics
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree=None
+    lxml_html=None
+
+
+def _class_xpath(class_name: str, axis: str = "descendant") -> str:
+    # Same token match as BeautifulSoup's class_=..., which compares whitespace-separated
+    # class names
+    return f"{axis}::*[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+class LinkedInPageParser:
+    """
+    Extracts job cards from LinkedIn listing pages and job fields from detail pages.
+
+    The scraper needs only a handful of elements per page, so the fast path parses with
+    lxml and pulls them out with precompiled XPath class selectors instead of building a
+    BeautifulSoup tree. If lxml is not installed, cannot decode the page, or any expected
+    element is missing (e.g. the markup changed), the page is parsed again with
+    BeautifulSoup's "html.parser", exactly as before, so results never get worse than the
+    full parse.
+    """
+
+    CARD_CLASS = "base-card"
+    CARD_LINK_CLASS = "base-card__full-link"
+    JOB_FIELD_CLASSES = {
+        "company": "topcard__org-name-link",
+        "title": "top-card-layout__title",
+        "location": "aside-job-card__location",
+        "role_details": "show-more-less-html__markup",
+    }
+    # BeautifulSoup's get_text leaves out script, style and template strings
+    _TEXT_XPATH = (
+        ".//text()[not(ancestor::script) and not(ancestor::style) and not(ancestor::template)]"
+    )
+
+    def __init__(self, fast_path: bool = None):
+        if(fast_path is None):
+            fast_path=Config.SCRAPER_HTML_FAST_PATH
+        if(fast_path and lxml_html is None):
+            logging.warning("lxml is not installed, parsing LinkedIn pages with html.parser.")
+        self.fast_path=fast_path and lxml_html is not None
+        if(self.fast_path):
+            self._cards=etree.XPath(_class_xpath(LinkedInPageParser.CARD_CLASS))
+            self._card_link=etree.XPath(_class_xpath(LinkedInPageParser.CARD_LINK_CLASS))
+            self._job_fields={
+                field: etree.XPath(f"({_class_xpath(class_name)})[1]")
+                for field, class_name in LinkedInPageParser.JOB_FIELD_CLASSES.items()
+            }
+            self._text=etree.XPath(LinkedInPageParser._TEXT_XPATH)
+
+    def parse_listing(self, content: bytes) -> list[tuple[str, str]]:
+        """Returns the (job_id, job_url) of every job card on a listing page, in page order."""
+        if(self.fast_path):
+            cards=self._fast_listing(content)
+            if(cards is not None):
+                metrics.increment("html_parses", page="listing", parser="lxml")
+                return cards
+        metrics.increment("html_parses", page="listing", parser="html.parser")
+        soup=BeautifulSoup(content,"html.parser")
+        cards=[]
+        for page_card in soup.find_all(class_=LinkedInPageParser.CARD_CLASS):
+            job_card=page_card.find(class_=LinkedInPageParser.CARD_LINK_CLASS)
+            job_url=job_card.attrs.get("href")
+            job_id=page_card.attrs.get("data-entity-urn").split(":")[-1]
+            cards.append((job_id, job_url))
+        return cards
+
+    def parse_job(self, content: bytes) -> dict:
+        """
+        Returns the company, title, location and role_details of a job detail page.
+
+        Raises:
+            ValueError: If the page lacks any of them
+        """
+        if(self.fast_path):
+            job=self._fast_job(content)
+            if(job is not None):
+                metrics.increment("html_parses", page="job", parser="lxml")
+                return job
+        metrics.increment("html_parses", page="job", parser="html.parser")
+        jobSoup=BeautifulSoup(content, "html.parser")
+        elements={
+            field: jobSoup.find(class_=class_name)
+            for field, class_name in LinkedInPageParser.JOB_FIELD_CLASSES.items()
+        }
+        missing=[field for field, element in elements.items() if element is None]
+        if(missing):
+            raise ValueError(f"page has no {', '.join(missing)}")
+        return {
+            "company":elements["company"].text.strip(),
+            "title":elements["title"].text.strip(),
+            "location":elements["location"].text.strip(),
+            "role_details":elements["role_details"].get_text('\n').strip()
+        }
+
+    def _document(self, content: bytes):
+        """Parses `content` with lxml, or returns None if it is empty or not UTF-8."""
+        try:
+            text=content.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+        if(not text.strip()):
+            return None
+        try:
+            return lxml_html.document_fromstring(text)
+        except (etree.ParserError, ValueError):
+            return None
+
+    def _fast_listing(self, content: bytes):
+        if(not content.strip()):
+            return []
+        document=self._document(content)
+        if(document is None):
+            return None
+        cards=[]
+        for page_card in self._cards(document):
+            links=self._card_link(page_card)
+            job_urn=page_card.get("data-entity-urn")
+            if(not links or job_urn is None):
+                return None
+            cards.append((job_urn.split(":")[-1], links[0].get("href")))
+        return cards
+
+    def _fast_job(self, content: bytes):
+        document=self._document(content)
+        if(document is None):
+            return None
+        elements={}
+        for field, xpath in self._job_fields.items():
+            found=xpath(document)
+            if(not found):
+                return None
+            elements[field]=found[0]
+        return {
+            "company":"".join(self._text(elements["company"])).strip(),
+            "title":"".join(self._text(elements["title"])).strip(),
+            "location":"".join(self._text(elements["location"])).strip(),
+            "role_details":"\n".join(self._text(elements["role_details"])).strip()
+        }
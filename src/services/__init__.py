@@ -1,4 +1,4 @@
-from .resume_service import ResumeManager
 from .job_service import JobsManager
+from .resume_service import ResumeManager
 
 __all__ = ['ResumeManager', 'JobsManager']
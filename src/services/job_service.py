@@ -2,39 +2,291 @@ from ..scrapers.linkedin import LinkedInScraper
 from ..models.database import DatabaseManager
 from ..config.settings import Config
 from datetime import datetime
-from langchain_community.llms import Ollama
-from langchain_core.prompts import PromptTemplate
-import time
-import yaml, json
+from ..core.context import AppContext, get_app_context
+from ..core.metrics import metrics
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import json
 
 class JobsManager:
-    def __init__(self):
-        self.scrapers=[LinkedInScraper()]
-        self.db_manager=DatabaseManager()
-        self.llm = Ollama(model="llama3.2")
+    def __init__(self, context: AppContext=None, offline: bool=None):
+        """
+        `offline` replays scraped pages from the HTTP cache only
+        (default: Config.HTTP_CACHE_OFFLINE).
+        """
+        self.context=context or get_app_context()
+        self.scrapers=[LinkedInScraper(offline=offline)]
+        self.db_manager=DatabaseManager(self.context)
+        # Job index is created on first use so `scrape` never loads ChromaDB
+        self._job_index=None
+        self._near_duplicates=None
 
-        prompts_file=Config.PROMPT_DIR.joinpath("job.yaml")
-        if(not prompts_file.exists()):
-            raise Exception("JobManager prompt file foes not exist")
-        with open(prompts_file, 'r') as file:
-            self.prompts = yaml.safe_load(file)
+    @property
+    def llm(self):
+        # Resolved through the context on first use so `scrape` never loads LangChain
+        return self.context.get_llm()
+
+    @property
+    def near_duplicates(self):
+        if(self._near_duplicates is None):
+            from ..core.near_duplicates import MinHashLSH
+            self._near_duplicates=MinHashLSH()
+        return self._near_duplicates
+
+    @property
+    def job_index(self):
+        if(self._job_index is None):
+            from ..core.matching.job_index import JobIndex
+            self._job_index=JobIndex()
+        return self._job_index
 
     def scrape_all_jobs(self):
+        self.scrape_jobs()
+        self.extract_staged_jobs()
+
+    def scrape_jobs(self) -> int:
+        """
+        Scrapes every source and stages the new postings in Config.SCRAPED_JOBS_PATH for
+        `extract_staged_jobs`. Postings already stored or already staged are skipped.
+        """
+        staged_jobs=self._load_staged_jobs()
+        scraped=0
         for scraper in self.scrapers:
-            jobs=scraper.scrapeJobs()
-            for job in jobs:
-                if(self.db_manager.does_job_exist(job_id=job.get("job_id"))):
+            # One bulk lookup per source instead of an existence check per posting
+            known_job_ids=self.db_manager.get_job_ids(source=scraper.source)
+            known_job_ids.update(
+                job.get("job_id") for job in staged_jobs if job.get("source")==scraper.source
+            )
+            jobs=scraper.scrapeJobs(known_job_ids=known_job_ids)
+            staged_jobs.extend(jobs)
+            scraped+=len(jobs)
+        self._save_staged_jobs(staged_jobs)
+        print(f"Staged {scraped} new jobs ({len(staged_jobs)} awaiting extraction).")
+        return scraped
+
+    def extract_staged_jobs(self) -> int:
+        """
+        Runs LLM extraction over the staged postings and stores the parsed jobs. Postings
+        whose extraction fails stay staged for the next run, up to
+        Config.JOB_EXTRACTION_MAX_ATTEMPTS attempts.
+
+        Near-duplicates of stored jobs (reposts under a new job id) skip the LLM and are
+        stored with the original's extracted fields, linked to it by canonical_job_id. A
+        posting that repeats an earlier one in the same batch waits until that one is stored.
+        """
+        staged_jobs=self._load_staged_jobs()
+        if(not staged_jobs):
+            print("No staged jobs to extract.")
+            return 0
+        saved=0
+        failed_jobs=[]
+        repeated_jobs=[]
+        if(Config.JOB_DEDUP_ENABLED):
+            duplicate_jobs, staged_jobs=self._link_stored_duplicates(staged_jobs)
+            staged_jobs, repeated_jobs=self._split_repeated_jobs(staged_jobs)
+            saved+=self._save_jobs(duplicate_jobs, failed_jobs)
+        saved+=self._extract_and_save(staged_jobs, failed_jobs)
+        if(repeated_jobs):
+            # Their originals are stored now; any whose original failed extraction go to the LLM
+            duplicate_jobs, repeated_jobs=self._link_stored_duplicates(repeated_jobs)
+            saved+=self._save_jobs(duplicate_jobs, failed_jobs)
+            saved+=self._extract_and_save(repeated_jobs, failed_jobs)
+        self._save_staged_jobs(self._retry_or_drop(failed_jobs))
+        llm_cache_stats=self.llm.cache_stats()
+        if(llm_cache_stats):
+            print(
+                f"LLM cache: {llm_cache_stats['hits']} hits, {llm_cache_stats['misses']} misses "
+                f"({llm_cache_stats['hit_rate']:.0%} hit rate)"
+            )
+        return saved
+
+    def _extract_and_save(self, jobs: list[dict], failed_jobs: list[dict]) -> int:
+        saved=0
+        parsed_jobs=[]
+        # MAKE LLM CALLS TO PARSE JOB DETAILS FOR DESCRIPTION AND REQUIREMENTS
+        for job, error in self.extract_jobs(jobs):
+            if(error):
+                print(f"LLM PARSING FAILED FOR JOB {job.get('url')} BECAUSE: {error}")
+                failed_jobs.append(job)
+                continue
+            # BUILD AND SAVE JOB POSTINGS IN BATCHES
+            parsed_jobs.append(job)
+            if(len(parsed_jobs)>=Config.JOB_PERSIST_BATCH_SIZE):
+                saved+=self._save_jobs(parsed_jobs, failed_jobs)
+                parsed_jobs=[]
+        saved+=self._save_jobs(parsed_jobs, failed_jobs)
+        return saved
+
+    def _signature(self, job: dict):
+        """
+        Signs the job's role details, keeping the signature on the job dict for add_job_postings.
+        """
+        signature=self.near_duplicates.signature(job.get("role_details"))
+        if(signature is None):
+            return None
+        job["minhash"]=self.near_duplicates.to_hex(signature)
+        job["lsh_buckets"]=self.near_duplicates.buckets(signature)
+        return signature
+
+    def _link_stored_duplicates(self, jobs: list[dict]) -> tuple[list[dict], list[dict]]:
+        """
+        Links each job that is a near-duplicate of a stored job to it, copying its extracted
+        fields. Returns the linked jobs and the rest.
+        """
+        signatures={id(job): self._signature(job) for job in jobs}
+        bucket_jobs={}
+        buckets=[
+            (band, bucket)
+            for job in jobs for band, bucket in enumerate(job.get("lsh_buckets") or [])
+        ]
+        for band, bucket, stored_job, signature in self.db_manager.get_lsh_bucket_jobs(buckets):
+            bucket_jobs.setdefault((band, bucket), {})[stored_job.id]=(stored_job, signature)
+        duplicate_jobs=[]
+        unique_jobs=[]
+        for job in jobs:
+            candidates={}
+            for band, bucket in enumerate(job.get("lsh_buckets") or []):
+                candidates.update(bucket_jobs.get((band, bucket), {}))
+            best_job, best_similarity=None, 0.0
+            for stored_job, signature in candidates.values():
+                if(stored_job.source==job.get("source") and stored_job.job_id==job.get("job_id")):
                     continue
-                # MAKE LLM CALL TO PARSE JOB DETAILS FOR DESCRIPTION AND REQUIREMENTS
-                try:
-                    self._llm_parse_job(job=job)
-                except Exception as e:
-                    print(f"LLM PARSING FAILED FOR JOB {job.get('url')} BECAUSE: {e}")
+                similarity=self.near_duplicates.similarity(
+                    signatures[id(job)], self.near_duplicates.from_bytes(signature)
+                )
+                if(similarity>best_similarity):
+                    best_job, best_similarity=stored_job, similarity
+            if(best_job is None or best_similarity<self.near_duplicates.threshold):
+                unique_jobs.append(job)
+                continue
+            job.update({
+                "description": best_job.description,
+                "requirements": json.loads(best_job.requirements or "null"),
+                "key_technologies": json.loads(best_job.key_technologies or "null"),
+                # Always link to the first posting, never to another repost
+                "canonical_job_id": best_job.canonical_job_id or best_job.id
+            })
+            metrics.increment("job_extractions", result="duplicate")
+            duplicate_jobs.append(job)
+        if(duplicate_jobs):
+            print(
+                f"{len(duplicate_jobs)} of {len(jobs)} jobs are reposts of stored jobs, "
+                "reusing their extraction."
+            )
+        return duplicate_jobs, unique_jobs
+
+    def _split_repeated_jobs(self, jobs: list[dict]) -> tuple[list[dict], list[dict]]:
+        """
+        Splits jobs signed by `_link_stored_duplicates` into first postings and near-duplicates of
+        an earlier job in the batch.
+        """
+        bucket_jobs={}
+        first_jobs=[]
+        repeated_jobs=[]
+        for job in jobs:
+            signature=(
+                self.near_duplicates.from_bytes(bytes.fromhex(job["minhash"]))
+                if job.get("minhash") else None
+            )
+            buckets=list(enumerate(job.get("lsh_buckets") or []))
+            if(any(
+                self.near_duplicates.is_duplicate(signature, earlier_signature)
+                for band_bucket in buckets
+                for earlier_signature in bucket_jobs.get(band_bucket, [])
+            )):
+                repeated_jobs.append(job)
+                continue
+            first_jobs.append(job)
+            for band_bucket in buckets:
+                bucket_jobs.setdefault(band_bucket, []).append(signature)
+        return first_jobs, repeated_jobs
+
+    def _load_staged_jobs(self) -> list[dict]:
+        if(not Config.SCRAPED_JOBS_PATH.exists()):
+            return []
+        jobs=[]
+        with open(Config.SCRAPED_JOBS_PATH, 'r') as file:
+            for line in file:
+                if(not line.strip()):
                     continue
-                # print(job)
-                # BUILD AND SAVE JOB POSTING
-                self.db_manager.add_job_posting(job_details=job)
-    
+                job=json.loads(line)
+                if(job.get("scraped_at")):
+                    job["scraped_at"]=datetime.fromisoformat(job["scraped_at"])
+                jobs.append(job)
+        return jobs
+
+    @staticmethod
+    def _staged_line(job: dict) -> str:
+        def serialize(value):
+            return value.isoformat() if isinstance(value, datetime) else str(value)
+        return json.dumps(job, default=serialize)+"\n"
+
+    def _retry_or_drop(self, failed_jobs: list[dict]) -> list[dict]:
+        """
+        Counts another attempt for each failed posting and returns the ones to keep staged.
+        Postings out of attempts are appended to Config.SCRAPED_JOBS_DEAD_LETTER_PATH instead;
+        once they leave the staging file, the next scrape fetches them again.
+        """
+        retry_jobs=[]
+        dead_jobs=[]
+        for job in failed_jobs:
+            job["attempts"]=job.get("attempts", 0)+1
+            if(job["attempts"]>=Config.JOB_EXTRACTION_MAX_ATTEMPTS):
+                dead_jobs.append(job)
+            else:
+                retry_jobs.append(job)
+        if(dead_jobs):
+            with open(Config.SCRAPED_JOBS_DEAD_LETTER_PATH, 'a') as file:
+                for job in dead_jobs:
+                    file.write(JobsManager._staged_line(job))
+            metrics.increment("job_extractions", len(dead_jobs), result="dropped")
+            print(
+                f"Dropped {len(dead_jobs)} jobs after {Config.JOB_EXTRACTION_MAX_ATTEMPTS} failed "
+                f"attempts, see {Config.SCRAPED_JOBS_DEAD_LETTER_PATH}."
+            )
+        return retry_jobs
+
+    def _save_staged_jobs(self, jobs: list[dict]):
+        staging_file=Config.SCRAPED_JOBS_PATH
+        if(not jobs):
+            staging_file.unlink(missing_ok=True)
+            return
+        # Write-then-rename so an interrupted run never leaves a truncated staging file
+        tmp_file=staging_file.with_suffix(".tmp")
+        with open(tmp_file, 'w') as file:
+            for job in jobs:
+                file.write(JobsManager._staged_line(job))
+        tmp_file.replace(staging_file)
+
+    def extract_jobs(self, jobs: list[dict], max_workers: int=None):
+        """
+        Runs LLM extraction over the jobs with up to `max_workers` requests in flight.
+
+        Yields (job, error) pairs as extractions finish; `error` is None on success. A failed
+        extraction only affects its own job.
+        """
+        max_workers=max(1, max_workers or Config.LLM_EXTRACTION_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures={executor.submit(self._llm_parse_job, job=job): job for job in jobs}
+            for future in as_completed(futures):
+                error=future.exception()
+                yield futures[future], error
+
+    def _save_jobs(self, jobs: list[dict], failed_jobs: list[dict]) -> int:
+        if(not jobs):
+            return 0
+        if(not self.db_manager.add_job_postings(batch=jobs)):
+            # Keep them staged so the next extract run retries the insert
+            failed_jobs.extend(jobs)
+            return 0
+        # Embed each job once, at insert time, for the matching shortlist; reposts are matched
+        # through their original
+        try:
+            self.job_index.add_jobs([job for job in jobs if not job.get("canonical_job_id")])
+        except Exception as e:
+            print(f"JOB EMBEDDING FAILED BECAUSE: {e}")
+        return len(jobs)
+
     def get_scraped_jobs(self):
         jobs=self.db_manager.get_all_jobs()
         return jobs
@@ -46,26 +298,24 @@ class JobsManager:
     def _llm_parse_job(self,job:dict[str,str|int]) -> dict[str,str]:
         job_details=job.get("role_details")
         if(not job_details):
-            raise Exception(f"EMPTY JOB DETAILS FOR JOB: {job.get("job_id")}")
+            raise Exception(f"EMPTY JOB DETAILS FOR JOB: {job.get('job_id')}")
         
-        prompt=PromptTemplate.from_template(self.prompts.get("job_extraction")).format(job_text=job_details)
-        start_time = time.perf_counter()
+        prompt_template=self.context.get_prompt_template("job.yaml", "job_extraction")
+        template=prompt_template.template
+        prompt=prompt_template.format(job_text=job_details)
         try:
-            resp=self.llm.invoke(prompt)
-            print(resp)
-            resp_obj=json.loads(resp)
-            for key in ["description", "requirements","key_technologies"]:
-                if (key not in resp_obj):
-                    raise(Exception("INVALID LLM RESPONSE"))
+            with metrics.span("job_extraction"):
+                resp_obj=self.llm.invoke_json(
+                    prompt,
+                    template=template,
+                    required_keys=["description", "requirements","key_technologies"]
+                )
+            logging.debug(f"Extracted job {job.get('job_id')}: {json.dumps(resp_obj)}")
         except Exception as e:
+            metrics.increment("job_extractions", result="failed")
             raise Exception(e)
-        end_time = time.perf_counter()
-
-        elapsed_time = end_time - start_time
+        metrics.increment("job_extractions", result="ok")
         job.update(resp_obj)
-
-        # Print the duration in seconds
-        print(f"The operation took {elapsed_time:.4f} seconds.")
         
 
         
\ No newline at end of file
@@ -3,52 +3,142 @@ from ..models.entities import Resume
 from ..parsers.resume import ResumeParser
 from ..config.settings import Config
 from pathlib import Path
-from langchain.chains.llm import LLMChain
-from langchain_core.prompts import PromptTemplate
-from langchain_community.llms import Ollama
-import yaml
-import time
+from ..core.context import AppContext, get_app_context
+from ..core.metrics import metrics
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import multiprocessing
 import json
 
 class ResumeManager:
-    def __init__(self):
+    def __init__(self, context: AppContext=None):
+        self.context=context or get_app_context()
         self.parser=ResumeParser()
-        self.db_manager=DatabaseManager()
-        self.llm = Ollama(model="llama3.2")
-
-        prompts_file=Config.PROMPT_DIR.joinpath("resume.yaml")
-        if(not prompts_file.exists()):
-            raise Exception("ResumeManager prompt file foes not exist")
-        with open(prompts_file, 'r') as file:
-            self.prompts = yaml.safe_load(file)
-        
+        self.db_manager=DatabaseManager(self.context)
+        # Job index is created on first use so re-ingesting a stored resume never loads ChromaDB
+        self._job_index=None
+        self.llm = self.context.get_llm()
+
+    @property
+    def job_index(self):
+        if(self._job_index is None):
+            from ..core.matching.job_index import JobIndex
+            self._job_index=JobIndex()
+        return self._job_index
+
     def process_resume(self, file_path:Path):
+        content_hash=ResumeParser.content_hash(file_path)
+        stored_resume=self.db_manager.get_resume_by_hash(content_hash)
+        if(stored_resume):
+            # Same file already parsed: skip PDF extraction and the LLM call, just reactivate it
+            print(f"Resume {file_path.name} already stored as resume {stored_resume.id}, "
+                  "activating it.")
+            self.db_manager.set_active_resume(stored_resume.id)
+            return stored_resume
+
         parsed_resume=self.parser.extract_resume(file_path=file_path)
 
         resume_details=self.llm_parse(parsed_resume.raw_text)
+        resume_details["content_hash"]=content_hash
 
         print(json.dumps(resume_details, indent=4))
 
-        self.db_manager.add_resume(resume_details=resume_details)
+        active_resume=self.db_manager.add_resume(resume_details=resume_details)
+
+        # Embed the new active resume once for the matching shortlist
+        if(active_resume):
+            self.job_index.add_resume(active_resume)
+        return active_resume
+
+    def process_resume_directory(
+        self, directory:Path, pattern:str="*.pdf", extraction_workers:int=None, llm_workers:int=None
+    ):
+        """
+        Ingests every resume in `directory` matching `pattern`, skipping files whose content
+        is already stored. PDFs are extracted in a process pool (PyPDF2 is CPU-bound) and
+        each extracted text is handed to the LLM pool as soon as it is ready. New resumes do
+        not change the active resume unless none is active yet.
+
+        Returns the newly stored resumes.
+        """
+        extraction_workers=max(1, extraction_workers or Config.RESUME_EXTRACTION_WORKERS)
+        llm_workers=max(1, llm_workers or Config.LLM_EXTRACTION_WORKERS)
+        known_hashes=self.db_manager.get_resume_hashes()
+        files={}
+        for file_path in sorted(directory.glob(pattern)):
+            content_hash=ResumeParser.content_hash(file_path)
+            if(content_hash in known_hashes or content_hash in files.values()):
+                print(f"Skipping {file_path.name}, its content is already stored.")
+                continue
+            files[file_path]=content_hash
+        if(not files):
+            print(f"No new resumes in {directory}.")
+            return []
+        print(
+            f"Ingesting {len(files)} new resumes with {extraction_workers} extraction and "
+            f"{llm_workers} LLM workers..."
+        )
+
+        parsed_details={}
+        # spawn, not fork: the parent already runs database and HTTP threads
+        extraction_pool=ProcessPoolExecutor(
+            max_workers=min(extraction_workers, len(files)),
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        with extraction_pool, ThreadPoolExecutor(max_workers=llm_workers) as llm_pool:
+            extractions={
+                extraction_pool.submit(self.parser.extract_resume, file_path): file_path
+                for file_path in files
+            }
+            llm_calls={}
+            for future in as_completed(extractions):
+                file_path=extractions[future]
+                if(future.exception() or future.result() is None):
+                    error=future.exception() or 'unsupported file type'
+                    print(f"EXTRACTION FAILED FOR RESUME {file_path.name} BECAUSE: {error}")
+                    continue
+                llm_calls[llm_pool.submit(self.llm_parse, future.result().raw_text)]=file_path
+            for future in as_completed(llm_calls):
+                file_path=llm_calls[future]
+                if(future.exception()):
+                    error=future.exception()
+                    print(f"LLM PARSING FAILED FOR RESUME {file_path.name} BECAUSE: {error}")
+                    continue
+                parsed_details[file_path]=future.result()
+
+        stored_resumes=[]
+        activate=self.db_manager.get_active_resume() is None
+        # Store in file order so repeated runs assign ids deterministically
+        for file_path in sorted(parsed_details):
+            resume_details=parsed_details[file_path]
+            resume_details["content_hash"]=files[file_path]
+            resume=self.db_manager.add_resume(resume_details=resume_details, activate=activate)
+            if(resume is None):
+                continue
+            activate=False
+            stored_resumes.append(resume)
+            try:
+                self.job_index.add_resume(resume)
+            except Exception as e:
+                print(f"RESUME EMBEDDING FAILED FOR {file_path.name} BECAUSE: {e}")
+        print(f"Stored {len(stored_resumes)} of {len(files)} new resumes.")
+        return stored_resumes
 
-        name=self.db_manager.get_all_resumes()[0].name
-    
     def get_active_resume(self) -> Resume:
         return self.db_manager.get_active_resume()
 
     def llm_parse(self, resume_text:str):
-        prompt=PromptTemplate.from_template(self.prompts.get("basic_resume_extraction")).format(resume_text=resume_text)
-        start_time = time.perf_counter()
+        prompt_template=self.context.get_prompt_template("resume.yaml", "basic_resume_extraction")
+        template=prompt_template.template
+        prompt=prompt_template.format(resume_text=resume_text)
         try:
-            resp=self.llm.invoke(prompt)
-            print(resp)
-            resp_obj=json.loads(resp)
+            with metrics.span("resume_extraction"):
+                resp_obj=self.llm.invoke_json(prompt, template=template)
+            print(json.dumps(resp_obj))
         except Exception as e:
             print("LLM Inference ERROR")
+            metrics.increment("resume_extractions", result="failed")
             raise Exception(e)
-        end_time = time.perf_counter()
-
-        elapsed_time = end_time - start_time
+        metrics.increment("resume_extractions", result="ok")
         resume_details={
             "raw_text":resume_text,
             "name":resp_obj.get("name"),
@@ -60,9 +150,6 @@ class ResumeManager:
             "summary":resp_obj.get("summary"),
             "projects":resp_obj.get("projects")
         }
-
-        # Print the duration in seconds
-        print(f"The operation took {elapsed_time:.4f} seconds.")
         return resume_details
 
 
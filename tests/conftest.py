@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+from benchmarks.fixtures import FixtureServer, QuietHandler
+
+
+class ScriptedServer(FixtureServer):
+    """
+    Local HTTP stand-in that answers GETs with the responses queued for each path (query
+    strings ignored), in order, then with 200 "ok". Every request is recorded as (path,
+    headers, monotonic time).
+    """
+
+    def __init__(self):
+        self.responses = {}
+        self.requests = []
+        super().__init__(_ScriptedHandler)
+
+    def queue(self, path: str, *responses: tuple[int, dict, bytes]):
+        self.responses.setdefault(path, []).extend(responses)
+
+    def url(self, path: str, host: str = "127.0.0.1") -> str:
+        return f"http://{host}:{self.server_address[1]}{path}"
+
+    def requests_to(self, path: str) -> list:
+        return [request for request in self.requests if request[0] == path]
+
+
+class _ScriptedHandler(QuietHandler):
+    def do_GET(self):  # noqa: N802 (http.server naming)
+        path = self.path.partition("?")[0]
+        self.server.requests.append((path, dict(self.headers), time.monotonic()))
+        queued = self.server.responses.get(path)
+        status, headers, body = queued.pop(0) if queued else (200, {}, b"ok")
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def http_server():
+    with ScriptedServer() as server:
+        yield server
@@ -0,0 +1,50 @@
+from src.config.settings import Config
+from src.core.matching.context_builder import ContextBuilder
+
+EXAMPLE = "Built REST APIs in Python with FastAPI and deployed them on AWS"
+NEAR_IDENTICAL_EXAMPLE = "Built REST APIs in Python with FastAPI and deployed them to AWS"
+
+
+def _skill(definition=None, tools=None, resume_examples=None) -> dict:
+    return {"definition": definition, "tools": tools or {},
+            "resume_examples": resume_examples or {}}
+
+
+def _context_data() -> dict:
+    # Exact skill and tool names resolve through the alias index at distance 0.0
+    return {
+        "python": _skill(("A general-purpose programming language.", 0.0),
+                         tools={"FastAPI": 0.0, "Django": 0.0},
+                         resume_examples={EXAMPLE: 0.35, NEAR_IDENTICAL_EXAMPLE: 0.36}),
+        "docker": _skill(("A container platform.", 0.0), tools={"Compose": 0.0}),
+        "aws": _skill(("A cloud computing platform.", 0.0), tools={"Lambda": 0.0}),
+    }
+
+
+def _cost(skill: str, *texts: str) -> int:
+    return (len(skill) + ContextBuilder._SKILL_OVERHEAD_CHARS
+            + sum(len(text) + ContextBuilder._ENTRY_OVERHEAD_CHARS for text in texts))
+
+
+def test_resume_examples_are_not_crowded_out_by_alias_hits():
+    # Room for the first alias hits and one resume example, not for every alias hit
+    budget_chars = (len(ContextBuilder._CONTEXT_HEADER)
+                    + _cost("aws", "A cloud computing platform.", "Lambda")
+                    + _cost("python", EXAMPLE))
+    token_budget = -(-budget_chars // Config.CONTEXT_CHARS_PER_TOKEN)
+
+    selected = ContextBuilder._select_context(_context_data(), token_budget=token_budget)
+
+    assert selected["aws"] == {"definition": "A cloud computing platform.", "tools": ["Lambda"],
+                               "resume_examples": []}
+    assert selected["python"]["resume_examples"] == [EXAMPLE]
+
+
+def test_near_identical_resume_examples_are_kept_once():
+    selected = ContextBuilder._select_context(_context_data(), token_budget=None)
+
+    assert selected["python"]["resume_examples"] == [EXAMPLE]
+    assert set(selected) == {"python", "docker", "aws"}
+
+    everything = ContextBuilder._select_context(_context_data(), deduplicate=False)
+    assert everything["python"]["resume_examples"] == [EXAMPLE, NEAR_IDENTICAL_EXAMPLE]
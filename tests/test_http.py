@@ -0,0 +1,143 @@
+import time
+
+import pytest
+import requests
+
+from src.scrapers.http import (
+    HTTPResponseCache,
+    OfflineCacheMiss,
+    TokenBucketRateLimiter,
+    fetch_with_retries,
+)
+
+
+@pytest.fixture
+def session():
+    with requests.Session() as session:
+        yield session
+
+
+@pytest.fixture
+def cache(tmp_path):
+    db_path = tmp_path / "http_cache.db"
+    cache = HTTPResponseCache(db_path, max_age_seconds=3600, ignored_params={"trk"})
+    yield cache
+    cache.close()
+
+
+def test_retries_429_after_retry_after_seconds(http_server, session):
+    http_server.queue("/page", (429, {"Retry-After": "0"}, b"slow down"), (200, {}, b"page"))
+
+    start = time.monotonic()
+    # Retry-After overrides the 10s backoff
+    response = fetch_with_retries(session, http_server.url("/page"), backoff_seconds=10)
+
+    assert response.status_code == 200
+    assert response.content == b"page"
+    assert len(http_server.requests_to("/page")) == 2
+    assert time.monotonic() - start < 5
+
+
+def test_retries_5xx_with_backoff(http_server, session):
+    http_server.queue("/page", (503, {}, b""), (502, {}, b""), (200, {}, b"page"))
+
+    response = fetch_with_retries(session, http_server.url("/page"), backoff_seconds=0.01)
+
+    assert response.content == b"page"
+    assert len(http_server.requests_to("/page")) == 3
+
+
+def test_gives_up_after_max_retries(http_server, session):
+    http_server.queue("/page", *[(500, {}, b"")] * 5)
+
+    with pytest.raises(requests.HTTPError):
+        fetch_with_retries(session, http_server.url("/page"), max_retries=2, backoff_seconds=0.01)
+    assert len(http_server.requests_to("/page")) == 3
+
+
+def test_client_errors_are_not_retried(http_server, session):
+    http_server.queue("/missing", (404, {}, b"Not Found"))
+
+    with pytest.raises(requests.HTTPError):
+        fetch_with_retries(session, http_server.url("/missing"), backoff_seconds=0.01)
+    assert len(http_server.requests_to("/missing")) == 1
+
+
+def test_rate_limit_applies_per_host(http_server, session):
+    rate_limiter = TokenBucketRateLimiter(rate=10, capacity=1)
+
+    for _ in range(3):
+        fetch_with_retries(session, http_server.url("/a"), rate_limiter=rate_limiter)
+    # Same server under another host name: its own bucket, so no wait
+    start = time.monotonic()
+    fetch_with_retries(session, http_server.url("/b", host="localhost"), rate_limiter=rate_limiter)
+    other_host_seconds = time.monotonic() - start
+
+    first, _, third = (request_time for _, _, request_time in http_server.requests_to("/a"))
+    # Burst of 1 at 10 tokens/s: two waits of ~0.1s between three requests
+    assert third - first >= 0.18
+    assert other_host_seconds < 0.08
+
+
+def test_rate_limiter_rejects_invalid_settings():
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(rate=0, capacity=1)
+    with pytest.raises(ValueError):
+        TokenBucketRateLimiter(rate=1, capacity=0)
+
+
+def test_cache_serves_fresh_entries_without_a_request(http_server, session, cache):
+    http_server.queue("/job", (200, {}, b"job page"))
+
+    first = fetch_with_retries(session, http_server.url("/job?trk=a"), cache=cache, ttl_seconds=60)
+    second = fetch_with_retries(session, http_server.url("/job?trk=b"), cache=cache, ttl_seconds=60)
+
+    assert first.content == second.content == b"job page"
+    # The ignored tracking parameter does not split the cache key
+    assert len(http_server.requests) == 1
+    assert (cache.hits, cache.revalidated, cache.misses) == (1, 0, 1)
+
+
+def test_cache_revalidates_stale_entries_with_304(http_server, session, cache):
+    http_server.queue(
+        "/job",
+        (200, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, b"job page"),
+        (304, {}, b""),
+    )
+
+    fetch_with_retries(session, http_server.url("/job"), cache=cache, ttl_seconds=0)
+    response = fetch_with_retries(session, http_server.url("/job"), cache=cache, ttl_seconds=0)
+
+    assert response.status_code == 200
+    assert response.content == b"job page"
+    _, headers, _ = http_server.requests_to("/job")[1]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    assert (cache.hits, cache.revalidated, cache.misses) == (0, 1, 1)
+
+
+def test_cache_replaces_entries_the_server_changed(http_server, session, cache):
+    http_server.queue("/job", (200, {"ETag": '"v1"'}, b"old"), (200, {"ETag": '"v2"'}, b"new"))
+
+    fetch_with_retries(session, http_server.url("/job"), cache=cache, ttl_seconds=0)
+    fetch_with_retries(session, http_server.url("/job"), cache=cache, ttl_seconds=0)
+
+    assert cache.get(http_server.url("/job"))["response"].content == b"new"
+
+
+def test_offline_cache_replays_entries_and_raises_on_misses(http_server, session, cache, tmp_path):
+    http_server.queue("/job", (200, {}, b"job page"))
+    fetch_with_retries(session, http_server.url("/job"), cache=cache, ttl_seconds=60)
+    cache.close()
+
+    offline = HTTPResponseCache(tmp_path / "http_cache.db", max_age_seconds=3600, offline=True)
+    try:
+        # Replayed whatever its age
+        replayed = fetch_with_retries(session, http_server.url("/job"), cache=offline)
+        with pytest.raises(OfflineCacheMiss):
+            fetch_with_retries(session, http_server.url("/other"), cache=offline, ttl_seconds=60)
+    finally:
+        offline.close()
+
+    assert replayed.content == b"job page"
+    assert len(http_server.requests) == 1
@@ -0,0 +1,65 @@
+import pytest
+
+from benchmarks.fixtures import FakeOllamaServer
+from src.config.settings import Config
+from src.core.context import AppContext
+from src.services.job_service import JobsManager
+
+
+class _BrokenPostingOllama(FakeOllamaServer):
+    """Answers without the required keys for postings that mention BROKEN POSTING."""
+
+    def respond(self, prompt: str) -> dict:
+        if "BROKEN POSTING" in prompt:
+            return {"description": "Missing requirements and key technologies."}
+        return super().respond(prompt)
+
+
+@pytest.fixture
+def ollama():
+    with _BrokenPostingOllama(latency=0.1) as server:
+        yield server
+
+
+@pytest.fixture
+def jobs_manager(tmp_path, monkeypatch, ollama):
+    monkeypatch.setattr(Config, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(Config, "HTTP_CACHE_PATH", tmp_path / "http_cache.db")
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "OLLAMA_BASE_URL", ollama.base_url)
+    return JobsManager(context=AppContext())
+
+
+def _posting(job_id: str, role_details: str) -> dict:
+    return {"job_id": job_id, "source": "LinkedIn", "url": f"https://example.com/{job_id}",
+            "role_details": role_details}
+
+
+def test_failed_postings_do_not_affect_the_others(jobs_manager, ollama):
+    jobs = [_posting(str(i), f"Backend engineer {i}, Python and SQL.") for i in range(4)]
+    jobs.append(_posting("broken", "BROKEN POSTING"))
+    jobs.append(_posting("empty", ""))
+
+    results = {
+        job["job_id"]: (job, error) for job, error in jobs_manager.extract_jobs(jobs, max_workers=2)
+    }
+
+    assert set(results) == {job["job_id"] for job in jobs}
+    assert str(results["broken"][1]) == "INVALID LLM RESPONSE"
+    assert "EMPTY JOB DETAILS" in str(results["empty"][1])
+    for job_id in map(str, range(4)):
+        job, error = results[job_id]
+        assert error is None
+        assert {"description", "requirements", "key_technologies"} <= set(job)
+    # The empty posting never reaches the LLM
+    assert ollama.requests == 5
+
+
+def test_requests_in_flight_stay_within_max_workers(jobs_manager, ollama):
+    jobs = [_posting(str(i), f"Data engineer {i}, Spark and Airflow.") for i in range(8)]
+
+    results = list(jobs_manager.extract_jobs(jobs, max_workers=3))
+
+    assert all(error is None for _, error in results)
+    assert ollama.requests == 8
+    assert ollama.max_in_flight == 3
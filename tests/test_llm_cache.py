@@ -0,0 +1,86 @@
+import itertools
+from types import SimpleNamespace
+
+import pytest
+
+from benchmarks.fixtures import FakeOllamaServer
+from src.config.settings import Config
+from src.core.context import AppContext
+from src.core.llm import cache as llm_cache
+from src.core.llm.cache import LLMResponseCache
+
+TEMPLATE = "Extract the job details from: {role_details}"
+PROMPT = "Extract the job details from: Backend engineer, Python and SQL."
+REQUIRED_KEYS = ["description", "requirements", "key_technologies"]
+
+
+@pytest.fixture
+def ollama():
+    with FakeOllamaServer(latency=0) as server:
+        yield server
+
+
+@pytest.fixture
+def context(tmp_path, monkeypatch, ollama):
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(Config, "LLM_CACHE_PATH", tmp_path / "llm_cache.db")
+    monkeypatch.setattr(Config, "OLLAMA_BASE_URL", ollama.base_url)
+    return AppContext()
+
+
+def test_repeated_prompt_is_served_from_the_cache(context, ollama):
+    llm = context.get_llm("llama3")
+
+    first = llm.invoke_json(PROMPT, TEMPLATE, REQUIRED_KEYS)
+    second = llm.invoke_json(PROMPT, TEMPLATE, REQUIRED_KEYS)
+
+    assert first == second
+    assert ollama.requests == 1
+    assert llm.cache_stats()["hits"] == 1 and llm.cache_stats()["misses"] == 1
+
+
+def test_model_prompt_and_template_are_part_of_the_key(context, ollama):
+    context.get_llm("llama3").invoke_json(PROMPT, TEMPLATE)
+
+    context.get_llm("mistral").invoke_json(PROMPT, TEMPLATE)
+    context.get_llm("llama3").invoke_json(PROMPT + " Remote.", TEMPLATE)
+    context.get_llm("llama3").invoke_json(PROMPT, TEMPLATE + "\nAnswer in JSON.")
+
+    assert ollama.requests == 4
+
+
+def test_cached_responses_outlive_the_context(context, ollama):
+    context.get_llm("llama3").invoke_json(PROMPT, TEMPLATE)
+    context.close()
+
+    AppContext().get_llm("llama3").invoke_json(PROMPT, TEMPLATE)
+
+    assert ollama.requests == 1
+
+
+def test_responses_missing_required_keys_are_not_cached(context, ollama):
+    llm = context.get_llm("llama3")
+
+    for _ in range(2):
+        with pytest.raises(Exception, match="INVALID LLM RESPONSE"):
+            llm.invoke_json(PROMPT, TEMPLATE, ["salary"])
+
+    assert ollama.requests == 2
+
+
+def test_expired_and_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    clock = itertools.count(1000)
+    monkeypatch.setattr(llm_cache, "time", SimpleNamespace(time=lambda: next(clock)))
+    cache = LLMResponseCache(tmp_path / "llm_cache.db", max_entries=2, max_age_seconds=100)
+    for key in ["a", "b", "c"]:
+        cache.put(key, "llama3", f"response {key}")
+    cache.get("a")
+
+    cache.evict()
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "response a"
+    assert cache.get("c") == "response c"
+    for _ in range(100):
+        next(clock)
+    assert cache.get("a") is None
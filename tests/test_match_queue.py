@@ -0,0 +1,140 @@
+import json
+
+import pytest
+from sqlalchemy import inspect, text
+
+from src.config.settings import Config
+from src.core.context import AppContext
+from src.models.database import DatabaseManager
+from src.models.entities import MatchTask
+
+
+@pytest.fixture
+def db_manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "DATA_DIR", tmp_path)
+    return DatabaseManager(AppContext())
+
+
+@pytest.fixture
+def resume_id(db_manager):
+    return db_manager.add_resume({"name": "Jane", "skills": ["Python"]}).id
+
+
+@pytest.fixture
+def job_ids(db_manager):
+    db_manager.add_job_postings([
+        {"job_id": str(i), "source": "LinkedIn", "title": f"Engineer {i}", "company": "Acme",
+         "url": f"https://example.com/{i}", "key_technologies": ["Python"]}
+        for i in range(3)
+    ])
+    return [job.id for job in db_manager.get_jobs()]
+
+
+def _lease(db_manager, resume_id, owner, limit=10, lease_seconds=60, max_attempts=2):
+    return [
+        task.id for task, _ in db_manager.lease_match_tasks(
+            resume_id, owner=owner, limit=limit, lease_seconds=lease_seconds,
+            max_attempts=max_attempts,
+        )
+    ]
+
+
+def _task(db_manager, task_id) -> MatchTask:
+    return db_manager.session.get(MatchTask, task_id, populate_existing=True)
+
+
+def test_lease_claims_each_task_once(db_manager, resume_id, job_ids):
+    db_manager.enqueue_match_tasks(resume_id, job_ids)
+
+    first = _lease(db_manager, resume_id, "a", limit=2)
+    second = _lease(db_manager, resume_id, "b", limit=2)
+
+    assert len(first) == 2 and len(second) == 1
+    assert not set(first) & set(second)
+    assert _lease(db_manager, resume_id, "c") == []
+    assert _task(db_manager, second[0]).lease_owner == "b"
+
+
+def test_complete_stores_the_result_for_the_lease_owner_only(db_manager, resume_id, job_ids):
+    db_manager.enqueue_match_tasks(resume_id, job_ids[:1])
+    [task_id] = _lease(db_manager, resume_id, "a")
+
+    assert not db_manager.complete_match_task(task_id, "b", {"total_score": 10})
+    assert db_manager.complete_match_task(task_id, "a", {"total_score": 70})
+
+    task = _task(db_manager, task_id)
+    assert task.state == MatchTask.DONE
+    assert task.match_score == 70
+    assert json.loads(task.result) == {"total_score": 70}
+
+
+def test_fail_retries_until_attempts_run_out(db_manager, resume_id, job_ids):
+    db_manager.enqueue_match_tasks(resume_id, job_ids[:1])
+
+    [task_id] = _lease(db_manager, resume_id, "a")
+    db_manager.fail_match_task(task_id, "a", "timeout", max_attempts=2)
+    assert _task(db_manager, task_id).state == MatchTask.PENDING
+
+    assert _lease(db_manager, resume_id, "a") == [task_id]
+    db_manager.fail_match_task(task_id, "a", "timeout", max_attempts=2)
+    task = _task(db_manager, task_id)
+    assert task.state == MatchTask.FAILED
+    assert task.attempts == 2
+    assert _lease(db_manager, resume_id, "a") == []
+
+
+def test_expired_lease_is_leased_again(db_manager, resume_id, job_ids):
+    db_manager.enqueue_match_tasks(resume_id, job_ids[:1])
+    [task_id] = _lease(db_manager, resume_id, "crashed", lease_seconds=-1)
+
+    assert _lease(db_manager, resume_id, "b") == [task_id]
+
+    task = _task(db_manager, task_id)
+    assert task.lease_owner == "b"
+    assert task.attempts == 2
+    # The run that lost the lease can no longer checkpoint it
+    assert not db_manager.complete_match_task(task_id, "crashed", {"total_score": 10})
+
+
+def test_expired_lease_on_the_last_attempt_fails(db_manager, resume_id, job_ids):
+    db_manager.enqueue_match_tasks(resume_id, job_ids[:1])
+    [task_id] = _lease(db_manager, resume_id, "crashed", lease_seconds=-1, max_attempts=1)
+
+    assert _lease(db_manager, resume_id, "b", max_attempts=1) == []
+
+    task = _task(db_manager, task_id)
+    assert task.state == MatchTask.FAILED
+    assert task.error == "Lease expired on the last attempt"
+
+
+def test_stored_results_never_overwrite_done_or_leased_tasks(db_manager, resume_id, job_ids):
+    done_job, leased_job, expired_job = job_ids
+    db_manager.enqueue_match_tasks(resume_id, [done_job])
+    [done_task] = _lease(db_manager, resume_id, "a")
+    db_manager.complete_match_task(done_task, "a", {"total_score": 90})
+    db_manager.enqueue_match_tasks(resume_id, [leased_job])
+    [leased_task] = _lease(db_manager, resume_id, "a")
+    db_manager.enqueue_match_tasks(resume_id, [expired_job])
+    [expired_task] = _lease(db_manager, resume_id, "a", lease_seconds=-1)
+
+    stored = db_manager.store_match_results(
+        resume_id, {job_id: {"total_score": 5} for job_id in job_ids}
+    )
+
+    assert stored == 1
+    assert _task(db_manager, done_task).match_score == 90
+    assert _task(db_manager, leased_task).state == MatchTask.LEASED
+    expired = _task(db_manager, expired_task)
+    assert (expired.state, expired.match_score) == (MatchTask.DONE, 5)
+
+
+def test_retired_index_is_dropped_from_existing_databases(db_manager, job_ids):
+    engine = db_manager._context.engine
+    with engine.begin() as connection:
+        connection.execute(text("CREATE INDEX ix_jobs_processed ON jobs (processed)"))
+
+    engine = DatabaseManager.build_engine()
+
+    indexes = {index["name"] for index in inspect(engine).get_indexes("jobs")}
+    engine.dispose()
+    assert "ix_jobs_processed" not in indexes
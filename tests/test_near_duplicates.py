@@ -0,0 +1,117 @@
+import json
+
+import pytest
+
+from src.config.settings import Config
+from src.core.context import AppContext
+from src.core.matching.agent import MatchingAgent
+from src.core.near_duplicates import MinHashLSH
+from src.services.job_service import JobsManager
+
+POSTING = (
+    "Acme is hiring a Senior Machine Learning Engineer to join the recommendations team in "
+    "Toronto. You will design, train and ship ranking models that serve millions of shoppers "
+    "every day, working closely with product managers, data engineers and designers. "
+    "Responsibilities include building feature pipelines in Python and Spark, running offline "
+    "experiments and online A/B tests, deploying models to Kubernetes with Docker, and "
+    "monitoring model quality in production. You will mentor junior engineers, review code and "
+    "help define the technical roadmap for personalization. Requirements: five or more years of "
+    "experience building production machine learning systems, strong Python and SQL, experience "
+    "with PyTorch or TensorFlow, and a solid understanding of statistics and experiment design. "
+    "Nice to have: experience with feature stores, vector search, and large language models. We "
+    "offer a hybrid schedule, health and dental benefits, an annual learning budget and stock "
+    "options. Acme is an equal opportunity employer and welcomes applications from all "
+    "qualified candidates."
+)
+
+# An agency repost: new header and footer, a few words edited
+REPOST = (
+    "Our client, a leading retailer, is looking for a talented engineer. "
+    + POSTING.replace("millions of shoppers", "millions of customers")
+    .replace("mentor junior engineers", "coach junior engineers")
+    .replace("hybrid schedule", "flexible schedule")
+    + " To apply, send your resume to our recruiters at jobs@talentbridge.example.com."
+)
+
+# Another role at the same company, sharing its benefits boilerplate
+DISTINCT = (
+    "Acme is hiring a Backend Engineer to join the payments team in Toronto. You will build and "
+    "operate the services that move money between shoppers, merchants and banks, working "
+    "closely with product managers, security engineers and support. Responsibilities include "
+    "designing REST and gRPC APIs in Go, modelling ledgers in PostgreSQL, handling idempotency "
+    "and retries across payment providers, and keeping the on-call rotation quiet with good "
+    "alerting. Requirements: three or more years of backend experience, strong Go or Java, and "
+    "experience running services on Kubernetes with Docker. We offer a hybrid schedule, health "
+    "and dental benefits, an annual learning budget and stock options. Acme is an equal "
+    "opportunity employer and welcomes applications from all qualified candidates."
+)
+
+
+def test_edited_repost_is_a_duplicate():
+    lsh = MinHashLSH()
+
+    original, repost = lsh.signature(POSTING), lsh.signature(REPOST)
+
+    assert lsh.is_duplicate(original, repost)
+    assert set(lsh.buckets(original)) & set(lsh.buckets(repost))
+
+
+def test_distinct_posting_is_not_a_duplicate():
+    lsh = MinHashLSH()
+
+    assert not lsh.is_duplicate(lsh.signature(POSTING), lsh.signature(DISTINCT))
+    assert lsh.signature("") is None
+
+
+@pytest.fixture
+def jobs_manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "DATA_DIR", tmp_path)
+    monkeypatch.setattr(Config, "HTTP_CACHE_PATH", tmp_path / "http_cache.db")
+    return JobsManager(context=AppContext())
+
+
+def _posting(job_id: str, role_details: str) -> dict:
+    return {"job_id": job_id, "source": "LinkedIn", "title": "Engineer", "company": "Acme",
+            "url": f"https://example.com/{job_id}", "role_details": role_details}
+
+
+def _store_original(jobs_manager) -> int:
+    original = _posting("1", POSTING)
+    original.update({"description": "Ranking models.", "requirements": ["Python"],
+                     "key_technologies": ["Python", "Spark"]})
+    jobs_manager._signature(original)
+    jobs_manager.db_manager.add_job_postings([original])
+    return jobs_manager.db_manager.get_jobs()[0].id
+
+
+def test_reposts_link_to_the_stored_original(jobs_manager):
+    original_id = _store_original(jobs_manager)
+
+    duplicate_jobs, unique_jobs = jobs_manager._link_stored_duplicates(
+        [_posting("2", REPOST), _posting("3", DISTINCT)]
+    )
+
+    assert [job["job_id"] for job in duplicate_jobs] == ["2"]
+    assert [job["job_id"] for job in unique_jobs] == ["3"]
+    repost = duplicate_jobs[0]
+    assert repost["canonical_job_id"] == original_id
+    assert repost["key_technologies"] == ["Python", "Spark"]
+
+
+def test_repost_reuses_the_original_match_result(jobs_manager):
+    db_manager = jobs_manager.db_manager
+    original_id = _store_original(jobs_manager)
+    duplicate_jobs, _ = jobs_manager._link_stored_duplicates([_posting("2", REPOST)])
+    db_manager.add_job_postings(duplicate_jobs)
+    repost = next(job for job in db_manager.get_jobs() if job.canonical_job_id == original_id)
+    resume = db_manager.add_resume({"name": "Jane", "skills": ["Python"]})
+    db_manager.store_match_results(resume.id, {original_id: {"total_score": 82}})
+    # Only the database is needed to reuse results, not the knowledge store or the LLM
+    agent = MatchingAgent.__new__(MatchingAgent)
+    agent.db_manager = db_manager
+
+    assert agent._reuse_duplicate_matches(resume, [repost]) == 1
+
+    [(task, _)] = db_manager.get_match_results(resume.id, job_ids=[repost.id])
+    assert json.loads(task.result) == {"total_score": 82, "duplicate_of": original_id}
+    assert task.match_score == 82
@@ -0,0 +1,52 @@
+from src.core.knowledge.cache import RetrievalCache
+
+RESULT = [("python-definition", "A programming language.", {"skill": "python"}, 0.12)]
+
+
+def _key(query: str):
+    return RetrievalCache.make_key(query, 1, "definition")
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RetrievalCache(max_size=2)
+    cache.put(_key("python"), RESULT)
+    cache.put(_key("docker"), RESULT)
+    cache.get(_key("python"))
+
+    cache.put(_key("aws"), RESULT)
+
+    assert cache.get(_key("docker")) is None
+    assert cache.get(_key("python")) == RESULT
+    assert cache.get(_key("aws")) == RESULT
+    assert cache.stats()["size"] == 2
+
+
+def test_keys_ignore_case_and_whitespace():
+    cache = RetrievalCache(max_size=10)
+    cache.put(_key("Machine  Learning"), RESULT)
+
+    assert cache.get(_key(" machine learning ")) == RESULT
+    assert cache.get(RetrievalCache.make_key("machine learning", 3, "definition")) is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_saved_entries_are_reloaded(tmp_path):
+    path = tmp_path / "retrieval_cache.json"
+    cache = RetrievalCache(max_size=10, persist_path=path)
+    for query in ["python", "docker", "aws"]:
+        cache.put(_key(query), RESULT)
+    cache.save()
+
+    reloaded = RetrievalCache(max_size=2, persist_path=path)
+
+    # Results come back as tuples, and only the most recent entries fit the smaller cache
+    assert reloaded.get(_key("aws")) == RESULT
+    assert reloaded.get(_key("docker")) == RESULT
+    assert reloaded.get(_key("python")) is None
+
+
+def test_unreadable_file_starts_empty(tmp_path):
+    path = tmp_path / "retrieval_cache.json"
+    path.write_text("{not json")
+
+    assert RetrievalCache(max_size=10, persist_path=path).stats()["size"] == 0
@@ -0,0 +1,61 @@
+from src.core.knowledge.aliases import SkillAliasIndex
+
+
+def _docs(skill: str, tools: list[str]) -> list:
+    docs = [(f"{skill}-definition", f"{skill} definition", {"type": "definition", "skill": skill})]
+    docs += [
+        (f"{skill}-tool-{tool}", tool, {"type": "tool", "skill": skill, "tool": tool})
+        for tool in tools
+    ]
+    return docs
+
+
+def _index(tmp_path) -> SkillAliasIndex:
+    index = SkillAliasIndex(tmp_path / "skill_aliases.json")
+    index.set_source("containers.yaml", {
+        "skill_name": "Docker",
+        "related_skills": ["Containerization"],
+        "specific_tools": ["Docker", "Kubernetes"],
+    }, _docs("Docker", ["Docker", "Kubernetes"]))
+    index.set_source("orchestration.yaml", {
+        "skill_name": "Kubernetes",
+        "related_skills": ["Container Orchestration"],
+        "specific_tools": ["Helm"],
+    }, _docs("Kubernetes", ["Kubernetes", "Helm"]))
+    index.rebuild()
+    return index
+
+
+def test_normalize_collapses_whitespace_and_case():
+    assert SkillAliasIndex.normalize("  Machine\tLearning  ") == "machine learning"
+
+
+def test_names_and_aliases_resolve_to_their_skill(tmp_path):
+    index = _index(tmp_path)
+
+    assert index.lookup("docker", "definition")[0] == "Docker-definition"
+    assert index.canonical_skill(" CONTAINERIZATION ") == "Docker"
+    assert index.canonical_skill("container orchestration") == "Kubernetes"
+    assert index.canonical_skill("Rust") is None
+    assert index.lookup("docker", "manifestation") is None
+
+
+def test_canonical_names_win_and_shared_tools_prefer_their_own_skill(tmp_path):
+    index = _index(tmp_path)
+
+    # "Kubernetes" is a Docker tool too, but the Kubernetes skill owns the name
+    assert index.canonical_skill("Kubernetes") == "Kubernetes"
+    assert index.lookup("kubernetes", "tool")[0] == "Kubernetes-tool-Kubernetes"
+    assert index.lookup("helm", "tool")[2]["skill"] == "Kubernetes"
+
+
+def test_saved_index_is_reloaded_and_sources_can_be_removed(tmp_path):
+    _index(tmp_path).save()
+
+    reloaded = SkillAliasIndex(tmp_path / "skill_aliases.json")
+    assert reloaded.canonical_skill("containerization") == "Docker"
+
+    reloaded.remove_source("containers.yaml")
+    reloaded.rebuild()
+    assert reloaded.canonical_skill("containerization") is None
+    assert reloaded.canonical_skill("helm") == "Kubernetes"
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.core.matching.skill_scorer import SkillCoverageScorer
+from src.models.entities import Job, Resume
+
+
+class _Aliases:
+    def canonical_skill(self, name):
+        return None
+
+
+class _Context:
+    skill_aliases = _Aliases()
+
+
+class _JobIndex:
+    def resume_embedding(self, resume):
+        return [1.0, 0.0]
+
+    def job_embeddings(self, jobs):
+        return [[1.0, 0.0] for _ in jobs]
+
+
+def _embed(names):
+    # One axis per letter, so equal names are identical and different ones are not
+    return [np.eye(26)[ord(name[0]) - ord("a")] for name in names]
+
+
+@pytest.fixture
+def scorer():
+    return SkillCoverageScorer(_JobIndex(), context=_Context(), embedding_function=_embed)
+
+
+@pytest.mark.parametrize("raw", ["null", None, "", '"Python"', '{"Python": 1}', "not json"])
+def test_skill_names_without_a_list_are_empty(raw):
+    assert SkillCoverageScorer._skill_names(raw) == []
+
+
+def test_skill_names_drop_blank_and_non_string_entries():
+    names = SkillCoverageScorer._skill_names('[" Python ", "", 3, null, "Docker"]')
+    assert names == ["Python", "Docker"]
+
+
+def test_null_skill_lists_do_not_abort_scoring(scorer):
+    jobs = [
+        Job(id=1, key_technologies='["Python", "Go"]'),
+        Job(id=2, key_technologies="null"),
+    ]
+    results = scorer.score_jobs(Resume(id=1, skills='["Python"]'), jobs)
+
+    assert set(results) == {1, 2}
+    assert results[1]["matching_skills"] == "Python"
+    assert results[1]["missing_skills"] == "Go"
+    # No technologies listed: judged on alignment alone
+    assert results[2]["technical_score"] == SkillCoverageScorer.TECHNICAL_POINTS
+
+
+def test_null_resume_skills_cover_nothing(scorer):
+    job = Job(id=1, key_technologies='["Python"]')
+    results = scorer.score_jobs(Resume(id=1, skills="null"), [job])
+
+    assert results[1]["technical_score"] == 0
+    assert results[1]["missing_skills"] == "Python"